@@ -0,0 +1,34 @@
+"""Decoding a length-prefixed block of little-endian doubles: one field parser per value against `array_of`.
+
+The input text is packed into bytes once, on the warm-up call.
+"""
+
+import struct
+from typing import Any, Callable
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import Parser, binary
+
+
+def _decoder(parser: Parser[int, Any]) -> Callable[[str], Any]:
+    blocks: dict[str, bytes] = {}
+
+    def decode(data: str) -> Any:
+        block = blocks.get(data)
+        if block is None:
+            values = [float(v) for v in data.split()]
+            block = blocks[data] = struct.pack(f'<I{len(values)}d', len(values), *values)
+        return binary.parse(parser, block)
+
+    return decode
+
+
+@case('binary-fields', 'binary', generators.samples, warmup=True)
+def fields():
+    return _decoder(binary.le_u32 >> (lambda n: binary.le_f64.repeat(n)))
+
+
+@case('binary-array', 'binary', generators.samples, warmup=True)
+def array_of():
+    return _decoder(binary.array_of('<d', binary.le_u32))
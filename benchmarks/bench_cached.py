@@ -0,0 +1,39 @@
+"""Repeated inputs: `text.parse` on every message against `text.CachedParser`.
+
+The workload cycles through the first 32 lines of the input as messages, as many as the input has lines; it is
+built once, on the warm-up call, which also fills the cache.
+"""
+
+from typing import Any, Callable
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.text import lex
+
+DISTINCT = 32
+
+_statement = (lex.identifier.suffix(lex.char('=')) & lex.number).suffix(lex.semicolon)
+
+
+def _workload(parse: Callable[[str], Any]) -> Callable[[str], Any]:
+    workloads: dict[str, list[str]] = {}
+
+    def run(data: str) -> Any:
+        messages = workloads.get(data)
+        if messages is None:
+            lines = data.splitlines()
+            messages = workloads[data] = [lines[i % min(DISTINCT, len(lines))] for i in range(len(lines))]
+        return [parse(message) for message in messages]
+
+    return run
+
+
+@case('cached-text-parse', 'cached', generators.assignments, warmup=True)
+def uncached():
+    return _workload(lambda message: text.parse(_statement, message))
+
+
+@case('cached-parser', 'cached', generators.assignments, warmup=True)
+def cached():
+    return _workload(text.CachedParser(_statement, maxsize=DISTINCT))
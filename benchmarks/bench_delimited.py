@@ -0,0 +1,63 @@
+"""CSV: `text.delimited.rows` against the standard library's `csv.reader` and a `sep_by` grammar.
+
+The typed cases convert the id, amount and date columns, with `int`/`float`/`date.fromisoformat` for `csv` and
+with the same functions, or with `text.number` and `text.date`, for `rows`.
+"""
+
+import csv
+import io
+from datetime import date
+from functools import partial
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.core import item
+from parsec.text import delimited
+
+_CONVERT = {0: int, 2: float, 3: date.fromisoformat}
+
+
+@case('delimited-csv', 'delimited', generators.csv_records)
+def stdlib():
+    return lambda data: list(csv.reader(io.StringIO(data, newline='')))
+
+
+@case('delimited-rows', 'delimited', generators.csv_records)
+def rows():
+    return lambda data: list(delimited.rows(data))
+
+
+@case('delimited-csv-typed', 'delimited', generators.csv_records)
+def stdlib_typed():
+    def run(data: str) -> Any:
+        records = csv.reader(io.StringIO(data, newline=''))
+        next(records)
+        return [[_CONVERT[i](v) if i in _CONVERT else v for i, v in enumerate(r)] for r in records]
+
+    return run
+
+
+@case('delimited-rows-typed', 'delimited', generators.csv_records)
+def rows_typed():
+    return lambda data: list(delimited.rows(data, header=True, columns=_CONVERT))
+
+
+@case('delimited-rows-parsers', 'delimited', generators.csv_records)
+def rows_parsers():
+    columns = {'id': text.integer, 'amount': text.number, 'date': text.date}
+    return lambda data: list(delimited.rows(data, header=True, columns=columns))
+
+
+@case('delimited-sep-by', 'delimited', generators.csv_records)
+def sep_by():
+    quoted = (
+        (text.literal('""').map(lambda _: '"') | item.neq('"'))
+        .many()
+        .map(''.join)
+        .between(text.quotation, text.quotation)
+    )
+    plain = item.where(lambda c: c not in ',"\r\n').many().map(''.join)
+    record = (quoted | plain).sep_by(text.comma)
+    return partial(text.parse, record.sep_by(text.char('\n')))
@@ -0,0 +1,34 @@
+"""Dependent sequencing: a nested `bind` chain against the same steps written with `parsec.do`.
+
+The bind chain builds its inner parsers on every run; the `do` parser only drives a generator.
+"""
+
+from functools import partial
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import do, text
+from parsec.text import lex
+
+
+@case('do-bind-chain', 'do', generators.assignments)
+def bind_chain():
+    assignment = lex.identifier >> (
+        lambda name: (
+            lex.char('=') >> (lambda _: lex.number >> (lambda value: lex.semicolon.map(lambda _: (name, value))))
+        )
+    )
+    return partial(text.parse, assignment.many())
+
+
+@case('do-generator', 'do', generators.assignments)
+def generator():
+    @do
+    def assignment():
+        name = yield lex.identifier
+        yield lex.char('=')
+        value = yield lex.number
+        yield lex.semicolon
+        return name, value
+
+    return partial(text.parse, assignment.many())
@@ -0,0 +1,39 @@
+"""Recursive `Parser.run` against the explicit-stack engine (`text.parse(..., stackless=True)`).
+
+Run the nested cases with `--no-memory`: tracemalloc cost grows with the Python stack depth, which makes the
+recursive engine look far slower than it is.
+"""
+
+from functools import partial
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+
+
+@case('engine-recursive-json', 'engine', generators.json_document)
+def recursive_json():
+    from examples.json import jsonValue
+
+    return partial(text.parse, jsonValue)
+
+
+@case('engine-stackless-json', 'engine', generators.json_document)
+def stackless_json():
+    from examples.json import jsonValue
+
+    return partial(text.parse, jsonValue, stackless=True)
+
+
+@case('engine-recursive-nested', 'engine', generators.nested_json)
+def recursive_nested():
+    from examples.json import jsonValue
+
+    return partial(text.parse, jsonValue)
+
+
+@case('engine-stackless-nested', 'engine', generators.nested_json)
+def stackless_nested():
+    from examples.json import jsonValue
+
+    return partial(text.parse, jsonValue, stackless=True)
@@ -0,0 +1,67 @@
+"""`parsec.expr.operator_table` against a tower of `chainl1`/`chainr1` levels, on a 14-level operator table."""
+
+from functools import partial, reduce
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import Parser, item, text
+from parsec.text import lex
+from parsec.utils import curry
+
+_RIGHT = {'**', '=>', ':='}
+
+
+def _node(op: str):
+    return curry(lambda x, y: (op, x, y))
+
+
+def _levels() -> list[tuple[Parser[str, Any], str]]:
+    levels = []
+    for ops in generators.OPERATORS:
+        p = reduce(Parser.alter, [lex.literal(op) for op in ops]).map(_node)
+        levels.append((p, 'right' if ops[0] in _RIGHT else 'left'))
+    return levels
+
+
+def tower() -> Parser[str, Any]:
+    expr = Parser[str, Any]()
+    level = expr.between(lex.l_round, lex.r_round) | lex.integer
+    for ops, assoc in _levels():
+        level = level.chainr1(ops) if assoc == 'right' else level.chainl1(ops)
+    expr.define(level)
+    return expr
+
+
+def table() -> Parser[str, Any]:
+    from parsec.expr import operator_table
+
+    expr = Parser[str, Any]()
+    expr.define(operator_table(expr.between(lex.l_round, lex.r_round) | lex.integer, _levels()))
+    return expr
+
+
+def token_table() -> Parser[str, Any]:
+    from parsec.expr import operator_table
+
+    symbol = item.range('*/%+-<>=!&|?.:').some() | item.where(str.isalpha).some()
+    token = lex.lexeme()(symbol.map(''.join))
+    levels = [({op: _node(op) for op in ops}, 'right' if ops[0] in _RIGHT else 'left') for ops in generators.OPERATORS]
+    expr = Parser[str, Any]()
+    expr.define(operator_table(expr.between(lex.l_round, lex.r_round) | lex.integer, levels, token))
+    return expr
+
+
+@case('expr-chainl1-tower', 'expr', generators.operator_expression)
+def chainl1_tower():
+    return partial(text.parse, tower())
+
+
+@case('expr-operator-table', 'expr', generators.operator_expression)
+def operator_table():
+    return partial(text.parse, table())
+
+
+@case('expr-token-table', 'expr', generators.operator_expression)
+def operator_token_table():
+    return partial(text.parse, token_table())
@@ -0,0 +1,27 @@
+"""Reducing a long repetition: a `many` list reduced afterwards against `many_fold` and `for_each`.
+
+Compare the peak memory column: the folds keep one accumulator instead of a list of every number.
+"""
+
+import operator
+from functools import partial
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.text import lex
+
+
+@case('fold-many-list', 'fold', generators.numbers)
+def many_list():
+    return partial(text.parse, lex.number.many().map(sum))
+
+
+@case('fold-many-fold', 'fold', generators.numbers)
+def many_fold():
+    return partial(text.parse, lex.number.many_fold(0, operator.add))
+
+
+@case('fold-for-each', 'fold', generators.numbers)
+def for_each():
+    return partial(text.parse, lex.number.for_each(lambda _: None))
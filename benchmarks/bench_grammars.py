@@ -0,0 +1,54 @@
+"""The grammars bundled in `examples/` and the `parsec.text` terminals."""
+
+from functools import partial
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.text import lex
+
+
+@case('json', 'examples', generators.json_document)
+def json():
+    from examples.json import jsonValue
+
+    return partial(text.parse, jsonValue)
+
+
+@case('calculator', 'examples', generators.calculator_expression)
+def calculator():
+    from examples.calculator import expr
+
+    return partial(text.parse, expr)
+
+
+@case('lambda', 'examples', generators.lambda_term)
+def lambda_calculus():
+    from examples.utlc import expr
+
+    return partial(text.parse, expr)
+
+
+@case('number', 'terminals', generators.numbers)
+def number():
+    return partial(text.parse, lex.number.many())
+
+
+@case('identifier', 'terminals', generators.identifiers)
+def identifier():
+    return partial(text.parse, lex.identifier.many())
+
+
+@case('datetime', 'terminals', generators.datetimes)
+def datetime():
+    return partial(text.parse, lex.datetime.many())
+
+
+@case('string', 'terminals', generators.strings)
+def string():
+    return partial(text.parse, lex.string.many())
+
+
+@case('string-literal', 'terminals', generators.strings)
+def string_literal():
+    return partial(text.parse, lex.string_literal().many())
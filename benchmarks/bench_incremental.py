@@ -0,0 +1,52 @@
+"""Reparsing a JSON document after a one-character edit: `parsec.incremental` against a full `text.parse`.
+
+Each call inserts a blank in the middle of the document and removes it again, i.e. two edits and two reparses.
+"""
+
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import Parser, incremental, text
+from parsec.text import lex
+
+
+def _grammar() -> Parser[str, Any]:
+    # The JSON example grammar with its value rule named, so that values are memoised.
+    value = Parser[str, Any]()
+    array = value.sep_by(lex.comma).default([]).between(lex.l_bracket, lex.r_bracket)
+    member = lex.string.suffix(lex.colon) & value
+    obj = member.sep_by(lex.comma).default([]).between(lex.l_curly, lex.r_curly).map(dict)
+    null = lex.literal('null').map(lambda _: None)
+    boolean = lex.literal('true').map(lambda _: True) | lex.literal('false').map(lambda _: False)
+    value.define(null | boolean | lex.number | lex.string | array | obj, 'value')
+    return value
+
+
+@case('incremental-edit', 'incremental', generators.json_document, warmup=True)
+def incremental_edit():
+    grammar = _grammar()
+    docs: dict[str, Any] = {}
+
+    def edit(data: str) -> Any:
+        # The initial parse happens on the warm-up call.
+        doc = docs.get(data)
+        if doc is None:
+            doc = docs[data] = incremental(grammar, data)
+        middle = len(data) // 2
+        doc.edit(middle, 0, ' ')
+        return doc.edit(middle, 1, '')
+
+    return edit
+
+
+@case('incremental-full', 'incremental', generators.json_document)
+def full_reparse():
+    grammar = _grammar()
+
+    def edit(data: str) -> Any:
+        middle = len(data) // 2
+        text.parse(grammar, data[:middle] + ' ' + data[middle:])
+        return text.parse(grammar, data)
+
+    return edit
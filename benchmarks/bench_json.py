@@ -0,0 +1,30 @@
+"""`parsec.text.json` against the standard library's `json.loads` on the same documents.
+
+The `json-stdlib` case is the reference: the throughput ratio of the other cases to it is the gap to track.
+"""
+
+import json as _stdlib
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec.text import json
+
+
+@case('json-stdlib', 'json-module', generators.json_document)
+def stdlib():
+    return _stdlib.loads
+
+
+@case('json-parsec', 'json-module', generators.json_document)
+def plain():
+    return json.loads
+
+
+@case('json-parsec-ast', 'json-module', generators.json_document)
+def ast():
+    return lambda data: json.loads(data, ast=True)
+
+
+@case('json-parsec-dialect', 'json-module', generators.json_document)
+def dialect():
+    return lambda data: json.loads(data, comments=True, trailing_commas=True)
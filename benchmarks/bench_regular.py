@@ -0,0 +1,30 @@
+"""Terminals and the JSON example as combinators and after `text.regular.optimize`."""
+
+from functools import partial
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.text import lex, regular
+
+
+@case('regular-number', 'regular', generators.numbers)
+def number():
+    return partial(text.parse, regular.optimize(lex.number.many()))
+
+
+@case('regular-identifier', 'regular', generators.identifiers)
+def identifier():
+    return partial(text.parse, regular.optimize(lex.identifier.many()))
+
+
+@case('regular-datetime', 'regular', generators.datetimes)
+def datetime():
+    return partial(text.parse, regular.optimize(lex.datetime.many()))
+
+
+@case('regular-json', 'regular', generators.json_document)
+def json():
+    from examples.json import jsonValue
+
+    return partial(text.parse, regular.optimize(jsonValue))
@@ -0,0 +1,39 @@
+"""`SequenceStream` over an `array('d')` of samples: counting the runs of positive values.
+
+The input text is converted to an array once, on the warm-up call. The vectorized case needs NumPy.
+"""
+
+from array import array
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import sequence
+
+
+def _runs(vectorized: bool):
+    if vectorized:
+        import numpy  # noqa: F401  # fail the case early without NumPy
+
+    positive = sequence.take_while(lambda a: a > 0, vectorized=vectorized)
+    negative = sequence.skip_while(lambda a: a <= 0, vectorized=vectorized)
+    runs = (negative & positive).many_fold(0, lambda n, _: n + 1)
+    arrays: dict[str, Any] = {}
+
+    def count(data: str) -> int:
+        values = arrays.get(data)
+        if values is None:
+            values = arrays[data] = array('d', map(float, data.split()))
+        return sequence.parse(runs, values)
+
+    return count
+
+
+@case('sequence-python', 'sequence', generators.samples, warmup=True)
+def python():
+    return _runs(False)
+
+
+@case('sequence-vectorized', 'sequence', generators.samples, warmup=True)
+def vectorized():
+    return _runs(True)
@@ -0,0 +1,35 @@
+"""Many small messages: a `text.parse` call per message against `text.ParseSession.parse_batch`.
+
+Each line of the input is one message, matched by a single regular expression so that the per-call overhead
+is visible next to the parse; the lines are split once, on the warm-up call.
+"""
+
+from typing import Any, Callable
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+
+_message = text.regex(r'\w+ = \d+;')
+
+
+def _messages(parse: Callable[[list[str]], Any]) -> Callable[[str], Any]:
+    split: dict[str, list[str]] = {}
+
+    def run(data: str) -> Any:
+        lines = split.get(data)
+        if lines is None:
+            lines = split[data] = data.splitlines()
+        return parse(lines)
+
+    return run
+
+
+@case('session-text-parse', 'session', generators.assignments, warmup=True)
+def per_call():
+    return _messages(lambda lines: [text.parse(_message, line) for line in lines])
+
+
+@case('session-batch', 'session', generators.assignments, warmup=True)
+def session():
+    return _messages(text.ParseSession(_message).parse_batch)
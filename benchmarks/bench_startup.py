@@ -0,0 +1,71 @@
+"""Start-up cost of a fresh process: importing `parsec`, then building a grammar and the first parse. Every call
+runs a new interpreter, so the timings include the interpreter start-up itself; `startup-import` is that baseline.
+Bytecode is cached in a temporary directory, as in a deployed worker.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from functools import reduce
+from pathlib import Path
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+
+
+def build() -> Any:
+    """A JSON grammar over plain values, next to a 14-level expression tower, built from `parsec.text.lex`."""
+    from parsec import Parser
+    from parsec.text import lex
+    from parsec.utils import curry
+
+    value = Parser[str, Any]()
+    members = (lex.string.suffix(lex.colon) & value).sep_by(lex.comma).default([]).map(dict)
+    value.define(
+        lex.literal('null').map(lambda _: None)
+        | lex.literal('true').map(lambda _: True)
+        | lex.literal('false').map(lambda _: False)
+        | lex.number
+        | lex.string
+        | value.sep_by(lex.comma).default([]).between(lex.l_bracket, lex.r_bracket)
+        | members.between(lex.l_curly, lex.r_curly)
+    )
+
+    expr = Parser[str, Any]()
+    level = expr.between(lex.l_round, lex.r_round) | lex.integer
+    for ops in generators.OPERATORS:
+        op = reduce(Parser.alter, [lex.literal(o) for o in ops]).map(lambda o: curry(lambda x, y: (o, x, y)))
+        level = level.chainl1(op)
+    expr.define(level)
+    return value | expr
+
+
+_PARSE = 'import sys\nfrom parsec import text\n{grammar}\ntext.parse(grammar, sys.stdin.read())\n'
+_BUILD = 'from benchmarks.bench_startup import build\ngrammar = build()'
+
+
+_PYCACHE = tempfile.mkdtemp()
+
+
+def _process(script: str):
+    root = Path(__file__).parent.parent
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'} | {'PYTHONPYCACHEPREFIX': _PYCACHE}
+
+    def run(data: str) -> None:
+        subprocess.run([sys.executable, '-c', script], input=data, text=True, check=True, cwd=root, env=env)
+
+    run('null')
+
+    return run
+
+
+@case('startup-import', 'startup', generators.json_document)
+def startup_import():
+    return _process('import parsec.text')
+
+
+@case('startup-build', 'startup', generators.json_document)
+def startup_build():
+    return _process(_PARSE.format(grammar=_BUILD))
@@ -0,0 +1,40 @@
+"""One grammar shared by several threads: the example JSON grammar over 32 documents, with 1 and 4 threads.
+
+The records of the generated document are split into 32 array documents once, on the warm-up call. Threads only
+scale on a free-threaded build of Python (`python3.13t -m benchmarks.run -k threads`); with the GIL both cases
+take about the same time.
+"""
+
+from typing import Any, Callable
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+
+DOCUMENTS = 32
+
+
+def _parse_many(workers: int) -> Callable[[str], Any]:
+    from examples.json import jsonValue
+
+    split: dict[str, list[str]] = {}
+
+    def parse(data: str) -> Any:
+        docs = split.get(data)
+        if docs is None:
+            records = data[1:-1].split(',\n ')
+            step = -(-len(records) // DOCUMENTS)
+            docs = split[data] = ['[' + ',\n '.join(records[i : i + step]) + ']' for i in range(0, len(records), step)]
+        return text.parse_many_threads(jsonValue, docs, workers=workers)
+
+    return parse
+
+
+@case('threads-1', 'threads', generators.json_document, warmup=True)
+def one_thread():
+    return _parse_many(1)
+
+
+@case('threads-4', 'threads', generators.json_document, warmup=True)
+def four_threads():
+    return _parse_many(4)
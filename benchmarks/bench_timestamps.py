@@ -0,0 +1,30 @@
+"""Log timestamps: `lex.isodatetime.many()` over the text, and `text.timestamps` over the column of lines.
+
+The column is split once, on the warm-up call.
+"""
+
+from functools import partial
+from typing import Any
+
+from benchmarks import generators
+from benchmarks.suite import case
+from parsec import text
+from parsec.text import lex
+
+
+@case('timestamps-parse', 'timestamps', generators.log_timestamps)
+def parse():
+    return partial(text.parse, lex.isodatetime.many())
+
+
+@case('timestamps-column', 'timestamps', generators.log_timestamps, warmup=True)
+def column():
+    split: dict[str, list[str]] = {}
+
+    def run(data: str) -> Any:
+        lines = split.get(data)
+        if lines is None:
+            lines = split[data] = data.splitlines()
+        return text.timestamps(lines)
+
+    return run
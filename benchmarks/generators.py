@@ -0,0 +1,238 @@
+"""Deterministic input generators.
+
+Every generator takes a target size in bytes and returns a document of at least that size (unless noted) that
+the matching grammar accepts. The same size always yields the same document.
+"""
+
+import random
+from typing import Callable, Iterator
+
+_WORDS = ('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta', 'iota', 'kappa', 'lambda', 'mu')
+
+
+def _fill(size: int, items: Iterator[str], sep: str) -> str:
+    parts: list[str] = []
+    total = 0
+    for part in items:
+        parts.append(part)
+        total += len(part) + len(sep)
+        if total >= size:
+            break
+    return sep.join(parts)
+
+
+def _forever(seed: int, fn: Callable[[random.Random, int], str]) -> Iterator[str]:
+    rng = random.Random(seed)
+    n = 0
+    while True:
+        yield fn(rng, n)
+        n += 1
+
+
+def _json_value(rng: random.Random, depth: int) -> str:
+    kind = rng.randrange(8 if depth < 3 else 6)
+    if kind == 0:
+        return 'null'
+    if kind == 1:
+        return rng.choice(('true', 'false'))
+    if kind == 2:
+        return str(rng.randrange(-100_000, 100_000))
+    if kind == 3:
+        return f'{rng.uniform(-1e6, 1e6):.6g}'
+    if kind in (4, 5):
+        return f'"{rng.choice(_WORDS)} {rng.randrange(1000)}"'
+    if kind == 6:
+        return '[' + ', '.join(_json_value(rng, depth + 1) for _ in range(rng.randrange(5))) + ']'
+    fields = (f'"{rng.choice(_WORDS)}{i}": {_json_value(rng, depth + 1)}' for i in range(rng.randrange(5)))
+    return '{' + ', '.join(fields) + '}'
+
+
+def json_document(size: int) -> str:
+    """A JSON array of records, without string escapes (the example grammar has none)."""
+
+    def record(rng: random.Random, n: int) -> str:
+        return (
+            f'{{"id": {n}, "name": "{rng.choice(_WORDS)}", "score": {rng.uniform(0, 100):.3f}, '
+            f'"active": {rng.choice(("true", "false"))}, "parent": null, "extra": {_json_value(rng, 1)}}}'
+        )
+
+    return '[' + _fill(size, _forever(1, record), ',\n ') + ']'
+
+
+def _arith(rng: random.Random, depth: int) -> str:
+    if depth < 3 and rng.random() < 0.2:
+        return f'({_arith(rng, depth + 1)}{rng.choice("+-")}{_arith(rng, depth + 1)})'
+    return rng.choice((str(rng.randrange(1, 1000)), f'{rng.uniform(1, 100):.2f}', f'.{rng.randrange(1, 99)}e1'))
+
+
+def calculator_expression(size: int) -> str:
+    """A long arithmetic expression; `+`/`-` are not preceded by blanks, as the example grammar requires."""
+
+    def term(rng: random.Random, _: int) -> str:
+        factors = [_arith(rng, 0) for _ in range(rng.randrange(1, 4))]
+        return ' * '.join(factors) if rng.random() < 0.5 else ' / '.join(factors)
+
+    rng = random.Random(2)
+    terms = _forever(3, term)
+    out = [next(terms)]
+    total = len(out[0])
+    while total < size:
+        t = next(terms)
+        out.append(rng.choice('+-') + ' ' + t)
+        total += len(t) + 2
+    return ''.join(out)
+
+
+OPERATORS = (
+    ('**',),
+    ('*', '/', '%'),
+    ('+', '-'),
+    ('<<', '>>'),
+    ('<=', '>=', '<', '>'),
+    ('==', '!='),
+    ('&&',),
+    ('||',),
+    ('xor',),
+    ('??',),
+    ('=>',),
+    ('|>',),
+    ('..',),
+    (':=',),
+)
+
+
+def _operand(rng: random.Random, depth: int) -> str:
+    if depth < 3 and rng.random() < 0.1:
+        rest = (f' {rng.choice(rng.choice(OPERATORS))} {_operand(rng, depth + 1)}' for _ in range(rng.randrange(1, 4)))
+        return '(' + _operand(rng, depth + 1) + ''.join(rest) + ')'
+    return str(rng.randrange(1000))
+
+
+def operator_expression(size: int) -> str:
+    """A long expression mixing the binary operators of all 14 levels of `OPERATORS`, tightest first."""
+    rng = random.Random(9)
+    out = [_operand(rng, 0)]
+    total = len(out[0])
+    while total < size:
+        out.append(f' {rng.choice(rng.choice(OPERATORS))} {_operand(rng, 0)}')
+        total += len(out[-1])
+    return ''.join(out)
+
+
+def lambda_term(size: int) -> str:
+    """Nested abstractions `\\a -> \\b -> ... -> a`, the only terms the example grammar parses without looping."""
+    rng = random.Random(4)
+    names: list[str] = []
+    total = 0
+    while total < size:
+        names.append(f'{rng.choice(_WORDS)}{len(names)}')
+        total += len(names[-1]) + 5
+    return ''.join(f'\\{n} -> ' for n in names) + rng.choice(names)
+
+
+def numbers(size: int) -> str:
+    def number(rng: random.Random, _: int) -> str:
+        kind = rng.randrange(5)
+        if kind == 0:
+            return str(rng.randrange(-(10**9), 10**9))
+        if kind == 1:
+            return f'{rng.uniform(-1e3, 1e3):.4f}'
+        if kind == 2:
+            return f'{rng.uniform(1, 9):.3f}e{rng.randrange(-20, 20)}'
+        if kind == 3:
+            return hex(rng.randrange(1 << 32))
+        return f'.{rng.randrange(1, 10**6)}'
+
+    return _fill(size, _forever(5, number), ' ')
+
+
+def identifiers(size: int) -> str:
+    def identifier(rng: random.Random, n: int) -> str:
+        return f'{rng.choice(("_", ""))}{rng.choice(_WORDS)}_{n}'
+
+    return _fill(size, _forever(6, identifier), ' ')
+
+
+def assignments(size: int) -> str:
+    """Statements `name = number;`."""
+
+    def assignment(rng: random.Random, n: int) -> str:
+        return f'{rng.choice(_WORDS)}_{n} = {rng.randrange(10**6)};'
+
+    return _fill(size, _forever(10, assignment), '\n')
+
+
+def samples(size: int) -> str:
+    """Space separated numeric samples in runs of positive and negative values, a few thousand long."""
+
+    def values() -> Iterator[str]:
+        rng = random.Random(11)
+        sign = 1
+        while True:
+            for _ in range(rng.randrange(1, 5000)):
+                yield f'{sign * rng.uniform(0.1, 1):.3f}'
+            sign = -sign
+
+    return _fill(size, values(), ' ')
+
+
+def datetimes(size: int) -> str:
+    def stamp(rng: random.Random, _: int) -> str:
+        return (
+            f'{rng.randrange(1970, 2100):04}-{rng.randrange(1, 13):02}-{rng.randrange(1, 29):02} '
+            f'{rng.randrange(24):02}:{rng.randrange(60):02}:{rng.randrange(60):02}'
+        )
+
+    return _fill(size, _forever(7, stamp), '\n')
+
+
+def csv_records(size: int) -> str:
+    """CSV with a header: id, name, amount, date, comment; some comments quoted with commas, quotes or line breaks."""
+
+    def records() -> Iterator[str]:
+        yield 'id,name,amount,date,comment'
+        rng = random.Random(13)
+        n = 0
+        while True:
+            comment = ' '.join(rng.choice(_WORDS) for _ in range(rng.randrange(1, 6)))
+            kind = rng.randrange(8)
+            if kind == 0:
+                comment = f'"{comment}, {rng.choice(_WORDS)}"'
+            elif kind == 1:
+                comment = f'"{comment} ""{rng.choice(_WORDS)}"""'
+            elif kind == 2:
+                comment = f'"{comment}\n{rng.choice(_WORDS)}"'
+            amount = f'{rng.uniform(0, 1e4):.2f}'
+            day = f'{rng.randrange(2000, 2030)}-{rng.randrange(1, 13):02}-{rng.randrange(1, 29):02}'
+            yield f'{n},{rng.choice(_WORDS)}_{n},{amount},{day},{comment}'
+            n += 1
+
+    return _fill(size, records(), '\n')
+
+
+def log_timestamps(size: int) -> str:
+    """ISO 8601 timestamps of log lines, one per line: increasing, several lines per second, with an offset."""
+
+    def stamps() -> Iterator[str]:
+        rng = random.Random(12)
+        second = 0
+        while True:
+            second += rng.randrange(2)
+            minutes, seconds = divmod(second, 60)
+            hours, minutes = divmod(minutes, 60)
+            yield f'2024-05-{1 + hours // 24:02}T{hours % 24:02}:{minutes:02}:{seconds:02}+02:00'
+
+    return _fill(size, stamps(), '\n')
+
+
+def strings(size: int) -> str:
+    def string(rng: random.Random, _: int) -> str:
+        return '"' + ' '.join(rng.choice(_WORDS) for _ in range(rng.randrange(1, 12))) + '"'
+
+    return _fill(size, _forever(8, string), ' ')
+
+
+def nested_json(size: int) -> str:
+    """Arrays nested `size / 2` levels deep."""
+    depth = max(size // 2, 1)
+    return '[' * depth + ']' * depth
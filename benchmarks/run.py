@@ -0,0 +1,130 @@
+"""Run the benchmark suite.
+
+Each case and size runs in its own interpreter, so peak memory is isolated and a case exceeding the timeout
+does not stop the suite.
+
+Usage (from the repository root):
+    python -m benchmarks.run --sizes 1KB,1MB,50MB --out results.json
+    python -m benchmarks.run -k json --compare results.json
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import pkgutil
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from benchmarks.suite import CASES, SIZES, measure, parse_size
+
+
+def discover() -> None:
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'benchmarks.{module.name}')
+
+
+def _version() -> str:
+    try:
+        return metadata.version('parsec-python')
+    except metadata.PackageNotFoundError:
+        try:
+            out = subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True)
+            return out.stdout.strip() or 'unknown'
+        except OSError:
+            return 'unknown'
+
+
+def _run_case(name: str, size: str, timeout: float, memory: bool) -> dict[str, Any]:
+    cmd = [sys.executable, '-m', 'benchmarks.run', '--worker', name, size, *([] if memory else ['--no-memory'])]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'case': name, 'size': parse_size(size), 'status': 'timeout', 'timeout': timeout}
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ['exit code %d' % proc.returncode]
+        return {'case': name, 'size': parse_size(size), 'status': 'error', 'error': tail[0]}
+    return {**json.loads(proc.stdout.strip().splitlines()[-1]), 'status': 'ok'}
+
+
+def _format(result: dict[str, Any], label: str) -> str:
+    head = f'{result["case"]:<24}{label:>8}'
+    if result['status'] == 'timeout':
+        return f'{head}  timeout after {result["timeout"]:g}s'
+    if result['status'] != 'ok':
+        return f'{head}  error: {result["error"]}'
+    peak = '-' if result['peak_memory'] is None else f'{result["peak_memory"] / 1e6:.1f}'
+    throughput = '-' if result['throughput'] is None else f'{result["throughput"] / 1e6:.3f}'
+    return (
+        f'{head}{result["seconds"]:>12.4f}s{throughput:>10} MB/s'
+        f'{peak:>10} MB{result["allocations"]["results"]:>12} results'
+    )
+
+
+def _compare(results: list[dict[str, Any]], baseline: dict[str, Any]) -> None:
+    old = {(r['case'], r['size']): r for r in baseline['results'] if r['status'] == 'ok'}
+    print(f'\ncompared with {baseline["meta"]["version"]} ({baseline["meta"]["python"]}):')
+    for r in results:
+        prev = old.get((r['case'], r['size']))
+        if r['status'] == 'ok' and prev is not None and r['throughput'] and prev['throughput']:
+            ratio = r['throughput'] / prev['throughput']
+            print(f'{r["case"]:<24}{r["size"]:>10}  throughput x{ratio:.3f}')
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='*', help='glob selecting case names or groups')
+    parser.add_argument('--sizes', default=','.join(SIZES), help='comma separated sizes, e.g. 1KB,1MB,50MB')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds allowed per case and size')
+    parser.add_argument('--out', type=Path, help='write the results as JSON to this file')
+    parser.add_argument('--compare', type=Path, help='previous results file to compare throughput with')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak memory measurement')
+    parser.add_argument('--list', action='store_true', help='list the cases and exit')
+    parser.add_argument('--worker', nargs=2, metavar=('CASE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    discover()
+    if args.worker:
+        name, size = args.worker
+        print(json.dumps(measure(CASES[name], parse_size(size), memory=not args.no_memory)))
+        return
+
+    cases = [
+        c for c in CASES.values() if fnmatch.fnmatch(c.name, args.pattern) or fnmatch.fnmatch(c.group, args.pattern)
+    ]
+    if args.list:
+        for c in cases:
+            print(f'{c.group:<16}{c.name}')
+        return
+
+    results: list[dict[str, Any]] = []
+    for c in cases:
+        for size in args.sizes.split(','):
+            result = _run_case(c.name, size, args.timeout, not args.no_memory)
+            results.append({'group': c.group, **result})
+            print(_format(result, size), flush=True)
+
+    report = {
+        'meta': {
+            'version': _version(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        _compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark case registry and measurement.
+
+A case is a `setup` function returning the callable under test, plus an input generator. Benchmark modules
+(`benchmarks/bench_*.py`) register their cases with the `case` decorator. A `warmup` case is called once before
+the timed calls, for callables that prepare state on their first call.
+"""
+
+import gc
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable
+
+from parsec import Profiler
+
+SIZES = {'1KB': 1 << 10, '1MB': 1 << 20, '50MB': 50 << 20}
+
+type Setup = Callable[[], Callable[[str], Any]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    group: str
+    setup: Setup
+    generate: Callable[[int], str]
+    warmup: bool = False
+
+
+CASES: dict[str, Case] = {}
+
+
+def case(name: str, group: str, generate: Callable[[int], str], warmup: bool = False) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        if name in CASES:
+            raise ValueError(f'duplicated benchmark case {name!r}')
+        CASES[name] = Case(name, group, setup, generate, warmup)
+        return setup
+
+    return register
+
+
+def parse_size(size: str) -> int:
+    if size in SIZES:
+        return SIZES[size]
+    units = {'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30, 'B': 1}
+    for unit, scale in units.items():
+        if size.upper().endswith(unit):
+            return int(float(size[: -len(unit)]) * scale)
+    return int(size)
+
+
+def _measure(case: Case, size: int, min_time: float, max_repeat: int, memory: bool) -> dict[str, Any]:
+    data = case.generate(size)
+    begin = perf_counter()
+    fn = case.setup()
+    setup = perf_counter() - begin
+    if case.warmup:
+        fn(data)
+
+    times: list[float] = []
+    while len(times) < max_repeat and sum(times) < min_time:
+        gc.collect()
+        begin = perf_counter()
+        fn(data)
+        times.append(perf_counter() - begin)
+    best = min(times)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    with Profiler() as prof:
+        fn(data)
+
+    n = len(data.encode())
+    return {
+        'case': case.name,
+        'group': case.group,
+        'size': n,
+        'setup_seconds': setup,
+        'seconds': best,
+        'repeat': len(times),
+        'throughput': n / best if best else None,
+        'peak_memory': peak,
+        'allocations': prof.allocations,
+    }
+
+
+def measure(case: Case, size: int, min_time: float = 0.5, max_repeat: int = 20, memory: bool = True) -> dict[str, Any]:
+    """
+    Measure one case on a generated input of `size` bytes.
+
+    The recursive engine needs a deep Python stack on large inputs, so the measurement runs in a thread with a
+    large stack and a raised recursion limit. `tracemalloc` walks the whole stack on every allocation, so
+    `memory=False` skips the peak memory measurement for very deep recursive parses.
+    """
+    result: dict[str, Any] = {}
+    error: list[BaseException] = []
+
+    def target() -> None:
+        try:
+            result.update(_measure(case, size, min_time, max_repeat, memory))
+        except BaseException as e:
+            error.append(e)
+
+    sys.setrecursionlimit(10**7)
+    threading.stack_size(1 << 30)
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join()
+    if error:
+        raise error[0]
+    return result
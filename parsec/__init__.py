@@ -1,5 +1,28 @@
-from parsec import combinator, text
+from parsec import combinator, expr, text
+from parsec.analyzer import BacktrackAnalyzer
+from parsec.budget import Budget
 from parsec.context import Context, IState, IStream
-from parsec.core import Parser, item, tokens
+from parsec.core import Parser, cut, do, item, tokens
+from parsec.profiler import Profiler, profile
+from parsec.text.incremental import incremental
+from parsec.tracer import Tracer
 
-__all__ = ['combinator', 'text', 'Context', 'IState', 'IStream', 'Parser', 'item', 'tokens']
+__all__ = [
+    'combinator',
+    'expr',
+    'text',
+    'BacktrackAnalyzer',
+    'Budget',
+    'Context',
+    'IState',
+    'IStream',
+    'Parser',
+    'Profiler',
+    'Tracer',
+    'cut',
+    'do',
+    'incremental',
+    'item',
+    'profile',
+    'tokens',
+]
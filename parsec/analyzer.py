@@ -0,0 +1,238 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, TextIO
+
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+
+_ALTERNATIVES = {'alter': '|', 'fast_alter': '/'}
+_COLUMNS = ('calls', 'first', 'second', 'fail', 'wasted', 'rescued', 'repeated', 'reconsumed', 'saving')
+
+
+def describe(parser: _Parser[Any, Any], width: int = 60) -> str:
+    """A short rendering of a parser for reports: its rule name, or the combinators it was built from."""
+
+    def render(p: _Parser[Any, Any], depth: int) -> str:
+        if p.name is not None:
+            return p.name
+        node = p.node
+        if node is None:
+            return getattr(p._fn, '__name__', 'parser')
+        if node.kind in _ALTERNATIVES:
+            a, b = node.args
+            return f'{render(a, depth)} {_ALTERNATIVES[node.kind]} {render(b, depth)}'
+        if node.kind == 'tokens':
+            return repr(''.join(map(str, node.args[0])))
+        if depth > 2 or not node.args or not isinstance(node.args[0], _Parser):
+            return f'<{node.kind}>'
+        return f'{node.kind}({render(node.args[0], depth + 1)})'
+
+    text = render(parser, 0)
+    return text if len(text) <= width else text[: width - 3] + '...'
+
+
+@dataclass
+class SiteStats:
+    """What one alternation site (`p1 | p2` or `p1 / p2`) cost.
+
+    `first`, `second` and `fail` count which branch won. `wasted` is the input the first branch consumed before
+    failing and being backtracked over; `rescued` counts the times the second branch then won anyway, which `/`
+    would have turned into failures. `repeated` counts calls at an offset the site had already run at, and
+    `reconsumed` the input those calls consumed again.
+    """
+
+    site: str
+    rule: str | None
+    kind: str
+    calls: int = 0
+    first: int = 0
+    second: int = 0
+    fail: int = 0
+    wasted: int = 0
+    # Input wasted by the first branch on the calls the second branch won, and how many of those wins consumed
+    # nothing (a default, which must stay last).
+    wasted_second: int = 0
+    second_empty: int = 0
+    rescued: int = 0
+    repeated: int = 0
+    reconsumed: int = 0
+
+    def advice(self) -> tuple[str, int]:
+        """The change expected to save the most input re-reading at this site, and that amount."""
+        options = [('none', 0)]
+        if self.kind == 'alter' and self.wasted and not self.rescued:
+            options.append(("use '/'", self.wasted))
+        if self.second > self.first and self.wasted_second and not self.second_empty:
+            options.append(('reorder branches', self.wasted_second))
+        if self.reconsumed:
+            options.append(('memoize', self.reconsumed))
+        return max(options, key=lambda option: option[1])
+
+    @property
+    def saving(self) -> int:
+        return self.advice()[1]
+
+
+@dataclass
+class HotSpan:
+    """A named rule parsed from the same offset `count` times in one parse, the `parse`-th of the block."""
+
+    rule: str
+    offset: int
+    state: str
+    count: int
+    parse: int = 0
+
+
+class BacktrackAnalyzer[I](_hook.Hook[I]):
+    """Records the input thrown away by backtracking, per alternation site.
+
+    Use it as a context manager like `Profiler`: every parse started inside the block is analysed. Sites are
+    identified by the parser object and reported with the innermost named rule they ran in, so naming rules
+    (`define(p, name)`, `named`) makes the report easier to read. Named rules parsed from the same offset more than
+    `hot` times in one parse are reported as hot spans. Offsets are only compared within a parse: running a site at
+    the same offset of another input is not backtracking.
+
+    Example:
+        >>> with BacktrackAnalyzer() as analyzer:
+        ...     text.parse(expr, src)
+        >>> analyzer.print_report(limit=10)
+    """
+
+    def __init__(self, hot: int = 3) -> None:
+        super().__init__()
+        self.hot = hot
+        self.sites: dict[int, SiteStats] = {}
+        # Offsets each site ran at, and visits per (rule, offset), in the current parse.
+        self._offsets: dict[int, set[int]] = {}
+        self._visits: dict[tuple[str, int], list[Any]] = {}
+        # Hot spans of the parses already finished, how many there were, and the parser calls in progress.
+        self._hot: list[HotSpan] = []
+        self._parses = 0
+        self._active = 0
+        self._rules: list[str] = []
+        # Open alternation sites: (first branch, start offset, its result once it returned).
+        self._pending: list[list[Any]] = []
+
+    def run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        if not self._active:
+            self._offsets.clear()
+            self._visits.clear()
+        self._active += 1
+        try:
+            return self._run(parser, ctx, call)
+        finally:
+            self._active -= 1
+            if not self._active:
+                self._hot.extend(self._hot_visits())
+                self._visits.clear()
+                self._parses += 1
+
+    def _run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        start = ctx.stream.tell()
+        name = parser.name
+        if name is not None:
+            visit = self._visits.get((name, start))
+            if visit is None:
+                self._visits[name, start] = [1, ctx.state]
+            else:
+                visit[0] += 1
+            self._rules.append(name)
+        node = parser.node
+        site = node is not None and node.kind in _ALTERNATIVES
+        if site:
+            self._pending.append([node.args[0], start, None])  # type: ignore[union-attr]
+        try:
+            ret = call(ctx)
+        finally:
+            if name is not None:
+                self._rules.pop()
+            first = self._pending.pop()[2] if site else None
+        if site:
+            self._record(parser, start, first, ret)
+        pending = self._pending
+        if pending and pending[-1][2] is None and pending[-1][0] is parser and pending[-1][1] == start:
+            pending[-1][2] = ret
+        return ret
+
+    def _record(self, parser: _Parser[I, Any], start: int, first: _Result[I, Any] | None, ret: _Result[I, Any]) -> None:
+        stats = self.sites.get(id(parser))
+        if stats is None:
+            rule = self._rules[-1] if self._rules else None
+            kind = parser.node.kind  # type: ignore[union-attr]
+            stats = self.sites[id(parser)] = SiteStats(describe(parser), rule, kind)
+        stats.calls += 1
+        offsets = self._offsets.setdefault(id(parser), set())
+        if start in offsets:
+            stats.repeated += 1
+            stats.reconsumed += ret.consumed
+        else:
+            offsets.add(start)
+        if first is None or isinstance(first.outcome, _Okay) or first.committed:
+            # The first branch decided (or the site ran without going through `Parser.run` of its branch).
+            if isinstance(ret.outcome, _Okay):
+                stats.first += 1
+            else:
+                stats.fail += 1
+            return
+        wasted = first.consumed if stats.kind == 'alter' else 0
+        stats.wasted += wasted
+        if isinstance(ret.outcome, _Okay):
+            stats.second += 1
+            stats.wasted_second += wasted
+            if not ret.consumed:
+                stats.second_empty += 1
+            if first.consumed:
+                stats.rescued += 1
+        else:
+            stats.fail += 1
+
+    def ranking(self) -> list[SiteStats]:
+        """Sites with something to save, the largest saving first."""
+        return sorted((s for s in self.sites.values() if s.saving), key=lambda s: s.saving, reverse=True)
+
+    def _hot_visits(self) -> list[HotSpan]:
+        return [
+            HotSpan(name, offset, state.format(), count, self._parses)
+            for (name, offset), (count, state) in self._visits.items()
+            if count > self.hot
+        ]
+
+    def hot_spans(self) -> list[HotSpan]:
+        """Named rules parsed from the same offset more than `hot` times in one parse, the most parsed first."""
+        return sorted(self._hot + self._hot_visits(), key=lambda span: (-span.count, span.parse, span.offset))
+
+    def report(self, limit: int | None = 20) -> str:
+        """
+        Render the ranked sites and the hot spans as text.
+
+        Args:
+            limit (int | None): Maximum number of rows per table.
+
+        Returns:
+            str: The report.
+        """
+        sites = self.ranking()[:limit]
+        width = max([4, *(len(s.site) + (0 if s.rule is None else len(s.rule) + 2) for s in sites)])
+        lines = [f'{"site":<{width}}' + ''.join(f'{c:>12}' for c in _COLUMNS) + '  advice']
+        for s in sites:
+            where = s.site if s.rule is None else f'{s.rule}: {s.site}'
+            lines.append(f'{where:<{width}}' + ''.join(f'{getattr(s, c):>12}' for c in _COLUMNS) + f'  {s.advice()[0]}')
+        spans = self.hot_spans()[:limit]
+        if spans:
+            lines.append('')
+            lines.append(f'spans parsed more than {self.hot} times by the same rule:')
+            for span in spans:
+                where = f'{span.state} of parse {span.parse + 1}' if self._parses > 1 else span.state
+                lines.append(f'  {span.rule} at {where}: {span.count} times')
+        return '\n'.join(lines)
+
+    def print_report(self, limit: int | None = 20, file: TextIO | None = None) -> None:
+        print(self.report(limit), file=sys.stderr if file is None else file)
@@ -0,0 +1,237 @@
+"""Binary formats: fixed-size fields and arrays of records, decoded with `struct`.
+
+`parse` runs a grammar over a `bytes`, `bytearray` or `memoryview` through a `SequenceStream`, whose items are the
+byte values. The field parsers decode at the current offset with `struct.unpack_from`, without reading the bytes
+one item at a time or copying them; `array_of` decodes a whole block of records in one call.
+
+Example:
+    >>> header = binary.struct_('<4sHH')
+    >>> entry = binary.le_u32 & binary.le_f64
+    >>> binary.parse(binary.le_u16 >> (lambda n: entry.repeat(n)), data)
+    >>> binary.parse(binary.array_of('<f', binary.le_u32), data)
+    array('f', [0.5, 1.5])
+"""
+
+import struct as _struct
+from array import array
+from typing import Any, Callable
+
+from parsec import engine as _engine
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.core import Fail as _Fail
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.error import EOSError as _EOSError
+from parsec.error import Expected as _Expected
+from parsec.error import UnExpected as _UnExpected
+from parsec.sequence import SequenceState, SequenceStream
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+type Buffer = bytes | bytearray | memoryview
+
+_NATIVE = '<' if _struct.pack('=H', 1) == b'\x01\x00' else '>'
+
+
+def _typecode(char: str) -> str | None:
+    # The `array` typecode with the standard size of a one-field `struct` format character, if there is one.
+    size = _struct.calcsize('<' + char)
+    candidates = {'f': 'f', 'd': 'd'}.get(char) or ('BHILQ' if char.isupper() else 'bhilq')
+    for code in candidates:
+        if array(code).itemsize == size:
+            return code
+    return None
+
+
+_TYPECODES = {char: _typecode(char) for char in 'bBhHiIlLqQfd'}
+
+
+def _bytes(ctx: _Context[int], size: int) -> tuple[Buffer, int] | None:
+    # The buffer and offset to decode `size` bytes at, or `None` at the end of input. Other streams are read.
+    stream = ctx.stream
+    if isinstance(stream, SequenceStream) and isinstance(stream.data, (bytes, bytearray, memoryview)):
+        offset = stream.offset
+        return (stream.data, offset) if offset + size <= len(stream.data) else None
+    values = stream.peek(size)
+    return (bytes(values), 0) if len(values) == size else None
+
+
+def _advance(ctx: _Context[int], size: int) -> _Context[int]:
+    stream = ctx.stream
+    start = stream.tell()
+    if isinstance(stream, SequenceStream):
+        return _Context(stream.seek(start + size), ctx.state.update_many(range(size)), ctx.hook)
+    return _Context(stream.seek(start + size), ctx.state.update_many(stream.peek(size)), ctx.hook)
+
+
+def _short[R](ctx: _Context[int], what: str) -> _Result[int, R]:
+    return _Result[int, R].fail(ctx, _Expected(what, [_EOSError(ctx.state.format())]), 0)
+
+
+def _field(fmt: str, unpack: Callable[[tuple[Any, ...]], Any], name: str) -> _Parser[int, Any]:
+    codec = _struct.Struct(fmt)
+    size = codec.size
+    unpack_from = codec.unpack_from
+
+    def parse(ctx: _Context[int]) -> _Result[int, Any]:
+        at = _bytes(ctx, size)
+        if at is None:
+            return _short(ctx, name)
+        return _Result[int, Any].okay(_advance(ctx, size), unpack(unpack_from(*at)), size)
+
+    return _Parser(parse)
+
+
+def _first(values: tuple[Any, ...]) -> Any:
+    return values[0]
+
+
+def struct_(fmt: str) -> _Parser[int, tuple[Any, ...]]:
+    """
+    Decode a `struct` format at the current offset.
+
+    Args:
+        fmt (str): A `struct` format string, e.g. `'<4sHI'`. Without a byte order prefix, native order, sizes and
+            alignment apply, as in `struct`.
+
+    Returns:
+        Parser[int, tuple[Any, ...]]: Parser of the unpacked fields.
+
+    Example:
+        >>> header = struct_('<4sHH').where(lambda h: h[0] == b'RIFF')
+    """
+    return _field(fmt, tuple, f'struct {fmt!r}')
+
+
+u8 = _field('B', _first, 'u8')
+i8 = _field('b', _first, 'i8')
+be_u16 = _field('>H', _first, 'be_u16')
+le_u16 = _field('<H', _first, 'le_u16')
+be_i16 = _field('>h', _first, 'be_i16')
+le_i16 = _field('<h', _first, 'le_i16')
+be_u32 = _field('>I', _first, 'be_u32')
+le_u32 = _field('<I', _first, 'le_u32')
+be_i32 = _field('>i', _first, 'be_i32')
+le_i32 = _field('<i', _first, 'le_i32')
+be_u64 = _field('>Q', _first, 'be_u64')
+le_u64 = _field('<Q', _first, 'le_u64')
+be_i64 = _field('>q', _first, 'be_i64')
+le_i64 = _field('<q', _first, 'le_i64')
+be_f32 = _field('>f', _first, 'be_f32')
+le_f32 = _field('<f', _first, 'le_f32')
+be_f64 = _field('>d', _first, 'be_f64')
+le_f64 = _field('<d', _first, 'le_f64')
+
+
+def _decoder(fmt: str, numpy: bool) -> Callable[[Buffer, int, int], Any]:
+    # Decodes `count` records at `offset`: into an `array` or NumPy array for one-field formats, else into tuples.
+    codec = _struct.Struct(fmt)
+    order, char = (fmt[0], fmt[1:]) if fmt[:1] in '@=<>!' else ('@', fmt)
+    if order == '!':
+        order = '>'
+    if numpy:
+        if _np is None:
+            raise ImportError('array_of(..., numpy=True) requires NumPy: pip install parsec-python[numpy]')
+        if len(char) != 1 or char not in 'bBhHiIlLqQefd?':
+            raise ValueError(f'numpy=True needs a single numeric field, got {fmt!r}')
+        # With a byte order prefix, `struct` uses standard sizes, which NumPy spells explicitly.
+        dtype = _np.dtype(char) if order == '@' else _np.dtype(f'{order}{_np.dtype(char).kind}{codec.size}')
+
+        def numpy_decode(data: Buffer, offset: int, count: int) -> Any:
+            return _np.frombuffer(data, dtype=dtype, count=count, offset=offset)  # type: ignore[union-attr]
+
+        return numpy_decode
+
+    # `array` and `struct` agree on native sizes; standard sizes need the typecode of the same size.
+    code = (char if order == '@' else _TYPECODES[char]) if char in _TYPECODES else None
+    if code is not None:
+        swap = order not in ('@', '=', _NATIVE)
+
+        def array_decode(data: Buffer, offset: int, count: int) -> Any:
+            values = array(code)
+            values.frombytes(memoryview(data)[offset : offset + count * codec.size])
+            if swap:
+                values.byteswap()
+            return values
+
+        return array_decode
+
+    single = len(codec.unpack(bytes(codec.size))) == 1
+
+    def tuple_decode(data: Buffer, offset: int, count: int) -> Any:
+        records = codec.iter_unpack(memoryview(data)[offset : offset + count * codec.size])
+        return [v for (v,) in records] if single else list(records)
+
+    return tuple_decode
+
+
+def array_of(fmt: str, count: int | _Parser[int, int], *, numpy: bool = False) -> _Parser[int, Any]:
+    """
+    Decode `count` consecutive records of a `struct` format in one call.
+
+    Args:
+        fmt (str): The record format, e.g. `'<f'` or `'<Id'`.
+        count (int | Parser[int, int]): The number of records, or a parser of the length prefix that precedes them;
+            a negative prefix fails the parse.
+        numpy (bool): Return a read-only NumPy view of the input instead of a copy; one numeric field only.
+
+    Returns:
+        Parser[int, Any]: Parser of the records: an `array.array` for one numeric field (byte order converted),
+            an `ndarray` with `numpy=True`, a list of values or of tuples otherwise.
+
+    Example:
+        >>> samples = array_of('<h', le_u32)
+        >>> points = array_of('<dd', 16)
+    """
+    size = _struct.calcsize(fmt)
+    decode = _decoder(fmt, numpy)
+
+    def block(n: int) -> _Parser[int, Any]:
+        total = n * size
+
+        def parse(ctx: _Context[int]) -> _Result[int, Any]:
+            if n < 0:
+                # A corrupt length prefix: a negative size would read backwards.
+                return _Result[int, Any].fail(ctx, _UnExpected(f'record count {n}', ctx.state.format()), 0)
+            at = _bytes(ctx, total)
+            if at is None:
+                return _short(ctx, f'{n} records {fmt!r}')
+            return _Result[int, Any].okay(_advance(ctx, total), decode(*at, n), total)
+
+        return _Parser(parse)
+
+    if isinstance(count, _Parser):
+        return count.bind(block)
+    if count < 0:
+        raise ValueError(f'negative record count {count}')
+    return block(count)
+
+
+def parse[R](parser: _Parser[int, R], data: Buffer, *, stackless: bool = False) -> R:
+    """
+    Parse binary data.
+
+    Args:
+        parser (Parser[int, R]): The grammar; items are byte values.
+        data (bytes | bytearray | memoryview): The input, read in place.
+        stackless (bool): Run on the explicit-stack engine.
+
+    Returns:
+        R: The value; raises `ParseErr` on failure.
+
+    Example:
+        >>> binary.parse(binary.be_u16 & binary.u8, b'\\x01\\x02\\x03')
+        (258, 3)
+    """
+    ctx = _Context(SequenceStream(data), SequenceState[int](), _hook.current())
+    ret = _engine.run(parser, ctx) if stackless else parser.run(ctx)
+    match ret.outcome:
+        case _Okay(value=v):
+            return v
+        case _Fail(error=e):
+            raise e
@@ -0,0 +1,74 @@
+from time import monotonic
+from typing import Any, Callable
+
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.error import BudgetExceeded as _BudgetExceeded
+
+# Steps between two reads of the clock.
+_CLOCK_INTERVAL = 1024
+
+
+class Budget[I](_hook.Hook[I]):
+    """Aborts parses that take more than `max_steps` parser invocations or more than `deadline` seconds.
+
+    Backtracking through nested alternatives can take time exponential in the input; a budget bounds the work a
+    single input can cause. When it runs out, `BudgetExceeded` is raised with the offset and the innermost named
+    rule reached. The budget covers every parse started under it, and starts the clock at the first step.
+
+    Example:
+        >>> with Budget(max_steps=1_000_000, deadline=0.5):
+        ...     text.parse(expr, src)
+    """
+
+    def __init__(self, max_steps: int | None = None, deadline: float | None = None) -> None:
+        super().__init__()
+        self.max_steps = max_steps
+        self.deadline = deadline
+        self.steps = 0
+        self._until: float | None = None
+        # Step count at which `_check` runs next: the step limit, or the next read of the clock.
+        self._next = 0
+
+    def reset(self) -> None:
+        """Start over with the full budget, for the next input."""
+        self.steps = 0
+        self._until = None
+        self._next = 0
+
+    def step(self, ctx: _Context[I]) -> None:
+        """Count one parser invocation at `ctx`, raising `BudgetExceeded` when the budget has run out."""
+        self.steps += 1
+        if self.steps > self._next:
+            self._check(ctx)
+
+    def run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        self.step(ctx)
+        if parser.name is None:
+            return call(ctx)
+        try:
+            return call(ctx)
+        except _BudgetExceeded as e:
+            if e.rule is None:
+                e.rule = parser.name
+            raise
+
+    def _check(self, ctx: _Context[I]) -> None:
+        steps = self.steps
+        if self.max_steps is not None and steps > self.max_steps:
+            raise _BudgetExceeded(f'{self.max_steps} steps', ctx.stream.tell(), ctx.state.format())
+        if self.deadline is not None:
+            now = monotonic()
+            if self._until is None:
+                self._until = now + self.deadline
+            elif now > self._until:
+                raise _BudgetExceeded(f'{self.deadline}s deadline', ctx.stream.tell(), ctx.state.format())
+            self._next = steps + _CLOCK_INTERVAL
+        else:
+            self._next = steps + (1 << 62)
+        if self.max_steps is not None:
+            self._next = min(self._next, self.max_steps)
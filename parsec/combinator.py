@@ -125,6 +125,24 @@ def many[I, R](p: _Parser[I, R]) -> _Parser[I, list[R]]:
     return p.many()
 
 
+@_curry
+def fold[I, R, S](init: S, step: _Callable[[S, R], S], p: _Parser[I, R]) -> _Parser[I, S]:
+    return p.many_fold(init, step)
+
+
+many_fold = fold
+
+
+@_curry
+def sep_by_fold[I, R, S](sep: _Parser[I, _Any], init: S, step: _Callable[[S, R], S], p: _Parser[I, R]) -> _Parser[I, S]:
+    return p.sep_by_fold(sep, init, step)
+
+
+@_curry
+def for_each[I, R](sink: _Callable[[R], _Any], p: _Parser[I, R]) -> _Parser[I, int]:
+    return p.for_each(sink)
+
+
 @_curry
 def chainl1[I, R](op: _Parser[I, _Callable[[R], _Callable[[R], R]]], p: _Parser[I, R]) -> _Parser[I, R]:
     return p.chainl1(op)
@@ -155,6 +173,20 @@ def label[I, R](value: str, p: _Parser[I, R]) -> _Parser[I, R]:
     return p.label(value)
 
 
+@_curry
+def named[I, R](name: str, p: _Parser[I, R]) -> _Parser[I, R]:
+    return p.named(name)
+
+
+def commit[I, R](p: _Parser[I, R]) -> _Parser[I, R]:
+    return p.commit()
+
+
+@_curry
+def recover[I, R, S](sync: _Parser[I, _Any], fallback: S, p: _Parser[I, R]) -> _Parser[I, R | S]:
+    return p.recover(sync, fallback)
+
+
 @_overload
 def sel[I, R1, R2](_p1: _Parser[I, R1], _p2: _Parser[I, R2]) -> _Parser[I, R1 | R2]: ...
 
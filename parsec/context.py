@@ -1,5 +1,10 @@
+import warnings
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+if TYPE_CHECKING:
+    from parsec.core import Parser, Result
 
 
 class IState[I](ABC):
@@ -11,15 +16,41 @@ class IState[I](ABC):
     def format(self) -> str:
         raise NotImplementedError
 
+    def update_many(self, values: Sequence[I]) -> 'IState[I]':
+        """The state after `values`, read in one step. Override when it can be computed without a loop."""
+        state = self
+        for value in values:
+            state = state.update(value)
+        return state
+
 
 class IStream[I](ABC):
+    """
+    A position in an input. Streams are values: `move` and `seek` return new streams and nothing moves a stream in
+    place, so a stream (and a `Context` holding it) stays valid after the branch that used it failed, and can be
+    shared between threads.
+    """
+
     @abstractmethod
     def tell(self) -> int:
         raise NotImplementedError
 
-    @abstractmethod
     def read(self, n: int = 1) -> list[I]:
-        raise NotImplementedError
+        """
+        The next `n` items, moving this stream past them in place.
+
+        Deprecated: a stream moved in place is no longer valid for the branches and threads sharing it. Use
+        `peek(n)`, and `move(n)` for the stream after the items. Nothing in parsec calls `read`.
+        """
+        warnings.warn(
+            'IStream.read() moves the stream in place and is deprecated; use peek(n) and move(n)',
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        values = self.peek(n)
+        # The state of the stream after the items, for streams that keep it in instance attributes.
+        vars(self).update(vars(self.move(n)))
+        return values
 
     @abstractmethod
     def peek(self, n: int = 1) -> list[I]:
@@ -37,14 +68,63 @@ class IStream[I](ABC):
     def eos(self) -> bool:
         raise NotImplementedError
 
+    def release(self, offset: int) -> None:
+        """
+        The parse committed at `offset` and will not move before it again, so a stream buffering its input may drop
+        the part before it. The bundled streams hold the whole input and keep it.
+        """
+
+    def scan(self, pred: Callable[[I], bool], vectorized: bool = False) -> int:
+        """
+        Number of items from the current offset satisfying `pred`, without moving. Streams over arrays override it
+        to test whole slices at once when `vectorized` says that `pred` accepts an array and returns a mask.
+        """
+        n, size = 0, 64
+        while True:
+            window = self.peek(size)
+            for value in window[n:]:
+                if not pred(value):
+                    return n
+                n += 1
+            if len(window) < size:
+                return n
+            size *= 2
+
+
+class IHook[I](ABC):
+    """Instrumentation invoked around every `Parser.run` of a hooked parse."""
+
+    @abstractmethod
+    def run(
+        self, parser: 'Parser[I, Any]', ctx: 'Context[I]', call: Callable[['Context[I]'], 'Result[I, Any]']
+    ) -> 'Result[I, Any]':
+        raise NotImplementedError
+
+    def release(self, offset: int) -> None:
+        """The parse committed at `offset`; state kept for earlier positions (memo entries) may be dropped."""
+
 
 @dataclass
 class Context[I]:
+    """
+    The position, state and hook of a parse. Contexts are never modified after construction (`update` and
+    `backtrack` return new ones), so a parser may keep and reuse the context it was given, and one grammar may
+    parse in several threads at once. The class is not frozen only because frozen dataclasses are slower to create.
+    """
+
     stream: IStream[I]
     state: IState[I]
+    hook: IHook[I] | None = None
 
     def backtrack(self, consumed: int, state: IState[I]):
-        return Context(self.stream.move(-consumed), state)
+        return Context(self.stream.move(-consumed), state, self.hook)
 
     def update(self, value: I):
-        return Context(self.stream, self.state.update(value))
+        """The context after reading `value`, the next item."""
+        return Context(self.stream.move(1), self.state.update(value), self.hook)
+
+    def release(self) -> None:
+        offset = self.stream.tell()
+        self.stream.release(offset)
+        if self.hook is not None:
+            self.hook.release(offset)
@@ -1,6 +1,11 @@
+from __future__ import annotations
+
+import operator as _operator
+from contextvars import ContextVar
 from dataclasses import dataclass
-from functools import reduce
-from typing import Any, Callable, Iterable, Unpack, cast, overload
+from functools import partial
+from types import FunctionType
+from typing import Any, Callable, Generator, Iterable, Unpack, cast, overload
 
 from parsec.context import Context as _Context
 from parsec.error import AlterError as _AlterError
@@ -10,6 +15,52 @@ from parsec.error import ParseErr as _ParseErr
 from parsec.error import UnExpected as _UnExpected
 
 
+def _rename[F](fn: F, name: str) -> F:
+    # A per-rule copy of the function whose code object carries the rule name, so that tracebacks and
+    # sampling profilers show the rule instead of `parse`/`<lambda>`. Built once, free at parse time.
+    if not isinstance(fn, FunctionType):
+        return fn
+    renamed = FunctionType(
+        fn.__code__.replace(co_name=name, co_qualname=name), fn.__globals__, name, fn.__defaults__, fn.__closure__
+    )
+    renamed.__kwdefaults__ = fn.__kwdefaults__
+    renamed.__qualname__ = name
+    return cast(F, renamed)
+
+
+# The value functions of `pair` (and `&`), `suffix` and `prefix`, and the tuple flattening of `&`. They are named
+# (and the filters of `eq`, `neq` and `range` are partials of `operator` functions) so that grammar passes such as
+# `parsec.text.regular` can recognise them.
+def _pair(x: Any) -> Callable[[Any], tuple[Any, Any]]:
+    return lambda y: (x, y)
+
+
+def _first(x: Any) -> Callable[[Any], Any]:
+    return lambda _: x
+
+
+def _identity(y: Any) -> Any:
+    return y
+
+
+def _second(_: Any) -> Callable[[Any], Any]:
+    return _identity
+
+
+def _flat(t: tuple[Any, Any]) -> tuple[Any, ...]:
+    if isinstance(t[0], tuple):
+        return (*cast(tuple[Any, ...], t[0]), t[1])
+    return t
+
+
+# Depth of enclosing `absent` lookaheads. They backtrack regardless of commits, so a commit inside one must not
+# release input.
+_lookahead: ContextVar[int] = ContextVar('parsec.lookahead', default=0)
+
+# Set by `parse_all_errors`: `recover` only resynchronises in this mode, other parses stop at the first failure.
+_recovering: ContextVar[bool] = ContextVar('parsec.recovering', default=False)
+
+
 @dataclass
 class Okay[R]:
     value: R
@@ -25,14 +76,37 @@ class Result[I, R]:
     context: _Context[I]
     outcome: Okay[R] | Fail
     consumed: int
+    committed: bool = False
+    # Errors recorded by `recover` on the way to this result.
+    errors: tuple[_ParseErr, ...] = ()
 
     @classmethod
-    def okay(cls, ctx: _Context[I], value: R, consumed: int) -> 'Result[I, R]':
-        return cls(ctx, Okay(value), consumed)
+    def okay(
+        cls, ctx: _Context[I], value: R, consumed: int, committed: bool = False, errors: tuple[_ParseErr, ...] = ()
+    ) -> 'Result[I, R]':
+        return cls(ctx, Okay(value), consumed, committed, errors)
 
     @classmethod
-    def fail(cls, ctx: _Context[I], error: _ParseErr, consumed: int) -> 'Result[I, R]':
-        return cls(ctx, Fail(error), consumed)
+    def fail(
+        cls,
+        ctx: _Context[I],
+        error: _ParseErr,
+        consumed: int,
+        committed: bool = False,
+        errors: tuple[_ParseErr, ...] = (),
+    ) -> 'Result[I, R]':
+        return cls(ctx, Fail(error), consumed, committed, errors)
+
+
+@dataclass(frozen=True)
+class Node:
+    """How a parser was built: the combinator `kind` and the arguments it was applied to.
+
+    Execution engines and grammar passes walk this graph; parsers without a node are opaque leaves.
+    """
+
+    kind: str
+    args: tuple[Any, ...] = ()
 
 
 class Parser[I, R]:
@@ -41,23 +115,42 @@ class Parser[I, R]:
     A parser that can be combined using monadic, functor, and applicative interfaces to build complex parsers.
     """
 
-    def __init__(self, fn: Callable[[_Context[I]], Result[I, R]] | None = None) -> None:
-        self._fn = fn
+    def __init__(
+        self,
+        fn: Callable[[_Context[I]], Result[I, R]] | None = None,
+        name: str | None = None,
+        node: Node | None = None,
+    ) -> None:
+        self._fn = fn if fn is None or name is None else _rename(fn, name)
+        self.name = name
+        self.node = node
 
-    def define(self, p: 'Parser[I, R]') -> None:
+    def __repr__(self) -> str:
+        if self.name is None:
+            return f'<Parser at {id(self):#x}>'
+        return f'<Parser {self.name!r}>'
+
+    def define(self, p: 'Parser[I, R]', name: str | None = None) -> None:
         """
         Lazily define this parser as another parser (for recursion).
 
         Args:
             p (Parser[I, R]): The parser to define as.
+            name (str | None): Rule name of the defined parser, defaults to the name it was created with.
 
         Returns:
             None
 
         Example:
-            >>> p1.define(p2)
+            >>> p1.define(p2, 'expr')
         """
-        self._fn: Callable[[_Context[I]], Result[I, R]] | None = lambda ctx: p.run(ctx)
+        self.name = self.name if name is None else name
+        self.node = Node('ref', (p,))
+
+        def fn(ctx: _Context[I]) -> Result[I, R]:
+            return p.run(ctx)
+
+        self._fn: Callable[[_Context[I]], Result[I, R]] | None = fn if self.name is None else _rename(fn, self.name)
 
     def run(self, ctx: _Context[I]) -> Result[I, R]:
         """
@@ -74,7 +167,9 @@ class Parser[I, R]:
         """
         if self._fn is None:
             raise RuntimeError('UnDefined Parser')
-        return self._fn(ctx)
+        if ctx.hook is None:
+            return self._fn(ctx)
+        return ctx.hook.run(self, ctx, self._fn)
 
     def __rshift__[S](self, fn: Callable[[R], 'Parser[I, S]']) -> 'Parser[I, S]':
         """
@@ -166,13 +261,7 @@ class Parser[I, R]:
             >>> p2: Parser[I, S]
             >>> p: Parser[I, tuple[R, S]] = p1 & p2
         """
-
-        def _flat_(t: tuple[Any, Any]) -> tuple[Any, ...]:
-            if isinstance(t[0], tuple):
-                return (*cast(tuple[Any, ...], t[0]), t[1])
-            return t
-
-        return self.pair(p).map(_flat_)
+        return self.pair(p).map(_flat)
 
     def __lshift__[S](self, fn: Callable[['Parser[I, R]'], 'Parser[I, S]']) -> 'Parser[I, S]':
         """
@@ -215,6 +304,15 @@ class Parser[I, R]:
     def __invert__(self):
         return self.absent()
 
+    def __pos__(self) -> 'Parser[I, R]':
+        """
+        Operator form of `commit`.
+
+        Example:
+            >>> p: Parser[I, R] = +keyword & body
+        """
+        return self.commit()
+
     @classmethod
     def okay(cls, value: R) -> 'Parser[I, R]':
         """
@@ -229,7 +327,7 @@ class Parser[I, R]:
         Example:
             >>> Parser.okay(42)
         """
-        return cls(lambda ctx: Result[I, R].okay(ctx, value, 0))
+        return cls(lambda ctx: Result[I, R].okay(ctx, value, 0), node=Node('okay', (value,)))
 
     @classmethod
     def fail(cls, error: _ParseErr) -> 'Parser[I, R]':
@@ -245,7 +343,7 @@ class Parser[I, R]:
         Example:
             >>> Parser.fail(_ParseErr(...))
         """
-        return cls(lambda ctx: Result[I, R].fail(ctx, error, 0))
+        return cls(lambda ctx: Result[I, R].fail(ctx, error, 0), node=Node('fail', (error,)))
 
     def bind[S](self, fn: Callable[[R], 'Parser[I, S]']) -> 'Parser[I, S]':
         """
@@ -272,10 +370,14 @@ class Parser[I, R]:
                 case Okay(value=v):
                     r2 = fn(v).run(r1.context)
                     r2.consumed += r1.consumed
+                    r2.committed = r2.committed or r1.committed
+                    if r1.errors:
+                        r2.errors = r1.errors + r2.errors
                     return r2
                 case Fail(error=e):
-                    return Result[I, S].fail(r1.context, e, r1.consumed)
+                    return Result[I, S].fail(r1.context, e, r1.consumed, r1.committed, r1.errors)
 
+        parse.node = Node('bind', (self, fn))
         return parse
 
     def map[S](self, fn: Callable[[R], S]) -> 'Parser[I, S]':
@@ -301,10 +403,11 @@ class Parser[I, R]:
             r = self.run(ctx)
             match r.outcome:
                 case Okay(value=v):
-                    return Result[I, S].okay(r.context, fn(v), r.consumed)
+                    return Result[I, S].okay(r.context, fn(v), r.consumed, r.committed, r.errors)
                 case Fail(error=e):
-                    return Result[I, S].fail(r.context, e, r.consumed)
+                    return Result[I, S].fail(r.context, e, r.consumed, r.committed, r.errors)
 
+        parse.node = Node('map', (self, fn))
         return parse
 
     def apply[S](self, pfn: 'Parser[I, Callable[[R], S]]') -> 'Parser[I, S]':
@@ -331,7 +434,7 @@ class Parser[I, R]:
         Backtracking alternative.
 
         Tries this parser; if it fails, backtracks input and tries the alternative parser.
-        Combines errors from both alternatives if both fail.
+        Combines errors from both alternatives if both fail. A failure after a `commit` is returned as is.
 
         Args:
             p (Parser[I, R]): Alternative parser.
@@ -348,15 +451,16 @@ class Parser[I, R]:
         @Parser
         def parse(ctx: _Context[I]) -> Result[I, R]:
             r1 = self.run(ctx)
-            if isinstance(r1.outcome, Okay):
+            if r1.committed or isinstance(r1.outcome, Okay):
                 return r1
             ctx = r1.context.backtrack(r1.consumed, ctx.state) if r1.consumed else r1.context
             r2 = p.run(ctx)
-            if isinstance(r2.outcome, Okay):
+            if r2.committed or isinstance(r2.outcome, Okay):
                 return r2
             alt_err = _AlterError([r1.outcome.error, r2.outcome.error])
             return Result[I, R].fail(r2.context, alt_err.join(), r2.consumed)
 
+        parse.node = Node('alter', (self, p))
         return parse
 
     def fast_alter(self, p: 'Parser[I, R]') -> 'Parser[I, R]':
@@ -381,14 +485,15 @@ class Parser[I, R]:
         @Parser
         def parse(ctx: _Context[I]) -> Result[I, R]:
             r1 = self.run(ctx)
-            if r1.consumed > 0 or isinstance(r1.outcome, Okay):
+            if r1.consumed > 0 or r1.committed or isinstance(r1.outcome, Okay):
                 return r1
             r2 = p.run(r1.context)
-            if isinstance(r2.outcome, Okay):
+            if r2.committed or isinstance(r2.outcome, Okay):
                 return r2
             alt_err = _AlterError([r1.outcome.error, r2.outcome.error])
             return Result[I, R].fail(r2.context, alt_err.join(), r2.consumed)
 
+        parse.node = Node('fast_alter', (self, p))
         return parse
 
     def pair[S](self, p: 'Parser[I, S]') -> 'Parser[I, tuple[R, S]]':
@@ -406,7 +511,7 @@ class Parser[I, R]:
             >>> p2: Parser[I, S]
             >>> p: Parser[I, tuple[R, S]] = p1.pair(p2)
         """
-        return p.apply(self.map(lambda x: lambda y: (x, y)))
+        return p.apply(self.map(_pair))
 
     def otherwise[S](self, p: 'Parser[I, S]') -> 'Parser[I, R | S]':
         """
@@ -500,7 +605,7 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, R] = p1.prefix(ws)
         """
-        return self.apply(_prefix.map(lambda x: lambda y: y))
+        return self.apply(_prefix.map(_second))
 
     def suffix(self, _suffix: 'Parser[I, Any]') -> 'Parser[I, R]':
         """
@@ -519,7 +624,7 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, R] = p1.suffix(ws)
         """
-        return _suffix.apply(self.map(lambda x: lambda y: x))
+        return _suffix.apply(self.map(_first))
 
     def between(self, _prefix: 'Parser[I, Any]', _suffix: 'Parser[I, Any]') -> 'Parser[I, R]':
         """
@@ -602,7 +707,11 @@ class Parser[I, R]:
     def absent(self) -> 'Parser[I, None]':
         @Parser
         def parse(ctx: _Context[I]) -> Result[I, None]:
-            r = self.run(ctx)
+            token = _lookahead.set(_lookahead.get() + 1)
+            try:
+                r = self.run(ctx)
+            finally:
+                _lookahead.reset(token)
             ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
             match r.outcome:
                 case Okay(value=v):
@@ -610,6 +719,82 @@ class Parser[I, R]:
                 case Fail():
                     return Result[I, None].okay(ctx, None, 0)
 
+        parse.node = Node('absent', (self,))
+        return parse
+
+    def commit(self) -> 'Parser[I, R]':
+        """
+        Cut after this parser.
+
+        Once this parser succeeds, no enclosing alternative backtracks past the current position: a later failure
+        is reported immediately instead of trying the remaining alternatives. The stream and hooks are told through
+        `release` that the parse will not return before this position. Lookaheads (`absent`) still backtrack, and
+        do not release.
+
+        Returns:
+            Parser[I, R]: Committing parser.
+
+        Example:
+            >>> p: Parser[I, R] = keyword.commit() & body | other
+        """
+
+        @Parser
+        def parse(ctx: _Context[I]) -> Result[I, R]:
+            r = self.run(ctx)
+            if isinstance(r.outcome, Okay):
+                r.committed = True
+                if not _lookahead.get():
+                    r.context.release()
+            return r
+
+        parse.node = Node('commit', (self,))
+        return parse
+
+    def recover[S](self, sync: 'Parser[I, Any]', fallback: S = None) -> 'Parser[I, R | S]':
+        """
+        Error recovery combinator.
+
+        Behaves as this parser, except under `parse_all_errors`: there a failure is recorded in the result's
+        `errors`, the input is skipped up to the end of the first match of `sync`, and `fallback` is returned in
+        place of the value. `sync` is tried where this parser started, then after each skipped item. A zero-width
+        `sync` (e.g. `~~lex.r_curly`) stops in front of its match. A failure that would be recovered without
+        consuming anything (at the end of input, or right in front of `sync`) is not recovered, so that `many` and
+        alternatives end as usual.
+
+        Args:
+            sync (Parser[I, Any]): Synchronisation parser.
+            fallback (S): Value returned in place of the failed parse.
+
+        Returns:
+            Parser[I, R | S]: Recovering parser.
+
+        Example:
+            >>> stmt: Parser[I, R]
+            >>> p: Parser[I, list[R | None]] = stmt.recover(lex.semicolon).many()
+        """
+
+        @Parser
+        def parse(ctx: _Context[I]) -> Result[I, R | S]:
+            r = self.run(ctx)
+            if isinstance(r.outcome, Okay) or not _recovering.get():
+                return r
+            consumed, skip = 0, r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+            while True:
+                s = sync.run(skip)
+                if isinstance(s.outcome, Okay):
+                    if consumed == 0 and s.consumed == 0:
+                        return r
+                    errors = r.errors + (r.outcome.error,) + s.errors
+                    return Result[I, R | S].okay(s.context, fallback, consumed + s.consumed, r.committed, errors)
+                skip = s.context.backtrack(s.consumed, skip.state) if s.consumed else s.context
+                if skip.stream.eos():
+                    if consumed == 0:
+                        return r
+                    return Result[I, R | S].okay(skip, fallback, consumed, r.committed, r.errors + (r.outcome.error,))
+                skip = item.run(skip).context
+                consumed += 1
+
+        parse.node = Node('recover', (self, sync, fallback))
         return parse
 
     def sep_by(self, sep: 'Parser[I, Any]') -> 'Parser[I, list[R]]':
@@ -617,6 +802,8 @@ class Parser[I, R]:
         Separated-by combinator.
 
         Parses zero or more occurrences of this parser, separated by the sep parser.
+        A separator and occurrence that together consume no input are kept and end the list, where a recursive
+        definition would loop forever.
 
         Args:
             sep (Parser[I, Any]): Separator parser.
@@ -629,8 +816,78 @@ class Parser[I, R]:
             >>> num: Parser[I, R]
             >>> p: Parser[I, list[R]] = num.sep_by(comma)
         """
-        remains = self.prefix(sep).many()
-        return remains.apply(self.map(lambda x: lambda xs: [x, *xs]))
+        return _fold(self, sep, list, None, True)
+
+    def many_fold[S](self, init: S, step: Callable[[S, R], S]) -> 'Parser[I, S]':
+        """
+        Folding zero-or-more combinator.
+
+        Parses zero or more occurrences of this parser like `many`, but combines each result into an accumulator as
+        soon as it is parsed instead of collecting a list, so the repetition runs in constant memory.
+        As in `many`, an occurrence that consumes no input is combined and ends the repetition.
+
+        Args:
+            init (S): Initial accumulator, the value when nothing is parsed. Every parse starts from this same
+                object, so `step` should return a new accumulator rather than mutate it.
+            step (Callable[[S, R], S]): Combines the accumulator with the next result.
+
+        Returns:
+            Parser[I, S]: Parser yielding the final accumulator.
+
+        Example:
+            >>> num: Parser[I, int]
+            >>> total: Parser[I, int] = num.many_fold(0, operator.add)
+        """
+        return _fold(self, None, lambda: init, step, False)
+
+    def sep_by_fold[S](self, sep: 'Parser[I, Any]', init: S, step: Callable[[S, R], S]) -> 'Parser[I, S]':
+        """
+        Folding separated-by combinator.
+
+        Parses occurrences of this parser separated by the sep parser like `sep_by` (the first occurrence is
+        required, as for `sep_by`), combining each result into an accumulator as soon as it is parsed.
+        As in `sep_by`, a round that consumes no input is combined and ends the repetition.
+
+        Args:
+            sep (Parser[I, Any]): Separator parser.
+            init (S): Initial accumulator; every parse starts from this same object.
+            step (Callable[[S, R], S]): Combines the accumulator with the next result.
+
+        Returns:
+            Parser[I, S]: Parser yielding the final accumulator.
+
+        Example:
+            >>> comma: Parser[I, Any]
+            >>> num: Parser[I, int]
+            >>> p: Parser[I, int] = num.sep_by_fold(comma, 0, max)
+        """
+        return _fold(self, sep, lambda: init, step, True)
+
+    def for_each(self, sink: Callable[[R], Any]) -> 'Parser[I, int]':
+        """
+        Streaming zero-or-more combinator.
+
+        Parses zero or more occurrences of this parser and passes each result to `sink` as soon as it is parsed.
+        Results already passed are not taken back when an enclosing alternative backtracks; put a cut (`+p`) in
+        front of the loop when the sink must only see the accepted parse.
+        A result parsed without consuming input is passed to `sink` and ends the loop.
+
+        Args:
+            sink (Callable[[R], Any]): Called with each result.
+
+        Returns:
+            Parser[I, int]: Parser yielding the number of results passed to `sink`.
+
+        Example:
+            >>> record: Parser[I, R]
+            >>> p: Parser[I, int] = record.for_each(queue.put)
+        """
+
+        def step(n: int, value: R) -> int:
+            sink(value)
+            return n + 1
+
+        return _fold(self, None, int, step, False)
 
     def end_by(self, sep: 'Parser[I, Any]') -> 'Parser[I, list[R]]':
         """
@@ -686,9 +943,26 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, list[R]] = p1.repeat(3)
         """
-        if n == 0:
-            return Parser[I, list[R]].okay([])
-        return self.repeat(n - 1).apply(self.map(lambda x: lambda xs: [x, *xs]))
+
+        @Parser
+        def parse(ctx: _Context[I]) -> Result[I, list[R]]:
+            values: list[R] = []
+            consumed = 0
+            committed = False
+            errors: tuple[_ParseErr, ...] = ()
+            for _ in range(n):
+                r = self.run(ctx)
+                consumed += r.consumed
+                committed = committed or r.committed
+                errors += r.errors
+                if isinstance(r.outcome, Fail):
+                    return Result[I, list[R]].fail(r.context, r.outcome.error, consumed, committed, errors)
+                values.append(r.outcome.value)
+                ctx = r.context
+            return Result[I, list[R]].okay(ctx, values, consumed, committed, errors)
+
+        parse.node = Node('repeat', (self, n))
+        return parse
 
     def where(self, fn: Callable[[R], bool]) -> 'Parser[I, R]':
         """
@@ -715,9 +989,14 @@ class Parser[I, R]:
             if fn(r.outcome.value):
                 return r
             return Result[I, R].fail(
-                r.context, _UnExpected(repr(r.outcome.value), r.context.state.format()), r.consumed
+                r.context,
+                _UnExpected(repr(r.outcome.value), r.context.state.format()),
+                r.consumed,
+                r.committed,
+                r.errors,
             )
 
+        parse.node = Node('where', (self, fn))
         return parse
 
     def eq(self, value: R) -> 'Parser[I, R]':
@@ -736,7 +1015,7 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, R] = p1.eq(5)
         """
-        return self.where(lambda v: v == value)
+        return self.where(partial(_operator.eq, value))
 
     def neq(self, value: R) -> 'Parser[I, R]':
         """
@@ -754,7 +1033,7 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, R] = p1.neq(0)
         """
-        return self.where(lambda v: v != value)
+        return self.where(partial(_operator.ne, value))
 
     def range(self, ranges: Iterable[R]) -> 'Parser[I, R]':
         """
@@ -772,13 +1051,14 @@ class Parser[I, R]:
             >>> p1: Parser[I, R]
             >>> p: Parser[I, R] = p1.range(range(10))
         """
-        return self.where(lambda v: v in ranges)
+        return self.where(partial(_operator.contains, ranges))
 
     def some(self) -> 'Parser[I, list[R]]':
         """
         One-or-more combinator.
 
         Parses one or more occurrences of this parser, collecting results in a list.
+        An occurrence that succeeds without consuming input is kept and ends the list, as in `many`.
 
         Returns:
             Parser[I, list[R]]: Parser yielding a non-empty list of results.
@@ -787,13 +1067,15 @@ class Parser[I, R]:
             >>> digit: Parser[I, R]
             >>> p: Parser[I, list[R]] = digit.some()
         """
-        return self.bind(lambda x: self.many().map(lambda xs: [x, *xs]))
+        return _fold(self, None, list, None, True)
 
     def many(self) -> 'Parser[I, list[R]]':
         """
         Zero-or-more combinator.
 
         Parses zero or more occurrences of this parser, collecting results in a list.
+        An occurrence that succeeds without consuming input is kept and ends the list: repeating it would match
+        the same empty input forever (a recursive `many` does not terminate on such a parser).
 
         Returns:
             Parser[I, list[R]]: Parser yielding a list of results.
@@ -802,7 +1084,7 @@ class Parser[I, R]:
             >>> digit: Parser[I, R]
             >>> p: Parser[I, list[R]] = digit.many()
         """
-        return self.some().alter(Parser[I, list[R]].okay([]))
+        return _fold(self, None, list, None, False)
 
     def chainl1(self, op: 'Parser[I, Callable[[R], Callable[[R], R]]]') -> 'Parser[I, R]':
         """
@@ -926,21 +1208,47 @@ class Parser[I, R]:
             >>> p: Parser[I, R] = p1.label("integer")
         """
 
-        @Parser
         def parse(ctx: _Context[I]) -> Result[I, R]:
             ret = self.run(ctx)
             if isinstance(ret.outcome, Okay):
                 return ret
-            return Result[I, R].fail(ret.context, _Expected(expected, [ret.outcome.error]), ret.consumed)
+            error = _Expected(expected, [ret.outcome.error])
+            return Result[I, R].fail(ret.context, error, ret.consumed, ret.committed, ret.errors)
 
-        return parse
+        return Parser(parse, expected, Node('label', (self, expected)))
+
+    def named(self, name: str) -> 'Parser[I, R]':
+        """
+        Name combinator.
+
+        Gives the parser a rule name for profilers and tracers without changing its results or error messages.
+        The named parser shares the implementation of this one, so naming adds no call to the parse.
+
+        Args:
+            name (str): Rule name.
+
+        Returns:
+            Parser[I, R]: Named parser.
+
+        Example:
+            >>> p1: Parser[I, R]
+            >>> p: Parser[I, R] = p1.named("expr")
+        """
+
+        if self._fn is not None:
+            return Parser(self._fn, name, self.node)
+
+        def parse(ctx: _Context[I]) -> Result[I, R]:
+            return self.run(ctx)
+
+        return Parser(parse, name, Node('ref', (self,)))
 
 
 @Parser
 def item[I](ctx: _Context[I]) -> Result[I, I]:
     if ctx.stream.eos():
         return Result[I, I].fail(ctx, _EOSError(ctx.state.format()), 0)
-    v = ctx.stream.read().pop()
+    v = ctx.stream.peek().pop()
     return Result[I, I].okay(ctx.update(v), v, 1)
 
 
@@ -954,7 +1262,130 @@ def look[I](ctx: _Context[I]) -> Result[I, I]:
 
 eos = item.absent()
 
+cut: Parser[Any, None] = Parser.okay(None).commit()
+
+
+def _fold[I, R, S](
+    p: Parser[I, R],
+    sep: Parser[I, Any] | None,
+    make: Callable[[], S],
+    step: Callable[[S, R], S] | None,
+    first: bool,
+) -> Parser[I, S]:
+    # The loop behind `many`, `some`, `sep_by` and the folds: equivalent to the recursive `some`/`alter` definition
+    # (a failed round, separator included, is backtracked unless it committed), without a frame per element.
+    # `step=None` appends to a list. A round that succeeds without consuming ends the loop instead of repeating.
+    @Parser
+    def parse(ctx: _Context[I]) -> Result[I, S]:
+        acc = make()
+        consumed = 0
+        committed = False
+        errors: tuple[_ParseErr, ...] = ()
+        n = 0
+        while True:
+            used, cur, r = 0, ctx, None
+            if n and sep is not None:
+                r = sep.run(ctx)
+                used, cur = r.consumed, r.context
+            if r is None or isinstance(r.outcome, Okay):
+                s = p.run(cur)
+                if r is not None:
+                    s.committed = s.committed or r.committed
+                    s.errors = r.errors + s.errors
+                used += s.consumed
+                r = s
+            if isinstance(r.outcome, Fail):
+                if r.committed or (first and not n):
+                    return Result[I, S].fail(
+                        r.context, r.outcome.error, consumed + used, committed or r.committed, errors + r.errors
+                    )
+                ctx = r.context.backtrack(used, ctx.state) if used else r.context
+                return Result[I, S].okay(ctx, acc, consumed, committed, errors)
+            if step is None:
+                acc.append(r.outcome.value)  # type: ignore[attr-defined]
+            else:
+                acc = step(acc, r.outcome.value)
+            ctx = r.context
+            consumed += used
+            committed = committed or r.committed
+            errors += r.errors
+            n += 1
+            if not used:
+                return Result[I, S].okay(ctx, acc, consumed, committed, errors)
+
+    parse.node = Node('fold', (p, sep, make, step, first))
+    return parse
+
+
+def do[I, R](fn: Callable[[], Generator['Parser[I, Any]', Any, R]]) -> Parser[I, R]:
+    """
+    Do-notation decorator.
+
+    Turns a generator function into a parser: each `yield p` runs `p` at the current position and evaluates to its
+    value, and the generator's return value is the result. It is the sequence of binds `p1 >> (lambda x: p2 >> ...)`
+    without building the inner parsers on every run: the parser drives a new generator per parse. A failing step
+    fails the parser, as in a bind chain.
+
+    Args:
+        fn (Callable[[], Generator[Parser[I, Any], Any, R]]): Generator function without parameters.
+
+    Returns:
+        Parser[I, R]: Parser running the steps.
+
+    Example:
+        >>> @do
+        ... def assignment():
+        ...     name = yield lex.identifier
+        ...     yield lex.char('=')
+        ...     value = yield lex.number
+        ...     return name, value
+    """
+
+    @Parser
+    def parse(ctx: _Context[I]) -> Result[I, R]:
+        steps = fn()
+        try:
+            p = next(steps)
+        except StopIteration as stop:
+            return Result[I, R].okay(ctx, stop.value, 0)
+        consumed = 0
+        committed = False
+        errors: tuple[_ParseErr, ...] = ()
+        while True:
+            r = p.run(ctx)
+            consumed += r.consumed
+            committed = committed or r.committed
+            errors += r.errors
+            if isinstance(r.outcome, Fail):
+                steps.close()
+                return Result[I, R].fail(r.context, r.outcome.error, consumed, committed, errors)
+            ctx = r.context
+            try:
+                p = steps.send(r.outcome.value)
+            except StopIteration as stop:
+                return Result[I, R].okay(ctx, stop.value, consumed, committed, errors)
+
+    parse.node = Node('do', (fn,))
+    return parse
+
 
 def tokens[I](values: Iterable[I]) -> Parser[I, list[I]]:
-    ps = [item.eq(v) for v in values]
-    return reduce(lambda p1, p2: p1.pair(p2).map(lambda x: [*x[0], x[1]]), ps, Parser[I, list[I]].okay([]))
+    expected = tuple(values)
+
+    # One closure for the whole sequence, equivalent to `item.eq(v)` for each value in turn.
+    @Parser
+    def parse(ctx: _Context[I]) -> Result[I, list[I]]:
+        consumed = 0
+        for v in expected:
+            r = item.run(ctx)
+            consumed += r.consumed
+            if isinstance(r.outcome, Fail):
+                return Result[I, list[I]].fail(r.context, r.outcome.error, consumed)
+            if r.outcome.value != v:
+                error = _UnExpected(repr(r.outcome.value), r.context.state.format())
+                return Result[I, list[I]].fail(r.context, error, consumed)
+            ctx = r.context
+        return Result[I, list[I]].okay(ctx, list(expected), consumed)
+
+    parse.node = Node('tokens', (expected,))
+    return parse
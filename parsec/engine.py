@@ -0,0 +1,356 @@
+"""Explicit-stack execution of parser graphs.
+
+`Parser.run` executes a grammar through nested Python calls, several frames per grammar nesting level, so deep
+inputs hit the recursion limit. `run` here walks the same combinator graph (`Parser.node`) with a heap-allocated
+stack of generators instead: every combinator kind has a step function mirroring its closure in `parsec.core`,
+yielding `(parser, context)` for each sub-parse and receiving the sub-result. Parsers without a node (`item`,
+user-written closures) are leaves and run natively.
+
+Results are identical to `Parser.run`. A `Budget` is checked by the engine itself, with the same step counts
+and the same innermost rule in `BudgetExceeded`, so budgeted parses keep their stack safety. Parses with other
+hooks (profiling, tracing) run on the recursive engine, since hooks wrap native calls.
+"""
+
+from typing import Any, Callable, Generator
+
+from parsec.budget import Budget as _Budget
+from parsec.context import Context as _Context
+from parsec.core import Fail as _Fail
+from parsec.core import Node as _Node
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.core import _lookahead, _recovering, item
+from parsec.error import AlterError as _AlterError
+from parsec.error import BudgetExceeded as _BudgetExceeded
+from parsec.error import Expected as _Expected
+from parsec.error import UnExpected as _UnExpected
+
+type Step[I] = Generator[tuple[_Parser[I, Any], _Context[I]], _Result[I, Any], _Result[I, Any]]
+
+
+def _ref[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    return (yield node.args[0], ctx)
+
+
+def _bind[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, fn = node.args
+    r1 = yield p, ctx
+    match r1.outcome:
+        case _Okay(value=v):
+            r2 = yield fn(v), r1.context
+            r2.consumed += r1.consumed
+            r2.committed = r2.committed or r1.committed
+            if r1.errors:
+                r2.errors = r1.errors + r2.errors
+            return r2
+        case _Fail(error=e):
+            return _Result[I, Any].fail(r1.context, e, r1.consumed, r1.committed, r1.errors)
+
+
+def _map[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, fn = node.args
+    r = yield p, ctx
+    match r.outcome:
+        case _Okay(value=v):
+            return _Result[I, Any].okay(r.context, fn(v), r.consumed, r.committed, r.errors)
+        case _Fail(error=e):
+            return _Result[I, Any].fail(r.context, e, r.consumed, r.committed, r.errors)
+
+
+def _alter[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p1, p2 = node.args
+    r1 = yield p1, ctx
+    if r1.committed or isinstance(r1.outcome, _Okay):
+        return r1
+    ctx = r1.context.backtrack(r1.consumed, ctx.state) if r1.consumed else r1.context
+    r2 = yield p2, ctx
+    if r2.committed or isinstance(r2.outcome, _Okay):
+        return r2
+    alt_err = _AlterError([r1.outcome.error, r2.outcome.error])
+    return _Result[I, Any].fail(r2.context, alt_err.join(), r2.consumed)
+
+
+def _fast_alter[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p1, p2 = node.args
+    r1 = yield p1, ctx
+    if r1.consumed > 0 or r1.committed or isinstance(r1.outcome, _Okay):
+        return r1
+    r2 = yield p2, r1.context
+    if r2.committed or isinstance(r2.outcome, _Okay):
+        return r2
+    alt_err = _AlterError([r1.outcome.error, r2.outcome.error])
+    return _Result[I, Any].fail(r2.context, alt_err.join(), r2.consumed)
+
+
+def _absent[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    token = _lookahead.set(_lookahead.get() + 1)
+    try:
+        r = yield node.args[0], ctx
+    finally:
+        _lookahead.reset(token)
+    ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+    match r.outcome:
+        case _Okay(value=v):
+            return _Result[I, None].fail(ctx, _UnExpected(repr(v), ctx.state.format()), 0)
+        case _Fail():
+            return _Result[I, None].okay(ctx, None, 0)
+
+
+def _where[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, fn = node.args
+    r = yield p, ctx
+    if isinstance(r.outcome, _Fail):
+        return r
+    if fn(r.outcome.value):
+        return r
+    return _Result[I, Any].fail(
+        r.context, _UnExpected(repr(r.outcome.value), r.context.state.format()), r.consumed, r.committed, r.errors
+    )
+
+
+def _label[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, expected = node.args
+    ret = yield p, ctx
+    if isinstance(ret.outcome, _Okay):
+        return ret
+    error = _Expected(expected, [ret.outcome.error])
+    return _Result[I, Any].fail(ret.context, error, ret.consumed, ret.committed, ret.errors)
+
+
+def _commit[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    r = yield node.args[0], ctx
+    if isinstance(r.outcome, _Okay):
+        r.committed = True
+        if not _lookahead.get():
+            r.context.release()
+    return r
+
+
+def _repeat[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, n = node.args
+    values: list[Any] = []
+    consumed = 0
+    committed = False
+    errors: tuple[Any, ...] = ()
+    for _ in range(n):
+        r = yield p, ctx
+        consumed += r.consumed
+        committed = committed or r.committed
+        errors += r.errors
+        if isinstance(r.outcome, _Fail):
+            return _Result[I, Any].fail(r.context, r.outcome.error, consumed, committed, errors)
+        values.append(r.outcome.value)
+        ctx = r.context
+    return _Result[I, Any].okay(ctx, values, consumed, committed, errors)
+
+
+def _fold[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, sep, make, step, first = node.args
+    acc = make()
+    consumed = 0
+    committed = False
+    errors: tuple[Any, ...] = ()
+    n = 0
+    while True:
+        used, cur, r = 0, ctx, None
+        if n and sep is not None:
+            r = yield sep, ctx
+            used, cur = r.consumed, r.context
+        if r is None or isinstance(r.outcome, _Okay):
+            s = yield p, cur
+            if r is not None:
+                s.committed = s.committed or r.committed
+                s.errors = r.errors + s.errors
+            used += s.consumed
+            r = s
+        if isinstance(r.outcome, _Fail):
+            if r.committed or (first and not n):
+                return _Result[I, Any].fail(
+                    r.context, r.outcome.error, consumed + used, committed or r.committed, errors + r.errors
+                )
+            ctx = r.context.backtrack(used, ctx.state) if used else r.context
+            return _Result[I, Any].okay(ctx, acc, consumed, committed, errors)
+        if step is None:
+            acc.append(r.outcome.value)
+        else:
+            acc = step(acc, r.outcome.value)
+        ctx = r.context
+        consumed += used
+        committed = committed or r.committed
+        errors += r.errors
+        n += 1
+        if not used:
+            return _Result[I, Any].okay(ctx, acc, consumed, committed, errors)
+
+
+def _do[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    steps = node.args[0]()
+    try:
+        p = next(steps)
+    except StopIteration as stop:
+        return _Result[I, Any].okay(ctx, stop.value, 0)
+    consumed = 0
+    committed = False
+    errors: tuple[Any, ...] = ()
+    while True:
+        r = yield p, ctx
+        consumed += r.consumed
+        committed = committed or r.committed
+        errors += r.errors
+        if isinstance(r.outcome, _Fail):
+            steps.close()
+            return _Result[I, Any].fail(r.context, r.outcome.error, consumed, committed, errors)
+        ctx = r.context
+        try:
+            p = steps.send(r.outcome.value)
+        except StopIteration as stop:
+            return _Result[I, Any].okay(ctx, stop.value, consumed, committed, errors)
+
+
+def _recover[I](node: _Node, ctx: _Context[I]) -> Step[I]:
+    p, sync, fallback = node.args
+    r = yield p, ctx
+    if isinstance(r.outcome, _Okay) or not _recovering.get():
+        return r
+    consumed, skip = 0, r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+    while True:
+        s = yield sync, skip
+        if isinstance(s.outcome, _Okay):
+            if consumed == 0 and s.consumed == 0:
+                return r
+            errors = r.errors + (r.outcome.error,) + s.errors
+            return _Result[I, Any].okay(s.context, fallback, consumed + s.consumed, r.committed, errors)
+        skip = s.context.backtrack(s.consumed, skip.state) if s.consumed else s.context
+        if skip.stream.eos():
+            if consumed == 0:
+                return r
+            return _Result[I, Any].okay(skip, fallback, consumed, r.committed, r.errors + (r.outcome.error,))
+        skip = item.run(skip).context
+        consumed += 1
+
+
+STEPS: dict[str, Callable[[_Node, _Context[Any]], Step[Any]]] = {
+    'ref': _ref,
+    'bind': _bind,
+    'map': _map,
+    'alter': _alter,
+    'fast_alter': _fast_alter,
+    'absent': _absent,
+    'where': _where,
+    'label': _label,
+    'commit': _commit,
+    'repeat': _repeat,
+    'fold': _fold,
+    'do': _do,
+    'recover': _recover,
+}
+
+
+def _task[I](parser: _Parser[I, Any], ctx: _Context[I]) -> Step[I] | _Result[I, Any]:
+    node = parser.node
+    while node is not None and node.kind == 'ref':
+        parser = node.args[0]
+        node = parser.node
+    if node is None or node.kind not in STEPS:
+        return parser.run(ctx)
+    return STEPS[node.kind](node, ctx)
+
+
+def _budget_task[I](
+    parser: _Parser[I, Any], ctx: _Context[I], budget: _Budget[I]
+) -> tuple[Step[I] | _Result[I, Any], str | None]:
+    # `_task` counting every invocation, references included, as `Budget.run` does on the recursive engine, with
+    # the innermost rule name the task runs in. Leaves run through the hook, which counts them.
+    name = None
+    try:
+        node = parser.node
+        while node is not None and node.kind == 'ref':
+            budget.step(ctx)
+            name = name if parser.name is None else parser.name
+            parser = node.args[0]
+            node = parser.node
+        if node is None or node.kind not in STEPS:
+            return parser.run(ctx), name
+        budget.step(ctx)
+        return STEPS[node.kind](node, ctx), name if parser.name is None else parser.name
+    except _BudgetExceeded as e:
+        if e.rule is None:
+            e.rule = name
+        raise
+
+
+def _run_budget[I, R](parser: _Parser[I, R], ctx: _Context[I], budget: _Budget[I]) -> _Result[I, R]:
+    # `run` with a budget: each frame keeps the rule it runs in, for the `BudgetExceeded` raised above it.
+    stack: list[Step[I]] = []
+    names: list[str | None] = []
+    try:
+        task, name = _budget_task(parser, ctx, budget)
+        ret: _Result[I, Any] | None = None
+        while True:
+            if isinstance(task, _Result):
+                ret = task
+            else:
+                stack.append(task)
+                names.append(name if name is not None or not names else names[-1])
+                ret = None
+            while stack:
+                try:
+                    sub, sub_ctx = stack[-1].send(ret)
+                except StopIteration as stop:
+                    stack.pop()
+                    names.pop()
+                    ret = stop.value
+                    continue
+                break
+            else:
+                return ret  # type: ignore[return-value]
+            task, name = _budget_task(sub, sub_ctx, budget)
+    except _BudgetExceeded as e:
+        if e.rule is None and names:
+            e.rule = names[-1]
+        raise
+    finally:
+        # Unwind the frames still open after an exception, innermost first, as the recursive engine would.
+        for step in reversed(stack):
+            step.close()
+
+
+def run[I, R](parser: _Parser[I, R], ctx: _Context[I]) -> _Result[I, R]:
+    """
+    Execute the parser on the given context without growing the Python call stack with the grammar nesting.
+
+    Args:
+        parser (Parser[I, R]): The parser to run.
+        ctx (Context[I]): The parsing context.
+
+    Returns:
+        Result[I, R]: The same result as `parser.run(ctx)`.
+
+    Example:
+        >>> engine.run(p, ctx)
+    """
+    if ctx.hook is not None:
+        if isinstance(ctx.hook, _Budget):
+            return _run_budget(parser, ctx, ctx.hook)
+        return parser.run(ctx)
+    stack: list[Step[I]] = []
+    task = _task(parser, ctx)
+    ret: _Result[I, Any] | None = None
+    while True:
+        if isinstance(task, _Result):
+            ret = task
+        else:
+            stack.append(task)
+            ret = None
+        while stack:
+            try:
+                sub, sub_ctx = stack[-1].send(ret)
+            except StopIteration as stop:
+                stack.pop()
+                ret = stop.value
+                continue
+            break
+        else:
+            return ret
+        task = _task(sub, sub_ctx)
@@ -84,3 +84,41 @@ class AlterError(ParseErr):
     def pretty(self, indent: int = 0):
         pad = ' ' * indent if indent > 0 else '\n'
         return f'{pad}AlterError'
+
+
+class BudgetExceeded(ParseErr):
+    """A parse ran out of its step budget or deadline. Raised rather than returned, so no alternative retries it."""
+
+    __eq__ = ParseErr.__eq__
+    __hash__ = ParseErr.__hash__
+
+    def __init__(self, reason: str, offset: int, state: str, rule: str | None = None):
+        self.reason = reason
+        self.offset = offset
+        self.state = state
+        self.rule = rule
+
+    def pretty(self, indent: int = 0):
+        pad = ' ' * indent if indent > 0 else '\n'
+        rule = '' if self.rule is None else f' in rule "{self.rule}"'
+        return f'{pad}Budget exceeded ({self.reason}){rule} at {self.state}'
+
+
+class FieldError(ParseErr):
+    """A field of a delimited record did not convert: where the field is, its text, and the converter's error."""
+
+    __eq__ = ParseErr.__eq__
+    __hash__ = ParseErr.__hash__
+
+    def __init__(self, line: int, column: int | str, value: str, error: ParseErr | str):
+        self.line = line
+        self.column = column
+        self.value = value
+        self.error = error
+
+    def pretty(self, indent: int = 0):
+        pad = ' ' * indent if indent > 0 else '\n'
+        head = f'{pad}Invalid field {self.column!r} "{self.value}" in the record at line {self.line}'
+        if isinstance(self.error, ParseErr):
+            return f'{head}\n{self.error.pretty(indent + self.indent)}'
+        return f'{head}: {self.error}'
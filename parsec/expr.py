@@ -0,0 +1,215 @@
+"""Operator-precedence expression parsers.
+
+A precedence tower of `chainl1` levels passes every operand through the bind/alter closures of every level.
+`operator_table` builds one parser for the whole table instead: at each position the operators of all levels are
+tried once, and the expression is assembled by precedence climbing over an explicit operator stack.
+"""
+
+from __future__ import annotations
+
+from functools import partial, reduce
+from typing import Any, Callable, Generator, Iterable, Literal, Mapping, get_args
+
+from parsec.context import Context as _Context
+from parsec.core import Fail as _Fail
+from parsec.core import Node as _Node
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.engine import STEPS as _STEPS
+
+type Assoc = Literal['left', 'right', 'none', 'prefix', 'postfix']
+type Operator = tuple[int, Assoc, Callable[..., Any]]
+# The parser to run for one kind of operator, and the table its value is looked up in (`None`: the value is the
+# operator itself).
+type Source[I] = tuple[_Parser[I, Any], dict[Any, Operator] | None] | None
+
+
+def _tag(prec: int, assoc: Assoc, fn: Callable[..., Any]) -> Operator:
+    return prec, assoc, fn
+
+
+def _operators[I](
+    levels: list[tuple[Any, Assoc]], kinds: tuple[Assoc, ...], token: _Parser[I, Any] | None
+) -> Source[I]:
+    # Earlier levels bind tighter. All operators of a kind become a single alternative tagged with their level, or a
+    # single lookup table when the operator token is parsed by `token`.
+    n = len(levels)
+    kind = [(n - i, ops, assoc) for i, (ops, assoc) in enumerate(levels) if assoc in kinds]
+    if not kind:
+        return None
+    if token is not None:
+        return token, {key: (prec, assoc, fn) for prec, ops, assoc in reversed(kind) for key, fn in ops.items()}
+    return reduce(_Parser.alter, [ops.map(partial(_tag, prec, assoc)) for prec, ops, assoc in kind]), None
+
+
+def _operator(r: _Result[Any, Any], table: dict[Any, Operator] | None) -> Operator | None:
+    if not isinstance(r.outcome, _Okay):
+        return None
+    return r.outcome.value if table is None else table.get(r.outcome.value)
+
+
+def _reduce(values: list[Any], ops: list[Operator], bound: int) -> None:
+    while ops and ops[-1][0] >= bound:
+        _, assoc, fn = ops.pop()
+        if assoc == 'prefix':
+            values[-1] = fn(values[-1])
+        else:
+            y = values.pop()
+            values[-1] = fn(values[-1])(y)
+
+
+def _climb[I](
+    ctx: _Context[I],
+    atom: _Parser[I, Any],
+    prefix: Source[I],
+    postfix: Source[I],
+    binary: Source[I],
+) -> Generator[tuple[_Parser[I, Any], _Context[I]], _Result[I, Any], _Result[I, Any]]:
+    # Yields each sub-parse and receives its result, so the same code serves `Parser.run` and `parsec.engine`.
+    values: list[Any] = []
+    ops: list[Operator] = []
+    consumed = 0
+    committed = False
+    errors: tuple[Any, ...] = ()
+    # (consumed, state, len(ops), committed, errors) before the last binary operator, to drop it if no operand
+    # follows.
+    back: tuple[int, Any, int, bool, tuple[Any, ...]] | None = None
+    while True:
+        while prefix is not None:
+            r = yield prefix[0], ctx
+            op = _operator(r, prefix[1])
+            if op is None:
+                if r.committed and isinstance(r.outcome, _Fail):
+                    return _Result[I, Any].fail(
+                        r.context, r.outcome.error, consumed + r.consumed, True, errors + r.errors
+                    )
+                ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+                break
+            ctx, consumed, committed = r.context, consumed + r.consumed, committed or r.committed
+            errors += r.errors
+            ops.append(op)
+        r = yield atom, ctx
+        if isinstance(r.outcome, _Fail):
+            if back is None or r.committed or committed != back[3]:
+                error = r.outcome.error
+                return _Result[I, Any].fail(
+                    r.context, error, consumed + r.consumed, committed or r.committed, errors + r.errors
+                )
+            ctx = r.context.backtrack(consumed + r.consumed - back[0], back[1])
+            consumed, errors = back[0], back[4]
+            del ops[back[2] :]
+            break
+        ctx, consumed, committed = r.context, consumed + r.consumed, committed or r.committed
+        errors += r.errors
+        values.append(r.outcome.value)
+
+        # A token that is not a postfix operator, kept for the binary lookup when both parse the same tokens.
+        token: _Result[I, Any] | None = None
+        while postfix is not None:
+            r = yield postfix[0], ctx
+            op = _operator(r, postfix[1])
+            if op is None:
+                if r.committed and isinstance(r.outcome, _Fail):
+                    return _Result[I, Any].fail(
+                        r.context, r.outcome.error, consumed + r.consumed, True, errors + r.errors
+                    )
+                if binary is not None and binary[0] is postfix[0]:
+                    token = r
+                ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+                break
+            prec, _, fn = op
+            _reduce(values, ops, prec)
+            values[-1] = fn(values[-1])
+            ctx, consumed, committed = r.context, consumed + r.consumed, committed or r.committed
+            errors += r.errors
+
+        if binary is None:
+            break
+        r = (yield binary[0], ctx) if token is None else token
+        op = _operator(r, binary[1])
+        if op is None:
+            if r.committed and isinstance(r.outcome, _Fail):
+                return _Result[I, Any].fail(r.context, r.outcome.error, consumed + r.consumed, True, errors + r.errors)
+            ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+            break
+        prec, assoc, fn = op
+        _reduce(values, ops, prec if assoc == 'left' else prec + 1)
+        if assoc == 'none' and ops and ops[-1][0] == prec:
+            # `a == b == c` on a non-associative level: the expression ends before the second operator.
+            ctx = r.context.backtrack(r.consumed, ctx.state) if r.consumed else r.context
+            break
+        back = consumed, ctx.state, len(ops), committed, errors
+        ctx, consumed, committed = r.context, consumed + r.consumed, committed or r.committed
+        errors += r.errors
+        ops.append((prec, assoc, fn))
+    _reduce(values, ops, 0)
+    return _Result[I, Any].okay(ctx, values[0], consumed, committed, errors)
+
+
+def _step[I](
+    node: _Node, ctx: _Context[I]
+) -> Generator[tuple[_Parser[I, Any], _Context[I]], _Result[I, Any], _Result[I, Any]]:
+    return _climb(ctx, *node.args)
+
+
+_STEPS['operator_table'] = _step
+
+
+def operator_table[I, R](
+    atom: _Parser[I, R],
+    table: Iterable[tuple[_Parser[I, Any] | Mapping[Any, Callable[..., Any]], Assoc]],
+    token: _Parser[I, Any] | None = None,
+) -> _Parser[I, R]:
+    """
+    Build an expression parser from a precedence table.
+
+    The table lists levels from the tightest binding to the loosest. Each level is a parser of its operators and
+    their associativity. Binary operators (`left`, `right`, `none`) yield curried functions `f(x)(y)`, as for
+    `chainl1`; `prefix` and `postfix` operators yield unary functions. An operator that is not followed by an
+    operand is left unconsumed, as `chainl1` does. Operators are tried in table order and the first match wins,
+    so an operator that is a prefix of an operator on a looser level (`&` and `&&`) must reject the longer one.
+
+    With a `token` parser, each level is instead a mapping from token values to functions: the operator token is
+    parsed once per position and looked up, however many levels and operators the table has.
+
+    Args:
+        atom (Parser[I, R]): Parser of the operands, including parenthesized sub-expressions.
+        table (Iterable[tuple[Parser[I, Any] | Mapping[Any, Callable[..., Any]], Assoc]]): Operator levels,
+            tightest first.
+        token (Parser[I, Any] | None): Parser of operator tokens, for tables of mappings.
+
+    Returns:
+        Parser[I, R]: The expression parser.
+
+    Example:
+        >>> expr = Parser[str, int]()
+        >>> expr.define(operator_table(
+        ...     expr.between(lex.l_round, lex.r_round) | lex.integer,
+        ...     [(lex.char('-') @ (lambda _: neg), 'prefix'), (mul_or_div, 'left'), (add_or_sub, 'left')],
+        ... ))
+    """
+    levels = list(table)
+    for ops, assoc in levels:
+        if assoc not in get_args(Assoc.__value__):
+            raise ValueError(f'unknown associativity {assoc!r}')
+        if isinstance(ops, _Parser) == (token is not None):
+            raise TypeError('levels must be parsers, or mappings when a token parser is given')
+    args = (
+        atom,
+        _operators(levels, ('prefix',), token),
+        _operators(levels, ('postfix',), token),
+        _operators(levels, ('left', 'right', 'none'), token),
+    )
+
+    def parse(ctx: _Context[I]) -> _Result[I, R]:
+        steps = _climb(ctx, *args)
+        r: _Result[I, Any] | None = None
+        try:
+            while True:
+                p, sub_ctx = steps.send(r)
+                r = p.run(sub_ctx)
+        except StopIteration as stop:
+            return stop.value
+
+    return _Parser(parse, node=_Node('operator_table', args))
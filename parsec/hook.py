@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Self
+
+from parsec.context import Context as _Context
+from parsec.context import IHook as _IHook
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+
+_active: ContextVar[tuple[_IHook[Any], ...]] = ContextVar('parsec.hook', default=())
+
+
+class Chain[I](_IHook[I]):
+    """Runs several hooks around the same parser invocation, the first one outermost."""
+
+    def __init__(self, hooks: Iterable[_IHook[I]]):
+        self.hooks = tuple(hooks)
+
+    def run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        for hook in reversed(self.hooks[1:]):
+            call = partial(hook.run, parser, call=call)
+        return self.hooks[0].run(parser, ctx, call)
+
+    def release(self, offset: int) -> None:
+        for hook in self.hooks:
+            hook.release(offset)
+
+
+class Hook[I](_IHook[I]):
+    """Base of hooks that install themselves for the parses started inside a `with` block."""
+
+    def __init__(self) -> None:
+        self._tokens: list[Token[tuple[_IHook[Any], ...]]] = []
+
+    def __enter__(self) -> Self:
+        self._tokens.append(_active.set((*_active.get(), self)))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _active.reset(self._tokens.pop())
+
+
+@contextmanager
+def use[H: _IHook[Any]](hook: H) -> Iterator[H]:
+    """
+    Activate a hook for every parse started in the current (thread or task) context.
+
+    Args:
+        hook (IHook): The hook to install.
+
+    Returns:
+        Iterator[IHook]: Context manager yielding the hook.
+
+    Example:
+        >>> with use(tracer):
+        ...     text.parse(p, src)
+    """
+    token = _active.set((*_active.get(), hook))
+    try:
+        yield hook
+    finally:
+        _active.reset(token)
+
+
+def current(*extra: _IHook[Any] | None) -> _IHook[Any] | None:
+    """
+    Combine the active hooks with extra ones into the hook attached to a new parse context.
+
+    Args:
+        *extra (IHook | None): Additional hooks, `None` entries are ignored.
+
+    Returns:
+        IHook | None: `None` when no hook is active, so that unhooked parses pay nothing.
+    """
+    hooks = (*_active.get(), *(h for h in extra if h is not None))
+    if not hooks:
+        return None
+    if len(hooks) == 1:
+        return hooks[0]
+    return Chain(hooks)
@@ -0,0 +1,187 @@
+import sys
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Callable, TextIO
+
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+
+_COLUMNS = ('calls', 'okay', 'fail', 'tottime', 'cumtime', 'consumed', 'reconsumed', 'results', 'contexts')
+
+
+@dataclass
+class RuleStats:
+    """Statistics of one rule, aggregated over every parser sharing the rule name.
+
+    `tottime`, `results` and `contexts` only count work done while the rule was the innermost named rule,
+    `cumtime` includes nested rules. `reconsumed` is the input a rule read again at an offset it had already
+    parsed from in the same parse, i.e. the work lost to backtracking.
+    """
+
+    name: str
+    calls: int = 0
+    okay: int = 0
+    fail: int = 0
+    tottime: float = 0.0
+    cumtime: float = 0.0
+    consumed: int = 0
+    reconsumed: int = 0
+    results: int = 0
+    contexts: int = 0
+
+
+@dataclass
+class _Frame:
+    start: float
+    results: int
+    contexts: int
+    children: float = 0.0
+    child_results: int = 0
+    child_contexts: int = 0
+
+
+class Profiler[I](_hook.Hook[I]):
+    """Per-rule profiler for labelled and named parsers.
+
+    Use it as a context manager: every parse started inside the block is profiled. Allocations are counted by
+    the hook itself, which sees every parser call: one `Result` per call, and a `Context` whenever the call returns
+    a context other than the one it was given. Parses in other threads are not affected.
+
+    Example:
+        >>> with profile() as prof:
+        ...     text.parse(expr, src)
+        >>> prof.print_stats(sort='tottime')
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.rules: dict[str, RuleStats] = {}
+        self._stack: list[_Frame] = []
+        self._depth: dict[str, int] = {}
+        # Offsets each rule parsed from, and how far, in the current parse.
+        self._spans: dict[str, dict[int, int]] = {}
+        # Parser calls in progress: none between two parses.
+        self._active = 0
+        self._results = 0
+        self._contexts = 0
+
+    def run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        if not self._active:
+            # A new parse: the offsets read from the previous input say nothing about this one.
+            self._spans.clear()
+        self._active += 1
+        try:
+            return self._run(parser, ctx, call)
+        finally:
+            self._active -= 1
+
+    def _run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        name = parser.name
+        if name is None:
+            ret = call(ctx)
+            self._results += 1
+            if ret.context is not ctx:
+                self._contexts += 1
+            return ret
+        rule = self.rules.get(name)
+        if rule is None:
+            rule = self.rules[name] = RuleStats(name)
+        offset = ctx.stream.tell()
+        frame = _Frame(perf_counter(), self._results, self._contexts)
+        self._stack.append(frame)
+        self._depth[name] = self._depth.get(name, 0) + 1
+        try:
+            ret = call(ctx)
+            self._results += 1
+            if ret.context is not ctx:
+                self._contexts += 1
+        finally:
+            elapsed = perf_counter() - frame.start
+            self._stack.pop()
+            self._depth[name] -= 1
+            results = self._results - frame.results
+            contexts = self._contexts - frame.contexts
+            rule.calls += 1
+            rule.tottime += elapsed - frame.children
+            rule.results += results - frame.child_results
+            rule.contexts += contexts - frame.child_contexts
+            if not self._depth[name]:
+                rule.cumtime += elapsed
+            if self._stack:
+                parent = self._stack[-1]
+                parent.children += elapsed
+                parent.child_results += results
+                parent.child_contexts += contexts
+        if isinstance(ret.outcome, _Okay):
+            rule.okay += 1
+        else:
+            rule.fail += 1
+        rule.consumed += ret.consumed
+        spans = self._spans.setdefault(name, {})
+        seen = spans.get(offset, 0)
+        rule.reconsumed += min(seen, ret.consumed)
+        if ret.consumed > seen:
+            spans[offset] = ret.consumed
+        return ret
+
+    @property
+    def allocations(self) -> dict[str, int]:
+        """Total `Result` and `Context` objects returned by the parser calls profiled."""
+        return {'results': self._results, 'contexts': self._contexts}
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        """
+        Machine-readable statistics.
+
+        Returns:
+            dict[str, dict[str, int | float]]: Rule name mapped to its counters.
+        """
+        return {name: {k: v for k, v in asdict(rule).items() if k != 'name'} for name, rule in self.rules.items()}
+
+    def table(self, sort: str = 'tottime', limit: int | None = None) -> str:
+        """
+        Render the statistics as a text table.
+
+        Args:
+            sort (str): Column to sort by, descending. One of `name` or the counter names.
+            limit (int | None): Maximum number of rows.
+
+        Returns:
+            str: The formatted table.
+        """
+        if sort != 'name' and sort not in _COLUMNS:
+            raise ValueError(f'unknown sort key {sort!r}, expected "name" or one of {", ".join(_COLUMNS)}')
+        rules = sorted(self.rules.values(), key=lambda r: getattr(r, sort), reverse=sort != 'name')[:limit]
+        width = max([4, *(len(r.name) for r in rules)])
+        lines = [f'{"rule":<{width}}' + ''.join(f'{c:>12}' for c in _COLUMNS)]
+        for rule in rules:
+            cells = (
+                f'{v:>12.6f}' if isinstance(v, float) else f'{v:>12}' for v in (getattr(rule, c) for c in _COLUMNS)
+            )
+            lines.append(f'{rule.name:<{width}}' + ''.join(cells))
+        return '\n'.join(lines)
+
+    def print_stats(self, sort: str = 'tottime', limit: int | None = None, file: TextIO | None = None) -> None:
+        print(self.table(sort, limit), file=sys.stderr if file is None else file)
+
+
+def profile() -> Profiler[Any]:
+    """
+    Profile every parse run inside a `with` block.
+
+    Returns:
+        Profiler: A profiler to be used as a context manager.
+
+    Example:
+        >>> with profile() as prof:
+        ...     text.parse(expr, src)
+        >>> prof.stats()['number']['calls']
+    """
+    return Profiler()
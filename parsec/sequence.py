@@ -0,0 +1,188 @@
+"""Parsing sequences of arbitrary items: token lists, `array.array` and NumPy arrays.
+
+`SequenceStream` reads any `Sequence` by position. `take_while` and `skip_while` consume a run of items in one
+step; given a `vectorized` predicate (one that maps an array to a boolean mask, such as `lambda a: a > 0`), they
+test `array.array` and NumPy inputs slice by slice with NumPy instead of one Python call per item. NumPy is
+optional (`pip install parsec-python[numpy]`); without it, or for other sequences, the predicate is called per item.
+
+Example:
+    >>> samples = array('d', [0.5, 1.5, -1.0, 2.0])
+    >>> positive = sequence.take_while(lambda a: a > 0, vectorized=True)
+    >>> sequence.parse(positive, samples)
+    array('d', [0.5, 1.5])
+"""
+
+from array import array
+from typing import Any, Callable, Sequence
+
+from parsec import engine as _engine
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.context import IState as _IState
+from parsec.context import IStream as _IStream
+from parsec.core import Fail as _Fail
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+
+def _vector(data: Sequence[Any]) -> Any:
+    # A NumPy view of the data when it can be scanned vectorized, without copying.
+    if _np is None:
+        return None
+    if isinstance(data, _np.ndarray):
+        return data
+    if isinstance(data, array) and data.typecode not in 'uw':
+        return _np.frombuffer(data, dtype=data.typecode)
+    return None
+
+
+class SequenceStream[I](_IStream[I]):
+    def __init__(self, data: Sequence[I], offset: int = 0, vector: Any = ...):
+        self.data = data
+        self.offset = offset
+        # Computed once per input and shared by the streams derived from this one.
+        self.vector = _vector(data) if vector is ... else vector
+
+    def peek(self, n: int = 1) -> list[I]:
+        return list(self.data[self.offset : self.offset + n])
+
+    def move(self, offset: int):
+        return SequenceStream(self.data, self.offset + offset, self.vector)
+
+    def seek(self, offset: int):
+        return SequenceStream(self.data, offset, self.vector)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def eos(self) -> bool:
+        return not (0 <= self.offset < len(self.data))
+
+    def scan(self, pred: Callable[[I], bool], vectorized: bool = False) -> int:
+        data, start = self.data, self.offset
+        n = len(data)
+        if vectorized and self.vector is not None:
+            # Growing slices: a short run costs one small slice, a long run a few large ones.
+            pos, size = start, 256
+            while pos < n:
+                mask = _np.asarray(pred(self.vector[pos : pos + size]), dtype=bool)  # type: ignore[union-attr]
+                stop = int(mask.argmin())
+                if not mask[stop]:
+                    return pos + stop - start
+                pos += len(mask)
+                size = min(size * 4, 1 << 20)
+            return n - start
+        pos = start
+        while pos < n and pred(data[pos]):
+            pos += 1
+        return pos - start
+
+
+class SequenceState[I](_IState[I]):
+    """The index of the next item, for error messages."""
+
+    def __init__(self, index: int = 0):
+        self.index = index
+
+    def update(self, value: I):
+        return SequenceState[I](self.index + 1)
+
+    def update_many(self, values: Sequence[I]):
+        return SequenceState[I](self.index + len(values))
+
+    def format(self):
+        return f'#{self.index}'
+
+
+def _take(stream: _IStream[Any], n: int) -> Sequence[Any]:
+    # A slice of the underlying sequence keeps its type (array, ndarray); other streams read a list.
+    if isinstance(stream, SequenceStream):
+        return stream.data[stream.offset : stream.offset + n]
+    return stream.peek(n)
+
+
+def take_while[I](pred: Callable[[I], bool], *, vectorized: bool = False) -> _Parser[I, Sequence[I]]:
+    """
+    Consume the longest run of items satisfying `pred`, possibly empty.
+
+    Args:
+        pred (Callable[[I], bool]): Item predicate.
+        vectorized (bool): `pred` also accepts an array of items and returns a boolean mask, so that array inputs
+            are tested slice by slice with NumPy.
+
+    Returns:
+        Parser[I, Sequence[I]]: Parser of the run: a slice of the input for `SequenceStream` (an `array` or
+            `ndarray` for array inputs), a list otherwise.
+
+    Example:
+        >>> digits = take_while(str.isdigit)
+    """
+
+    @_Parser
+    def parse(ctx: _Context[I]) -> _Result[I, Sequence[I]]:
+        stream = ctx.stream
+        n = stream.scan(pred, vectorized)
+        start = stream.tell()
+        values = _take(stream, n)
+        state = ctx.state.update_many(values)
+        return _Result[I, Sequence[I]].okay(_Context(stream.seek(start + n), state, ctx.hook), values, n)
+
+    return parse
+
+
+def skip_while[I](pred: Callable[[I], bool], *, vectorized: bool = False) -> _Parser[I, int]:
+    """
+    Skip the longest run of items satisfying `pred`, possibly empty.
+
+    Args:
+        pred (Callable[[I], bool]): Item predicate.
+        vectorized (bool): `pred` also accepts an array of items and returns a boolean mask.
+
+    Returns:
+        Parser[I, int]: Parser yielding the number of items skipped.
+
+    Example:
+        >>> silence = skip_while(lambda a: abs(a) < 1e-3, vectorized=True)
+    """
+
+    @_Parser
+    def parse(ctx: _Context[I]) -> _Result[I, int]:
+        stream = ctx.stream
+        n = stream.scan(pred, vectorized)
+        if not n:
+            return _Result[I, int].okay(ctx, 0, 0)
+        start = stream.tell()
+        state = ctx.state.update_many(_take(stream, n))
+        return _Result[I, int].okay(_Context(stream.seek(start + n), state, ctx.hook), n, n)
+
+    return parse
+
+
+def parse[I, R](parser: _Parser[I, R], data: Sequence[I], *, stackless: bool = False) -> R:
+    """
+    Parse a sequence of items.
+
+    Args:
+        parser (Parser[I, R]): The grammar.
+        data (Sequence[I]): The items: a list, tuple, `array.array`, NumPy array or any other `Sequence`.
+        stackless (bool): Run on the explicit-stack engine.
+
+    Returns:
+        R: The value; raises `ParseErr` on failure.
+
+    Example:
+        >>> sequence.parse(item.eq('let').suffix(item).many(), ['let', 'x', 'let', 'y'])
+    """
+    ctx = _Context(SequenceStream(data), SequenceState[I](), _hook.current())
+    ret = _engine.run(parser, ctx) if stackless else parser.run(ctx)
+    match ret.outcome:
+        case _Okay(value=v):
+            return v
+        case _Fail(error=e):
+            raise e
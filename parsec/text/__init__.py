@@ -19,6 +19,8 @@ from parsec.text.basic import (
     hyphen,
     identifier,
     integer,
+    isodatetime,
+    isotime,
     l_bracket,
     l_curly,
     l_round,
@@ -31,16 +33,24 @@ from parsec.text.basic import (
     r_bracket,
     r_curly,
     r_round,
+    regex,
     semicolon,
     string,
+    string_literal,
     time,
+    timestamps,
     underline,
     upper,
 )
-from parsec.text.context import parse
+from parsec.text.cached import CachedParser
+from parsec.text.context import ParseSession, parse, parse_all_errors, parse_many_threads
 
 __all__ = [
+    'CachedParser',
+    'ParseSession',
     'parse',
+    'parse_all_errors',
+    'parse_many_threads',
     'alnum',
     'alpha',
     'bindigit',
@@ -61,6 +71,8 @@ __all__ = [
     'hyphen',
     'identifier',
     'integer',
+    'isodatetime',
+    'isotime',
     'l_bracket',
     'l_curly',
     'l_round',
@@ -73,9 +85,12 @@ __all__ = [
     'r_bracket',
     'r_curly',
     'r_round',
+    'regex',
     'semicolon',
     'string',
+    'string_literal',
     'time',
+    'timestamps',
     'underline',
     'upper',
 ]
@@ -1,12 +1,19 @@
+import operator as _operator
+import re as _re
 from datetime import date as _Date
 from datetime import datetime as _Datetime
 from datetime import time as _Time
 from functools import partial as _partial
-from typing import cast
+from typing import Any, Callable, Iterable, cast
 
+from parsec.context import Context as _Context
+from parsec.core import Node as _Node
 from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
 from parsec.core import item as _item
 from parsec.core import tokens as _tokens
+from parsec.error import EOSError as _EOSError
+from parsec.error import UnExpected as _UnExpected
 
 _s_join = ''.join
 
@@ -17,6 +24,44 @@ def literal(text: str) -> _Parser[str, str]:
     return _tokens(text).map(_s_join)
 
 
+def _unexpected(ctx: _Context[str], pos: int) -> _UnExpected:
+    """The error for the character at `pos`, at or after the offset of `ctx`."""
+    data: str = ctx.stream.data  # type: ignore[attr-defined]
+    state = ctx.state.update(data[ctx.stream.tell() : pos]) if pos > ctx.stream.tell() else ctx.state
+    if pos >= len(data):
+        return _EOSError(state.format())
+    return _UnExpected(repr(data[pos]), state.format())
+
+
+def regex(pattern: str | _re.Pattern[str], flags: int = 0) -> _Parser[str, str]:
+    """
+    Match a regular expression at the current position in one step, yielding the matched text.
+
+    Needs a stream with `match`, such as `TextStream`.
+
+    Args:
+        pattern (str | re.Pattern[str]): The expression.
+        flags (int): `re` flags, for a `str` pattern.
+
+    Returns:
+        Parser[str, str]: Parser of the matched text.
+
+    Example:
+        >>> word = regex(r'[A-Za-z_][A-Za-z0-9_]*')
+    """
+    compiled = _re.compile(pattern, flags)
+
+    def parse(ctx: _Context[str]) -> _Result[str, str]:
+        m: Any = ctx.stream.match(compiled)  # type: ignore[attr-defined]
+        if m is None:
+            return _Result[str, str].fail(ctx, _unexpected(ctx, ctx.stream.tell()), 0)
+        value: str = m.group()
+        stream = ctx.stream.seek(m.end())
+        return _Result[str, str].okay(_Context(stream, ctx.state.update(value), ctx.hook), value, len(value))
+
+    return _Parser(parse, node=_Node('regex', (compiled,)))
+
+
 def _digit_n(n: int) -> _Parser[str, str]:
     return digit.repeat(n).map(_s_join)
 
@@ -56,7 +101,7 @@ decinteger = (_num_sign & _digits1).map(_s_join)
 bininteger = (_num_sign & _bindigit1.prefix(char('0') & _item.range('bB'))).map(_s_join)
 octinteger = (_num_sign & _octdigit1.prefix(char('0') & _item.range('oO'))).map(_s_join)
 hexinteger = (_num_sign & _hexdigit1.prefix(char('0') & _item.range('xX'))).map(_s_join)
-integer: _Parser[str, int] = (
+_integer: _Parser[str, int] = (
     hexinteger.map(_partial(int, base=16))
     | octinteger.map(_partial(int, base=8))
     | bininteger.map(_partial(int, base=2))
@@ -67,16 +112,231 @@ _exponent = (_item.range('eE') & decinteger).map(_s_join)
 _dotment = (dot & _digits & _exponent.default('')).map(_s_join)
 _digit_float = (_num_sign & _digits1 & (_dotment | _exponent)).map(_s_join)
 _dot_float = (_num_sign & dot & _digits1 & _exponent.default('')).map(_s_join)
-floatnumber: _Parser[str, float] = (_dot_float | _digit_float).map(float).label('float number')
-number: _Parser[str, float | int] = (floatnumber | integer).label('number')
+_floatnumber: _Parser[str, float] = (_dot_float | _digit_float).map(float).label('float number')
+_number: _Parser[str, float | int] = (_floatnumber | _integer).label('number')
+
+
+def _scan[R](pattern: str, reference: _Parser[str, R], *, lookahead: int = 3) -> _Parser[str, R]:
+    """
+    A one-step equivalent of `reference`: `pattern` is its syntax, written with atomic groups in the order of its
+    alternatives, and the name of the group that matched selects the conversion. Where `pattern` does not match,
+    `reference` runs, so the errors are those of the grammar. `pattern` spells `str.isdigit` as `[0-9]`, so
+    `reference` also runs when one of the `lookahead` characters after the match is not ASCII: a Unicode digit
+    there could have extended the match.
+    """
+    compiled = _re.compile(pattern)
+    fallback = reference._fn
+    assert fallback is not None
+
+    def parse(ctx: _Context[str]) -> _Result[str, R]:
+        stream = ctx.stream
+        match = getattr(stream, 'match', None)
+        m: Any = None if match is None else match(compiled)
+        if m is None:
+            return fallback(ctx)
+        end = m.end()
+        if lookahead and not m.string[end : end + lookahead].isascii():
+            return fallback(ctx)
+        text: str = m.group()
+        value = _CONVERT[m.lastgroup](text)
+        return _Result[str, R].okay(_Context(stream.seek(end), ctx.state.update(text), ctx.hook), value, len(text))
+
+    return _Parser(parse, reference.name, _Node('regular', (compiled, reference)))
+
+
+_CONVERT: dict[str, Any] = {
+    'float': float,
+    'hex': _partial(int, base=16),
+    'oct': _partial(int, base=8),
+    'bin': _partial(int, base=2),
+    'dec': int,
+    'quoted': _operator.itemgetter(slice(1, -1)),
+}
+_EXP = r'[eE][+-]?+[0-9]++'
+_FLOAT = rf'(?P<float>[+-]?+(?>\.[0-9]++(?:{_EXP})?+|[0-9]++(?>\.[0-9]*+(?:{_EXP})?+|{_EXP})))'
+_INTEGER = (
+    r'(?P<hex>[+-]?+0[xX][0-9A-Fa-f]++)|(?P<oct>[+-]?+0[oO][0-7]++)|(?P<bin>[+-]?+0[bB][01]++)|(?P<dec>[+-]?+[0-9]++)'
+)
+
+integer: _Parser[str, int] = _scan(f'(?>{_INTEGER})', _integer)
+floatnumber: _Parser[str, float] = _scan(f'(?>{_FLOAT})', _floatnumber)
+number: _Parser[str, float | int] = _scan(f'(?>{_FLOAT}|{_INTEGER})', _number)
 
 blanks = blank.many().map(_s_join)
 identifier = ((alpha | underline) & (alnum | underline).many().map(_s_join)).map(_s_join).label('identifier')
-date: _Parser[str, _Date] = (
-    (_digit_n(4) & hyphen & _digit_n(2) & hyphen & _digit_n(2)).map(_s_join).map(_Date.fromisoformat)
-).label('date')
-time: _Parser[str, _Time] = (
-    (_digit_n(2) & colon & _digit_n(2) & colon & _digit_n(2)).map(_s_join).map(_Time.fromisoformat)
-).label('time')
-datetime: _Parser[str, _Datetime] = (date.suffix(char(' ')) & time).map(lambda dt: _Datetime.combine(dt[0], dt[1]))
-string = _item.neq('"').many().map(_s_join).between(quotation, quotation)
+_ymd = (_digit_n(4) & hyphen & _digit_n(2) & hyphen & _digit_n(2)).map(_s_join)
+_clock = (_digit_n(2) & colon & _digit_n(2) & colon & _digit_n(2)).map(_s_join)
+_fraction = (_item.range('.,') & _digits1).map(_s_join).default('')
+_offset = (char('Z') | (_item.range('+-') & _digit_n(2) & colon.default('') & _digit_n(2)).map(_s_join)).default('')
+_date: _Parser[str, _Date] = _ymd.map(_Date.fromisoformat).label('date')
+_time: _Parser[str, _Time] = _clock.map(_Time.fromisoformat).label('time')
+_datetime: _Parser[str, _Datetime] = (_date.suffix(char(' ')) & _time).map(lambda dt: _Datetime.combine(dt[0], dt[1]))
+_isotime: _Parser[str, _Time] = (_clock & _fraction & _offset).map(_s_join).map(_Time.fromisoformat).label('time')
+_isodatetime: _Parser[str, _Datetime] = (
+    (_ymd & _item.range('T ') & _clock & _fraction & _offset).map(_s_join).map(_Datetime.fromisoformat)
+).label('datetime')
+
+
+def _recent[R](convert: Callable[[str], R]) -> Callable[[str], R]:
+    # Returns the previous value again when the same text comes back, as timestamps of consecutive log lines do.
+    # The text and value are stored as one tuple, so concurrent parses never see a mismatched pair.
+    last: list[tuple[str, Any]] = [('', None)]
+
+    def convert_recent(text: str) -> R:
+        seen = last[0]
+        if seen[0] == text:
+            return seen[1]
+        value = convert(text)
+        last[0] = text, value
+        return value
+
+    return convert_recent
+
+
+def _recent_datetime() -> Callable[[str], _Datetime]:
+    # Consecutive timestamps mostly share their date: the date is converted from the `YYYY-MM-DD` prefix when it
+    # changes, and combined with the time, fraction and offset converted from the rest. A timestamp equal to the
+    # previous one shares its value. Each cache is one tuple, so concurrent parses never see a mismatched pair.
+    last_date: list[tuple[str, Any]] = [('', None)]
+    last: list[tuple[str, Any]] = [('', None)]
+    convert_time, combine = _Time.fromisoformat, _Datetime.combine
+
+    def convert_datetime(text: str) -> _Datetime:
+        seen = last[0]
+        if seen[0] == text:
+            return seen[1]
+        day = last_date[0]
+        try:
+            if day[0] != text[:10]:
+                day = last_date[0] = text[:10], _Date.fromisoformat(text[:10])
+            value = combine(day[1], convert_time(text[11:]))
+        except ValueError:
+            # Raise the error, or accept the text, exactly as `datetime.fromisoformat` does.
+            value = _Datetime.fromisoformat(text)
+        last[0] = text, value
+        return value
+
+    return convert_datetime
+
+
+_YMD = '[0-9]{4}-[0-9]{2}-[0-9]{2}'
+_CLOCK = '[0-9]{2}:[0-9]{2}:[0-9]{2}'
+_ISOTIME = rf'{_CLOCK}(?:[.,][0-9]++)?+(?:Z|[+-][0-9]{{2}}:?+[0-9]{{2}})?+'
+_CONVERT.update(
+    date=_recent(_Date.fromisoformat),
+    time=_Time.fromisoformat,
+    datetime=_recent_datetime(),
+)
+
+# Fixed widths need no lookahead; the optional fraction and offset can stop before a digit up to 6 characters on.
+date: _Parser[str, _Date] = _scan(f'(?P<date>{_YMD})', _date, lookahead=0)
+time: _Parser[str, _Time] = _scan(f'(?P<time>{_CLOCK})', _time, lookahead=0)
+datetime: _Parser[str, _Datetime] = _scan(f'(?P<datetime>{_YMD} {_CLOCK})', _datetime, lookahead=0)
+isotime: _Parser[str, _Time] = _scan(f'(?P<time>{_ISOTIME})', _isotime, lookahead=6)
+isodatetime: _Parser[str, _Datetime] = _scan(f'(?P<datetime>{_YMD}[T ]{_ISOTIME})', _isodatetime, lookahead=6)
+
+
+def timestamps(column: Iterable[str]) -> list[_Datetime]:
+    """
+    Convert a column of ISO 8601 timestamps, such as a field of delimited records, to `datetime` values.
+
+    Each value is converted with one `datetime.fromisoformat` call, which accepts the syntax of `isodatetime` among
+    others; a value equal to the one before it is not converted again but shares its `datetime`.
+
+    Args:
+        column (Iterable[str]): The timestamps.
+
+    Returns:
+        list[datetime]: The values, in order; raises `ValueError` naming the index of an invalid timestamp.
+
+    Example:
+        >>> timestamps(['2024-05-01T12:00:00Z', '2024-05-01T12:00:00Z', '2024-05-01 12:00:01.25'])
+    """
+    convert = _Datetime.fromisoformat
+    values: list[_Datetime] = []
+    append = values.append
+    last, value = None, None
+    for i, text in enumerate(column):
+        if text != last:
+            try:
+                value = convert(text)
+            except ValueError as e:
+                raise ValueError(f'timestamp #{i}: {e}') from None
+            last = text
+        append(value)  # type: ignore[arg-type]
+    return values
+
+
+_string = _item.neq('"').many().map(_s_join).between(quotation, quotation)
+string = _scan('(?>"(?P<quoted>[^"]*+)")', _string, lookahead=0)
+
+_ESCAPE = _re.compile(
+    r'\\(?:u([dD][89abAB][0-9a-fA-F]{2})\\u([dD][c-fC-F][0-9a-fA-F]{2})|u([0-9a-fA-F]{4})|(.))', _re.S
+)
+_ESCAPES = {'"': '"', "'": "'", '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def _escape(m: _re.Match[str]) -> str:
+    high, low, code, char = m.groups()
+    if high is not None:
+        return chr(0x10000 + ((int(high, 16) - 0xD800) << 10) + int(low, 16) - 0xDC00)
+    if code is not None:
+        return chr(int(code, 16))
+    # Any other character is the quote of the literal.
+    return _ESCAPES.get(char, char)
+
+
+def _unescape(body: str) -> str:
+    """Decode the escape sequences of a string literal's body, already checked to be valid."""
+    return _ESCAPE.sub(_escape, body) if '\\' in body else body
+
+
+def string_literal(quote: str = '"', *, raw: bool = False) -> _Parser[str, str]:
+    """
+    Parse a quoted string literal in one step, yielding its contents with the escape sequences decoded.
+
+    A regular expression skips from one quote or backslash to the next; a literal without escapes yields a slice
+    of the input. The escapes are those of JSON and Python: `\\\\`, `\\/`, `\\b`, `\\f`, `\\n`, `\\r`, `\\t`, `\\"`,
+    `\\'`, a backslash before `quote`, and `\\uXXXX`, with surrogate pairs combined into one character. Any other
+    escape is an error. In raw mode backslashes are ordinary characters and the literal ends at the next quote.
+
+    Needs a stream with `match`, such as `TextStream`.
+
+    Args:
+        quote (str): The quote character, which opens and closes the literal.
+        raw (bool): Do not decode escapes.
+
+    Returns:
+        Parser[str, str]: Parser of the contents of the literal.
+
+    Example:
+        >>> message = string_literal()
+        >>> pattern = string_literal("'", raw=True)
+    """
+    if len(quote) != 1 or quote == '\\':
+        raise ValueError(f'the quote must be one character other than a backslash, got {quote!r}')
+    q = _re.escape(quote)
+    if raw:
+        body = f'[^{q}]*+'
+    else:
+        escapes = _re.escape(''.join(sorted(_ESCAPES.keys() | {quote})))
+        body = rf'[^{q}\\]*+(?:\\(?:[{escapes}]|u[0-9a-fA-F]{{4}})[^{q}\\]*+)*+'
+    literal = _re.compile(f'{q}(?P<body>{body}){q}')
+    # The longest valid start of a literal, to locate an error.
+    prefix = _re.compile(f'{q}{body}')
+
+    def parse(ctx: _Context[str]) -> _Result[str, str]:
+        stream = ctx.stream
+        m: Any = stream.match(literal)  # type: ignore[attr-defined]
+        if m is None:
+            # No opening quote, the end of input before the closing quote, or the character of a bad escape.
+            p: Any = stream.match(prefix)  # type: ignore[attr-defined]
+            pos = stream.tell() if p is None else p.end() + (p.string[p.end() : p.end() + 1] == '\\')
+            return _Result[str, str].fail(ctx, _unexpected(ctx, pos), 0)
+        text: str = m.group()
+        value = m.group('body') if raw else _unescape(m.group('body'))
+        return _Result[str, str].okay(
+            _Context(stream.seek(m.end()), ctx.state.update(text), ctx.hook), value, len(text)
+        )
+
+    return _Parser(parse)
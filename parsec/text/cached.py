@@ -0,0 +1,141 @@
+"""Whole-document result cache for inputs that are parsed again and again."""
+
+import sys
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from parsec.core import Parser as _Parser
+from parsec.error import BudgetExceeded as _BudgetExceeded
+from parsec.error import ParseErr as _ParseErr
+from parsec.text.context import parse as _parse
+
+
+@dataclass(slots=True)
+class _Entry:
+    text: str
+    okay: bool
+    # The value, or the error raised for the text.
+    result: Any
+    size: int
+
+
+def _sizeof(*objects: Any) -> int:
+    # `sys.getsizeof` summed over the objects and, recursively, the items of lists, tuples, sets and dicts among
+    # them, counting each object once. Other objects count their own size only.
+    seen: set[int] = set()
+    size = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+class CachedParser[R]:
+    """
+    `text.parse` with an LRU cache of the results of whole inputs.
+
+    Inputs are looked up by hash and length, and compared with the cached text to rule out collisions. Both
+    values and parse errors are cached, except `BudgetExceeded`, which depends on the budget of the call rather
+    than on the text. The cache holds at most `maxsize` inputs and, if `max_bytes` is set, entries taking at most
+    that much memory together; the least recently used inputs are evicted first. An entry's size is estimated as
+    `sys.getsizeof` of its text and its result, including the items of the lists, tuples, sets and dicts in the
+    result; `nbytes` is the total. Lookups are thread-safe.
+
+    Values are shared between the calls that return them. If callers may modify them, pass `copy=True` to return a
+    `copy.deepcopy` on every call, or a function that copies the values more cheaply.
+
+    Example:
+        >>> query = CachedParser(query_grammar, maxsize=4096, max_bytes=16 << 20)
+        >>> query.parse('price > 10 and stock')
+        >>> query.hits, query.misses
+    """
+
+    def __init__(
+        self,
+        parser: _Parser[str, R],
+        maxsize: int | None = 1024,
+        max_bytes: int | None = None,
+        *,
+        copy: bool | Callable[[R], R] = False,
+        stackless: bool = False,
+    ):
+        self.parser = parser
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.stackless = stackless
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._copy: Callable[[R], R] | None = deepcopy if copy is True else copy or None
+        self._entries: OrderedDict[tuple[int, int], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, text: str) -> R:
+        """
+        Parse `text`, or return the result cached for the same text.
+
+        Args:
+            text (str): The input.
+
+        Returns:
+            R: The value; raises `ParseErr` (the cached one, for a cached failure) if `text` does not parse.
+        """
+        key = hash(text), len(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.text is text or entry.text == text):
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        if entry is None:
+            try:
+                value = _parse(self.parser, text, stackless=self.stackless)
+                entry = _Entry(text, True, value, _sizeof(text, value))
+            except _BudgetExceeded:
+                raise
+            except _ParseErr as e:
+                entry = _Entry(text, False, e, _sizeof(text, e))
+            self._store(key, entry)
+        if not entry.okay:
+            raise entry.result.with_traceback(None)
+        return entry.result if self._copy is None else self._copy(entry.result)
+
+    __call__ = parse
+
+    def _store(self, key: tuple[int, int], entry: _Entry) -> None:
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.size
+            self._entries[key] = entry
+            self.nbytes += entry.size
+            while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.size
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.nbytes = 0
@@ -1,9 +1,22 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Sequence
+
+from parsec import engine as _engine
+from parsec import hook as _hook
+from parsec.budget import Budget as _Budget
 from parsec.context import Context as _Context
+from parsec.context import IHook as _IHook
 from parsec.context import IState as _IState
 from parsec.context import IStream as _IStream
 from parsec.core import Fail as _Fail
 from parsec.core import Okay as _Okay
 from parsec.core import Parser as _Parser
+from parsec.core import _recovering
+from parsec.error import ParseErr as _ParseErr
+from parsec.profiler import Profiler as _Profiler
+from parsec.tracer import Tracer as _Tracer
 
 
 class TextStream(_IStream[str]):
@@ -11,12 +24,8 @@ class TextStream(_IStream[str]):
         self.data = text
         self.offset = offset
 
-    def read(self, n: int = 1) -> list[str]:
-        self.offset += n
-        return list(self.data[self.offset - n : self.offset]).copy()
-
     def peek(self, n: int = 1) -> list[str]:
-        return list(self.data[self.offset : self.offset + n]).copy()
+        return list(self.data[self.offset : self.offset + n])
 
     def move(self, offset: int):
         return TextStream(self.data, self.offset + offset)
@@ -30,6 +39,10 @@ class TextStream(_IStream[str]):
     def eos(self) -> bool:
         return not (0 <= self.offset < len(self.data))
 
+    def match(self, pattern: re.Pattern[str], pos: int | None = None) -> re.Match[str] | None:
+        """Match `pattern` at `pos` (default: the current offset) without moving."""
+        return pattern.match(self.data, self.offset if pos is None else pos)
+
 
 class TextState(_IState[str]):
     from pathlib import Path
@@ -43,20 +56,167 @@ class TextState(_IState[str]):
         lines = value.count('\n')
         return TextState(
             line=self.line + lines,
-            column=value.rfind('\n') + 1 if lines else self.column + len(value),
+            column=len(value) - value.rfind('\n') - 1 if lines else self.column + len(value),
         )
 
+    def update_many(self, values: Sequence[str]):
+        return self.update(''.join(values))
+
     def format(self):
         if self.file is None:
             return f'{self.line}:{self.column}'
         return f'{self.file}:{self.line}:{self.column}'
 
 
-def parse[R](parser: _Parser[str, R], text: str):
-    ctx = _Context(TextStream(text), TextState())
-    ret = parser.run(ctx)
+def parse[R](
+    parser: _Parser[str, R],
+    text: str,
+    *,
+    profile: _Profiler[str] | None = None,
+    trace: _Tracer[str] | None = None,
+    stackless: bool = False,
+    max_steps: int | None = None,
+    deadline: float | None = None,
+):
+    if profile is not None:
+        with profile:
+            return parse(parser, text, trace=trace, stackless=stackless, max_steps=max_steps, deadline=deadline)
+    # A budget is a hook, so parses without one pay nothing for it.
+    budget = None if max_steps is None and deadline is None else _Budget[str](max_steps, deadline)
+    ctx = _Context(TextStream(text), TextState(), _hook.current(trace, budget))
+    ret = _engine.run(parser, ctx) if stackless else parser.run(ctx)
     match ret.outcome:
         case _Okay(value=v):
             return v
         case _Fail(error=e):
             raise e
+
+
+class ParseSession[R]:
+    """
+    Parses many inputs with one grammar.
+
+    `text.parse` decides on every call how to run the parse (engine, budget, hooks). A session decides once and
+    keeps what can be shared between inputs: the bound runner, the initial `TextState` (states are values) and its
+    budget, which is reset between inputs instead of being allocated again. Per input, only the stream and the
+    context are created. A session with a budget is not thread-safe: use one per thread.
+
+    Example:
+        >>> session = text.ParseSession(message, max_steps=10_000)
+        >>> session.parse('PING 1')
+        >>> session.parse_batch(messages)
+    """
+
+    def __init__(
+        self,
+        parser: _Parser[str, R],
+        *,
+        stackless: bool = False,
+        max_steps: int | None = None,
+        deadline: float | None = None,
+    ):
+        self.parser = parser
+        self._run = partial(_engine.run, parser) if stackless else parser.run
+        self._budget = None if max_steps is None and deadline is None else _Budget[str](max_steps, deadline)
+        self._state = TextState()
+
+    def _hook(self) -> _IHook[str] | None:
+        if self._budget is not None:
+            self._budget.reset()
+        return _hook.current(self._budget)
+
+    def parse(self, text: str) -> R:
+        """
+        Parse one input.
+
+        Args:
+            text (str): The input.
+
+        Returns:
+            R: The value; raises `ParseErr` on failure.
+        """
+        outcome = self._run(_Context(TextStream(text), self._state, self._hook())).outcome
+        if isinstance(outcome, _Okay):
+            return outcome.value
+        raise outcome.error
+
+    def parse_batch(self, texts: Iterable[str]) -> list[R]:
+        """
+        Parse several inputs in order.
+
+        Args:
+            texts (Iterable[str]): The inputs.
+
+        Returns:
+            list[R]: Their values; raises the error of the first input that fails.
+        """
+        run, state, budget, values = self._run, self._state, self._budget, []
+        # Without a budget there is nothing to reset, and the active hooks do not change within the loop.
+        hook = _hook.current() if budget is None else None
+        for text in texts:
+            outcome = run(_Context(TextStream(text), state, hook if budget is None else self._hook())).outcome
+            if not isinstance(outcome, _Okay):
+                raise outcome.error
+            values.append(outcome.value)
+        return values
+
+
+def parse_many_threads[R](
+    parser: _Parser[str, R], docs: Iterable[str], *, workers: int | None = None, stackless: bool = False
+) -> list[R]:
+    """
+    Parse several documents with one grammar in a pool of threads.
+
+    Parsers, contexts and streams are never modified while parsing, so one grammar object is safe to share. On a
+    free-threaded build of Python (3.13t) the documents parse on several cores at once; with the GIL the threads
+    take turns and this is no faster than a loop. Hooks active in the calling thread (profilers) are not applied.
+
+    Args:
+        parser (Parser[str, R]): The grammar.
+        docs (Iterable[str]): The documents.
+        workers (int | None): Number of threads; `None` lets `ThreadPoolExecutor` choose from the CPU count.
+        stackless (bool): Run on the explicit-stack engine.
+
+    Returns:
+        list[R]: The values, in the order of `docs`; raises the error of the first document that fails.
+
+    Example:
+        >>> values = text.parse_many_threads(json.value, documents, workers=8)
+    """
+    docs = list(docs)
+    if workers == 1 or len(docs) < 2:
+        return [parse(parser, doc, stackless=stackless) for doc in docs]
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(lambda doc: parse(parser, doc, stackless=stackless), docs))
+
+
+def parse_all_errors[R](
+    parser: _Parser[str, R], text: str, *, stackless: bool = False
+) -> tuple[R | None, list[_ParseErr]]:
+    """
+    Parse in error recovery mode: the `recover` combinators of the grammar record their failures and resynchronise,
+    so that a single pass reports every error.
+
+    Args:
+        parser (Parser[str, R]): The grammar.
+        text (str): The input.
+        stackless (bool): Run on the explicit-stack engine.
+
+    Returns:
+        tuple[R | None, list[ParseErr]]: The (partial) value, `None` if the parse failed anyway, and every error
+            in input order, the final failure last.
+
+    Example:
+        >>> value, errors = text.parse_all_errors(config, src)
+    """
+    token = _recovering.set(True)
+    try:
+        ctx = _Context(TextStream(text), TextState(), _hook.current())
+        ret = _engine.run(parser, ctx) if stackless else parser.run(ctx)
+    finally:
+        _recovering.reset(token)
+    match ret.outcome:
+        case _Okay(value=v):
+            return v, list(ret.errors)
+        case _Fail(error=e):
+            return None, [*ret.errors, e]
@@ -0,0 +1,239 @@
+"""Delimited records: CSV, TSV and log files with one record per line.
+
+A grammar written with `sep_by` over `text` parsers runs a parser per character of every field. `rows` scans the
+input line by line instead: a line without quote or escape characters is split with one `str.split` call, and
+the others field by field with a regular expression that skips to the next delimiter or closing quote. Quoted
+fields may contain delimiters, doubled quotes (or escaped ones) and line breaks. Records are yielded one at a
+time, so a file of any size is parsed in the memory of its longest record.
+
+Fields are strings unless a converter is given for their column: any function of the text, such as `int` or
+`date.fromisoformat`, or a parser such as `text.number`, which must then match the whole field.
+
+Example:
+    >>> list(delimited.rows('id,price\\n1,2.5\\n2,"3,0"\\n'))
+    [['id', 'price'], ['1', '2.5'], ['2', '3,0']]
+    >>> with open('trades.tsv', newline='') as f:
+    ...     for trade in delimited.rows(f, delimiter='\\t', header=True, columns={'price': text.number}):
+    ...         ...
+"""
+
+import io
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
+
+from parsec.core import Parser as _Parser
+from parsec.core import eos as _eos
+from parsec.error import EOSError as _EOSError
+from parsec.error import FieldError as _FieldError
+from parsec.error import ParseErr as _ParseErr
+from parsec.error import UnExpected as _UnExpected
+from parsec.text.context import ParseSession as _ParseSession
+
+type Converter = Callable[[str], Any] | _Parser[str, Any]
+
+
+@dataclass(slots=True)
+class _Open:
+    """A record whose last quoted field is still open: its complete fields, and where the open one starts and how
+    far its text was scanned."""
+
+    fields: list[str]
+    start: int
+    scanned: int
+
+
+class _Scanner:
+    """Splits the text of one record into fields, for one dialect."""
+
+    def __init__(self, delimiter: str, quote: str | None, escape: str | None, doublequote: bool):
+        for name, char in (('delimiter', delimiter), ('quote', quote), ('escape', escape)):
+            if char is not None and (len(char) != 1 or char in '\r\n'):
+                raise ValueError(f'the {name} must be one character other than a line break, got {char!r}')
+        if len({delimiter, quote, escape} - {None}) != len([c for c in (delimiter, quote, escape) if c is not None]):
+            raise ValueError('the delimiter, quote and escape characters must differ')
+        self.delimiter = delimiter
+        self.quote = quote
+        self.escape = escape
+        self.doublequote = doublequote
+        d = re.escape(delimiter)
+        e = None if escape is None else re.escape(escape)
+        self.plain = re.compile(f'[^{d}]*+' if e is None else f'(?:[^{d}{e}]|{e}(?s:.))*+')
+        # The text of a quoted field: it stops at the closing quote, or at the end of the text (an escape character
+        # included), where the next line may go on with the field.
+        self.quoted = None
+        if quote is not None:
+            q = re.escape(quote)
+            inner = [f'[^{q}{"" if e is None else e}]']
+            if doublequote:
+                inner.append(f'{q}{q}')
+            if e is not None:
+                inner.append(f'{e}(?s:.)')
+            self.quoted = re.compile(f'(?:{"|".join(inner)})*+')
+        self.unescape = None if e is None else re.compile(f'{e}((?s:.))')
+        # Finds the characters that send a line to the field-by-field scan.
+        special = ''.join(re.escape(c) for c in (quote, escape) if c is not None)
+        self.special = re.compile(f'[{special}]').search if special else None
+
+    def split(self, text: str, line: int, last: bool, pending: _Open | None = None) -> list[str] | _Open:
+        """
+        The fields of a record, or an `_Open` record if a quoted field is still open at the end of `text` and more
+        lines may close it. Given back with `text` extended by the next line, it resumes the scan where it stopped,
+        so a record is scanned once however many lines it spans. Raises `UnExpected` for text after a closing
+        quote, and at the end of input (`last`) for a quoted field that was never closed.
+        """
+        quote, quoted, delimiter = self.quote, self.quoted, self.delimiter
+        n = len(text)
+        if pending is not None:
+            fields, pos, resume = pending.fields, pending.start, pending.scanned
+        elif self.special is None or self.special(text) is None:
+            return text.split(delimiter)
+        else:
+            fields, pos, resume = [], 0, -1
+        while True:
+            if quote is not None and text.startswith(quote, pos):
+                end = quoted.match(text, resume if resume >= 0 else pos + 1).end()  # type: ignore[union-attr]
+                resume = -1
+                if end == n or text[end] != quote:
+                    if last:
+                        raise _EOSError(self._state(text, line, n))
+                    return _Open(fields, pos, end)
+                value = text[pos + 1 : end]
+                if self.doublequote and quote * 2 in value:
+                    value = value.replace(quote * 2, quote)
+                pos = end + 1
+                if pos < n and text[pos] != delimiter:
+                    raise _UnExpected(repr(text[pos]), self._state(text, line, pos))
+            else:
+                m = self.plain.match(text, pos)
+                value = m.group()  # type: ignore[union-attr]
+                pos = m.end()  # type: ignore[union-attr]
+            if self.unescape is not None and self.escape in value:  # type: ignore[operator]
+                value = self.unescape.sub(r'\1', value)
+            fields.append(value)
+            if pos >= n:
+                return fields
+            pos += 1
+
+    @staticmethod
+    def _state(text: str, line: int, pos: int) -> str:
+        # `line:column` of `pos`, in the format of `TextState`; records may span lines.
+        before = text[:pos]
+        breaks = before.count('\n')
+        column = pos - before.rfind('\n') - 1 if breaks else pos
+        return f'{line + breaks}:{column}'
+
+
+def _converter(convert: Converter) -> Callable[[str], Any]:
+    if isinstance(convert, _Parser):
+        return _ParseSession(convert.suffix(_eos)).parse
+    return convert
+
+
+def rows(
+    source: str | Iterable[str],
+    *,
+    delimiter: str = ',',
+    quote: str | None = '"',
+    escape: str | None = None,
+    doublequote: bool = True,
+    header: bool = False,
+    columns: Sequence[Converter | None] | Mapping[int | str, Converter] | None = None,
+    restkey: str | None = None,
+    restval: Any = None,
+) -> Iterator[Any]:
+    """
+    Parse delimited records, yielding one record at a time.
+
+    Args:
+        source (str | Iterable[str]): The text, or its lines with their line breaks, such as a file opened with
+            `newline=''`. Lines are read as the records are consumed.
+        delimiter (str): The field separator, one character.
+        quote (str | None): The quote character; quoted fields may contain delimiters and line breaks. `None`
+            disables quoting.
+        escape (str | None): A character that makes the next one literal, in quoted and unquoted fields.
+        doublequote (bool): Two quote characters in a quoted field stand for one.
+        header (bool): The first record names the columns; records are then yielded as dicts, as by
+            `csv.DictReader`: the fields of a record longer than the header are kept as a list under `restkey`, and
+            the columns missing from a shorter one are set to `restval`.
+        columns (Sequence[Converter | None] | Mapping[int | str, Converter] | None): Converters by position, or
+            by index or header name. A converter is a function of the field text or a parser of the whole field.
+        restkey (str | None): The key of the extra fields of a record, with `header`.
+        restval (Any): The value of the missing columns of a record, with `header`.
+
+    Returns:
+        Iterator[list[Any] | dict[str, Any]]: The records; empty lines are skipped. Raises `UnExpected` on a
+            malformed quoted field and `FieldError` when a converter rejects a field.
+
+    Example:
+        >>> for when, level, message in rows(log, delimiter='\t', quote=None, columns=[text.isodatetime]):
+        ...     ...
+    """
+    scanner = _Scanner(delimiter, quote, escape, doublequote)
+    lines = iter(io.StringIO(source, newline='') if isinstance(source, str) else source)
+    names: list[str] | None = None
+    converters: list[tuple[int, int | str, Callable[[str], Any]]] | None = None
+    number = 0
+    for raw in lines:
+        number += 1
+        start = number
+        # Lines end with one terminator ('\n', '\r\n' or '\r'): those are what the lines are split at.
+        text = raw.rstrip('\r\n')
+        if not text:
+            continue
+        fields = scanner.split(text, start, False)
+        while isinstance(fields, _Open):
+            # A quoted field goes on with the next line, line break included.
+            more = next(lines, None)
+            if more is None:
+                scanner.split(text, start, True, fields)
+                break
+            number += 1
+            text += raw[len(raw.rstrip('\r\n')) :]
+            raw = more
+            text += raw.rstrip('\r\n')
+            fields = scanner.split(text, start, False, fields)
+        if header and names is None:
+            names = fields  # type: ignore[assignment]
+            continue
+        if converters is None:
+            converters = _resolve(columns, names)
+        for i, key, convert in converters:
+            if i < len(fields):  # type: ignore[arg-type]
+                value = fields[i]  # type: ignore[index]
+                try:
+                    fields[i] = convert(value)  # type: ignore[index]
+                except (_ParseErr, ValueError) as e:
+                    raise _FieldError(start, key, value, e if isinstance(e, _ParseErr) else str(e)) from None
+        if names is None:
+            yield fields
+            continue
+        # Unequal lengths are handled below, as `csv.DictReader` does.
+        record = dict(zip(names, fields, strict=False))
+        if len(fields) > len(names):
+            record[restkey] = fields[len(names) :]  # type: ignore[index]
+        elif len(fields) < len(names):
+            for name in names[len(fields) :]:
+                record[name] = restval
+        yield record
+
+
+def _resolve(
+    columns: Sequence[Converter | None] | Mapping[int | str, Converter] | None, names: list[str] | None
+) -> list[tuple[int, int | str, Callable[[str], Any]]]:
+    # (index, column as the user named it, converter) for every converted column.
+    if columns is None:
+        return []
+    items = columns.items() if isinstance(columns, Mapping) else enumerate(columns)
+    resolved = []
+    for key, convert in items:
+        if convert is None:
+            continue
+        if isinstance(key, str):
+            if names is None or key not in names:
+                raise KeyError(f'no column named {key!r}' + ('' if names is not None else ' (header=False)'))
+            index = names.index(key)
+        else:
+            index = key
+        resolved.append((index, key, _converter(convert)))
+    return resolved
@@ -0,0 +1,206 @@
+"""Incremental reparsing of text documents.
+
+A `Document` keeps the result of every application of a labelled or named rule from its previous parses, with the
+extent of input the rule examined (lookahead included). An edit drops the entries whose extent overlaps the
+changed text and shifts the offsets of the entries after it; the next parse returns the remaining entries
+without running their rules, so only the rules around the edit and their enclosing rules run again.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.context import IHook as _IHook
+from parsec.core import Fail as _Fail
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.text.context import TextState, TextStream
+
+
+@dataclass(slots=True)
+class _Entry:
+    outcome: Any
+    consumed: int
+    committed: bool
+    # End of the result's context and end of the examined input, relative to the rule's start.
+    end: int
+    extent: int
+    # Lines the rule spans and its end column: relative to the start column on the same line, absolute otherwise.
+    lines: int
+    column: int
+
+
+class _Memo(_IHook[str]):
+    def __init__(self) -> None:
+        # By start offset, then by rule: keyed by the parser itself, which keeps it alive while its entries are.
+        self.entries: dict[int, dict[_Parser[str, Any], _Entry]] = {}
+        # Furthest offset examined so far in the innermost running rule (exclusive).
+        self.examined = 0
+        self.reused = 0
+
+    def run(
+        self, parser: _Parser[str, Any], ctx: _Context[str], call: Callable[[_Context[str]], _Result[str, Any]]
+    ) -> _Result[str, Any]:
+        if parser.name is None:
+            return call(ctx)
+        start = ctx.stream.tell()
+        at = self.entries.get(start)
+        entry = None if at is None else at.get(parser)
+        if entry is not None:
+            self.reused += 1
+            self.examined = max(self.examined, start + entry.extent)
+            state: TextState = ctx.state  # type: ignore[assignment]
+            line, column = state.line + entry.lines, entry.column if entry.lines else state.column + entry.column
+            end = _Context(ctx.stream.seek(start + entry.end), TextState(line=line, column=column), ctx.hook)
+            return _Result(end, entry.outcome, entry.consumed, entry.committed)
+        outer = self.examined
+        self.examined = start
+        ret = call(ctx)
+        examined = self.examined
+        self.examined = max(outer, examined)
+        if not ret.errors:
+            before: TextState = ctx.state  # type: ignore[assignment]
+            after: TextState = ret.context.state  # type: ignore[assignment]
+            lines = after.line - before.line
+            self.entries.setdefault(start, {})[parser] = _Entry(
+                ret.outcome,
+                ret.consumed,
+                ret.committed,
+                ret.context.stream.tell() - start,
+                examined - start,
+                lines,
+                after.column if lines else after.column - before.column,
+            )
+        return ret
+
+    def edit(self, start: int, removed: int, inserted: int) -> None:
+        stop, delta = start + removed, inserted - removed
+        entries: dict[int, dict[_Parser[str, Any], _Entry]] = {}
+        for offset, at in self.entries.items():
+            if offset >= stop:
+                # Failures carry formatted positions, which the edit may have changed.
+                kept = {k: e for k, e in at.items() if not isinstance(e.outcome, _Fail)} if delta or removed else at
+                if kept:
+                    entries[offset + delta] = kept
+            elif offset < start:
+                kept = {k: e for k, e in at.items() if offset + e.extent <= start}
+                if kept:
+                    entries[offset] = kept
+        self.entries = entries
+
+
+class _Stream(TextStream):
+    """A `TextStream` reporting how far the input was examined to the memo."""
+
+    def __init__(self, text: str, memo: _Memo, offset: int = 0):
+        super().__init__(text, offset)
+        self.memo = memo
+
+    def peek(self, n: int = 1) -> list[str]:
+        if self.offset + n > self.memo.examined:
+            self.memo.examined = self.offset + n
+        return list(self.data[self.offset : self.offset + n])
+
+    def move(self, offset: int):
+        return _Stream(self.data, self.memo, self.offset + offset)
+
+    def seek(self, offset: int):
+        return _Stream(self.data, self.memo, offset)
+
+    def match(self, pattern: re.Pattern[str], pos: int | None = None) -> re.Match[str] | None:
+        # A pattern may look one character past its match; where a failed match stopped is unknown.
+        m = super().match(pattern, pos)
+        end = len(self.data) + 1 if m is None else m.end() + 1
+        if end > self.memo.examined:
+            self.memo.examined = end
+        return m
+
+    def eos(self) -> bool:
+        # Whether the input ends here depends on the text at this offset, so an append invalidates the answer.
+        if self.offset + 1 > self.memo.examined:
+            self.memo.examined = self.offset + 1
+        return not (0 <= self.offset < len(self.data))
+
+
+class Document[R]:
+    """
+    A text kept parsed across edits.
+
+    Rule results are reused between parses, so values (and the lists or objects inside them) may be shared with
+    the previous parse: treat them as read-only. Only labelled and named rules are memoised; name the rules of
+    the grammar (`define(p, name)`, `named`) at the granularity reparsing should work at, e.g. statements or
+    array elements. A repetition of such rules still iterates over all its elements, but each element outside
+    the edit costs a lookup instead of a parse.
+
+    Example:
+        >>> doc = incremental(json_value, src)
+        >>> doc.value
+        >>> doc.edit(120, 3, 'true')
+    """
+
+    def __init__(self, parser: _Parser[str, R], text: str):
+        self.parser = parser
+        self.text = text
+        self._memo = _Memo()
+        self.result = self._parse()
+
+    def _parse(self) -> _Result[str, R]:
+        self._memo.examined = 0
+        self._memo.reused = 0
+        ctx = _Context(_Stream(self.text, self._memo), TextState(), _hook.current(self._memo))
+        return self.parser.run(ctx)
+
+    @property
+    def value(self) -> R:
+        """The value of the last parse; raises its error if it failed."""
+        match self.result.outcome:
+            case _Okay(value=v):
+                return v
+            case _Fail(error=e):
+                raise e
+
+    @property
+    def reused(self) -> int:
+        """Number of rule applications the last parse took from the previous ones."""
+        return self._memo.reused
+
+    def edit(self, start: int, removed: int, inserted: str) -> R:
+        """
+        Replace `removed` characters at `start` by `inserted` and reparse.
+
+        Args:
+            start (int): Offset of the edit.
+            removed (int): Number of characters removed.
+            inserted (str): Text inserted in their place.
+
+        Returns:
+            R: The new value; raises the parse error if the edited text does not parse.
+        """
+        if not (0 <= start and 0 <= removed and start + removed <= len(self.text)):
+            raise IndexError(f'edit {start}:{start + removed} out of range for a text of length {len(self.text)}')
+        self.text = self.text[:start] + inserted + self.text[start + removed :]
+        self._memo.edit(start, removed, len(inserted))
+        self.result = self._parse()
+        return self.value
+
+
+def incremental[R](parser: _Parser[str, R], text: str) -> Document[R]:
+    """
+    Parse `text` and keep it parsed across edits.
+
+    Args:
+        parser (Parser[str, R]): The grammar.
+        text (str): The initial text.
+
+    Returns:
+        Document[R]: The parsed document; `doc.value` is the value, `doc.edit(start, removed, inserted)` edits the
+            text and reparses only the rules the edit touches.
+
+    Example:
+        >>> doc = parsec.incremental(grammar, src)
+        >>> doc.edit(10, 0, ', 42')
+    """
+    return Document(parser, text)
@@ -0,0 +1,220 @@
+"""JSON and JSON-like configuration dialects.
+
+`examples/json.py` shows how a grammar is written with combinators; this module is the one to parse JSON with.
+A value is scanned by a single parser: one regular expression per token (leading blanks and comments included)
+whose matched group selects what to do, and an explicit stack of the open arrays and objects. Nesting costs no
+Python recursion, and a document costs one `Result` instead of several per character.
+
+Example:
+    >>> json.loads('{"a": [1, 2.5, "x\\\\n"]}')
+    {'a': [1, 2.5, 'x\\n']}
+    >>> json.loads('{"a": 1, /* two */ "b": 2,}', comments=True, trailing_commas=True)
+    {'a': 1, 'b': 2}
+"""
+
+import re
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Callable
+
+from parsec.context import Context as _Context
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.core import eos as _eos
+from parsec.error import Expected as _Expected
+from parsec.text.basic import _unescape, _unexpected
+from parsec.text.basic import regex as _regex
+from parsec.text.context import parse as _parse
+
+
+class JsonValue: ...
+
+
+@dataclass
+class JsonObject(JsonValue):
+    value: dict[str, JsonValue]
+
+
+@dataclass
+class JsonArray(JsonValue):
+    value: list[JsonValue]
+
+
+@dataclass
+class JsonString(JsonValue):
+    value: str
+
+
+@dataclass
+class JsonNumber(JsonValue):
+    value: int | float
+
+
+@dataclass
+class JsonBool(JsonValue):
+    value: bool
+
+
+@dataclass
+class JsonNull(JsonValue):
+    value: None = None
+
+
+_BLANKS = r'[ \t\n\r]*'
+_COMMENTS = r'(?:[ \t\n\r]+|//[^\n]*|/\*[\s\S]*?\*/)*'
+_TOKEN = (
+    r'(?:(?P<string>"[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*")'
+    r'|(?P<float>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+(?:[eE][-+]?[0-9]+)?|[eE][-+]?[0-9]+))'
+    r'|(?P<int>-?(?:0|[1-9][0-9]*))'
+    r'|(?P<true>true)|(?P<false>false)|(?P<null>null)'
+    r'|(?P<l_bracket>\[)|(?P<r_bracket>\])|(?P<l_curly>\{)|(?P<r_curly>\})|(?P<comma>,)|(?P<colon>:))'
+)
+
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_AST: dict[str | None, Callable[[Any], JsonValue]] = {
+    'string': JsonString,
+    'int': JsonNumber,
+    'float': JsonNumber,
+    'true': JsonBool,
+    'false': JsonBool,
+    'null': lambda _: JsonNull(),
+}
+
+# What the scanner expects next.
+_VALUE, _KEY, _COLON, _NEXT = range(4)
+_EXPECTED = {_VALUE: 'value', _KEY: 'object key', _COLON: "':'"}
+
+
+def _string(token: str) -> str:
+    return _unescape(token[1:-1])
+
+
+def _scanner(comments: bool, trailing_commas: bool, ast: bool) -> _Parser[str, Any]:
+    blanks = re.compile(_COMMENTS if comments else _BLANKS)
+    token = re.compile(blanks.pattern + _TOKEN)
+
+    def parse(ctx: _Context[str]) -> _Result[str, Any]:
+        stream = ctx.stream
+        match = stream.match  # type: ignore[attr-defined]
+        start = pos = stream.tell()
+        # Open arrays and objects, and the key of the member being parsed in each open object.
+        stack: list[Any] = []
+        keys: list[str] = []
+        expect, close = _VALUE, False
+        while True:
+            m = match(token, pos)
+            kind = None if m is None else m.lastgroup
+            if expect == _VALUE:
+                if kind == 'string':
+                    value = _string(m.group(kind))
+                elif kind == 'int':
+                    value = int(m.group(kind))
+                elif kind == 'float':
+                    value = float(m.group(kind))
+                elif kind in _LITERALS:
+                    value = _LITERALS[kind]
+                elif kind == 'l_bracket':
+                    stack.append([])
+                    pos, close = m.end(), True
+                    continue
+                elif kind == 'l_curly':
+                    stack.append({})
+                    pos, expect, close = m.end(), _KEY, True
+                    continue
+                elif kind == 'r_bracket' and close and type(stack[-1]) is list:
+                    value = stack.pop()
+                    kind = 'array'
+                else:
+                    break
+                if ast:
+                    value = JsonArray(value) if kind == 'array' else _AST[kind](value)
+            elif expect == _KEY:
+                if kind == 'string':
+                    keys.append(_string(m.group(kind)))
+                    pos, expect = m.end(), _COLON
+                    continue
+                if kind != 'r_curly' or not close:
+                    break
+                value = stack.pop()
+                if ast:
+                    value = JsonObject(value)
+            elif expect == _COLON:
+                if kind != 'colon':
+                    break
+                pos, expect, close = m.end(), _VALUE, False
+                continue
+            else:
+                is_list = type(stack[-1]) is list
+                if kind == 'comma':
+                    pos, expect, close = m.end(), _VALUE if is_list else _KEY, trailing_commas
+                    continue
+                if kind != ('r_bracket' if is_list else 'r_curly'):
+                    break
+                value = stack.pop()
+                if ast:
+                    value = JsonArray(value) if is_list else JsonObject(value)
+            pos = m.end()
+            if not stack:
+                state = ctx.state.update(stream.data[start:pos])  # type: ignore[attr-defined]
+                return _Result[str, Any].okay(_Context(stream.seek(pos), state, ctx.hook), value, pos - start)
+            top = stack[-1]
+            if type(top) is list:
+                top.append(value)
+            else:
+                top[keys.pop()] = value
+            expect = _NEXT
+
+        at = match(blanks, pos).end()
+        if expect == _NEXT:
+            expected = "',' or ']'" if type(stack[-1]) is list else "',' or '}'"
+        else:
+            expected = _EXPECTED[expect]
+        error = _Expected(expected, [_unexpected(ctx, at)])
+        state = ctx.state.update(stream.data[start:at])  # type: ignore[attr-defined]
+        return _Result[str, Any].fail(_Context(stream.seek(at), state, ctx.hook), error, at - start)
+
+    return _Parser(parse, 'json')
+
+
+@cache
+def grammar(*, comments: bool = False, trailing_commas: bool = False, ast: bool = False) -> _Parser[str, Any]:
+    """
+    Parser of a JSON value, with its leading blanks.
+
+    Args:
+        comments (bool): Allow `// line` and `/* block */` comments wherever blanks are allowed.
+        trailing_commas (bool): Allow a comma after the last element of an array or object.
+        ast (bool): Produce `JsonValue` dataclasses instead of plain `dict`/`list`/`str`/`int`/`float`/`bool`/`None`.
+
+    Returns:
+        Parser[str, Any]: The value parser; the same options return the same parser.
+
+    Example:
+        >>> config = lex.identifier.suffix(lex.char('=')) & json.grammar(comments=True)
+    """
+    return _scanner(comments, trailing_commas, ast)
+
+
+@cache
+def _document(comments: bool, trailing_commas: bool, ast: bool) -> _Parser[str, Any]:
+    blanks = _regex(_COMMENTS if comments else _BLANKS)
+    return grammar(comments=comments, trailing_commas=trailing_commas, ast=ast).suffix(blanks).suffix(_eos)
+
+
+def loads(text: str, *, comments: bool = False, trailing_commas: bool = False, ast: bool = False) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        text (str): The document: one value, optionally surrounded by blanks (and comments).
+        comments (bool): Allow comments.
+        trailing_commas (bool): Allow trailing commas.
+        ast (bool): Produce `JsonValue` dataclasses.
+
+    Returns:
+        Any: The value; raises `ParseErr` on invalid input.
+    """
+    return _parse(_document(comments, trailing_commas, ast), text)
+
+
+value = grammar()
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from typing import Any, Callable
 
 from parsec import Parser as _Parser
@@ -19,6 +21,14 @@ def literal(value: str):
     return lexeme(_T.blank)(_T.literal(value))
 
 
+def regex(pattern: str, flags: int = 0):
+    return lexeme(_T.blank)(_T.regex(pattern, flags))
+
+
+def string_literal(quote: str = '"', *, raw: bool = False):
+    return lexeme(_T.blank)(_T.string_literal(quote, raw=raw))
+
+
 alnum = lexeme(_T.blank)(_T.alnum)
 alpha = lexeme(_T.blank)(_T.alpha)
 bindigit = lexeme(_T.blank)(_T.bindigit)
@@ -36,6 +46,8 @@ hexinteger = lexeme(_T.blank)(_T.hexinteger)
 hyphen = lexeme(_T.blank)(_T.hyphen)
 identifier = lexeme(_T.blank)(_T.identifier)
 integer = lexeme(_T.blank)(_T.integer)
+isodatetime = lexeme(_T.blank)(_T.isodatetime)
+isotime = lexeme(_T.blank)(_T.isotime)
 l_curly = lexeme(_T.blank)(_T.l_curly)
 l_round = lexeme(_T.blank)(_T.l_round)
 l_bracket = lexeme(_T.blank)(_T.l_bracket)
@@ -0,0 +1,529 @@
+"""Compilation of regular sub-grammars into regular expressions.
+
+Terminals such as numbers, identifiers and dates are built from single-character parsers, `tokens`, `&`, `|` and
+repetitions: they match a regular language but run through the combinators one character at a time. `optimize`
+walks a grammar (`Parser.node`), finds the largest subtrees built only from
+
+- `item` and its filters `eq`, `neq`, `range` and the `str` predicates (`str.isdigit`, ...),
+- `tokens`, `okay`, `text.regex`,
+- `&`, `prefix`, `suffix`, `between`, `|`, `maybe`, `default`, `many`, `some`, `sep_by`, the folds and `repeat`,
+- `map` (the functions are kept and applied to the parsed values), `label`, and rules defined without recursion,
+
+and replaces each one with a parser that matches one compiled `re` pattern and computes the same value from the
+match. Python's `re` backtracks where parsers do not, so alternatives are compiled to atomic groups and
+repetitions to possessive quantifiers, which commit to their first match as `|` and `many` do. `many`, `sep_by`
+and the folds of an element that can match the empty string stop after it where `re` would not, so those
+repetitions are left to the combinators (their elements are still compiled).
+
+A compiled parser only decides the successes: when the pattern does not match, the original combinators run, so
+errors, consumed counts and recovery are exactly those of the combinators. Functions given to `map` must be pure,
+since they are no longer called on the partial results of failed branches. Rebuilt parsers keep their names.
+
+Example:
+    >>> fast = regular.optimize(grammar)
+    >>> text.parse(fast, src)
+    >>> checked = regular.optimize(grammar, check=True)  # compares every compiled match with the combinators
+"""
+
+import operator
+import re
+import sys
+from dataclasses import dataclass
+from functools import cache
+from functools import partial as _partial
+from re import _parser as _re_parser  # type: ignore[attr-defined]
+from types import MethodType
+from typing import Any, Callable
+
+from parsec.context import Context as _Context
+from parsec.core import Node as _Node
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+from parsec.core import _first, _flat, _fold, _pair, _second, item
+
+type _Value = Callable[[re.Match[str]], Any]
+
+_JOIN = ''.join
+
+
+@cache
+def _codepoints() -> str:
+    # Every code point, surrogates included, as one string: predicates are mapped over it without a call to `chr`.
+    # Its UTF-32 encoding is written one byte column at a time: code points are three counters of 256.
+    n = sys.maxunicode + 1
+    data = bytearray(4 * n)
+    data[0::4] = bytes(range(256)) * (n >> 8)
+    data[1::4] = b''.join(bytes([i]) * 256 for i in range(256)) * (n >> 16)
+    data[2::4] = b''.join(bytes([i]) * 65536 for i in range(n >> 16))
+    return data.decode('utf-32-le', 'surrogatepass')
+
+
+def _ranges(pred: Callable[[str], bool], within: str | None = None) -> str:
+    # The exact character class of a `str` predicate. `within` is a class of `re` containing every character the
+    # predicate accepts, for a predicate that holds for a string when it holds for each of its characters: only the
+    # runs of `within` are tested, each at once before character by character.
+    chars = _codepoints()
+    runs = [(0, len(chars))] if within is None else [m.span() for m in re.finditer(f'{within}+', chars)]
+    parts = []
+    for start, stop in runs:
+        chunk = chars[start:stop]
+        if within is not None and pred(chunk):
+            spans = [(0, stop - start)]
+        else:
+            spans = [m.span() for m in re.finditer(rb'\x01+', bytes(map(pred, chunk)))]
+        for a, b in spans:
+            first, last = re.escape(chars[start + a]), re.escape(chars[start + b - 1])
+            parts.append(first if b - a == 1 else f'{first}-{last}')
+    return f'[{"".join(parts)}]'
+
+
+# `\s` and `\w` use the same Unicode tests as `str.isspace` and `str.isalnum`; the others have no exact escape.
+# Letters, digits and numeric characters are all alphanumeric.
+_PREDICATES: dict[Any, Callable[[], str]] = {
+    str.isspace: lambda: r'\s',
+    str.isalnum: lambda: r'[^\W_]',
+    **{
+        pred: cache(_partial(_ranges, pred, r'[^\W_]'))
+        for pred in (str.isalpha, str.isdigit, str.isdecimal, str.isnumeric)
+    },
+    **{pred: cache(_partial(_ranges, pred)) for pred in (str.islower, str.isupper)},
+}
+
+
+# The regular subset of the grammar. `shape` tells how a node's value relates to the text it matched: 'text' (the
+# text itself), 'seq' (a list or tuple of strings that join to it), 'tseq' (such a tuple, for `&` flattening).
+@dataclass(eq=False)
+class _IR:
+    shape: str | None
+
+
+@dataclass(eq=False)
+class _Char(_IR):
+    pattern: str
+
+
+@dataclass(eq=False)
+class _Lit(_IR):
+    text: str
+
+
+@dataclass(eq=False)
+class _Const(_IR):
+    value: Any
+
+
+@dataclass(eq=False)
+class _Regex(_IR):
+    pattern: str
+
+
+@dataclass(eq=False)
+class _Seq(_IR):
+    a: _IR
+    b: _IR
+    # `_pair`, `_first`, `_second`, or None: `a` yields a function applied to the value of `b`.
+    how: Any
+
+
+@dataclass(eq=False)
+class _Alt(_IR):
+    a: _IR
+    b: _IR
+
+
+@dataclass(eq=False)
+class _Rep(_IR):
+    elem: _IR
+    sep: _IR | None
+    first: bool
+    count: int | None
+    make: Callable[[], Any]
+    step: Callable[[Any, Any], Any] | None
+
+
+@dataclass(eq=False)
+class _Map(_IR):
+    x: _IR
+    fn: Callable[[Any], Any]
+
+
+def _char(fn: Any) -> str | None:
+    # The character class accepted by an `item.where(fn)` filter.
+    if isinstance(fn, _partial) and len(fn.args) == 1 and not fn.keywords:
+        (arg,) = fn.args
+        if fn.func in (operator.eq, operator.ne) and isinstance(arg, str) and len(arg) == 1:
+            return re.escape(arg) if fn.func is operator.eq else f'[^{re.escape(arg)}]'
+        if fn.func is operator.contains and isinstance(arg, (str, list, tuple, set, frozenset)) and arg:
+            if all(isinstance(c, str) and len(c) == 1 for c in arg):
+                return f'[{"".join(re.escape(c) for c in sorted(arg))}]'
+        return None
+    try:
+        build = _PREDICATES.get(fn)
+    except TypeError:
+        return None
+    return None if build is None else build()
+
+
+def _joinable(shape: str | None) -> bool:
+    return shape in ('text', 'seq', 'tseq')
+
+
+def _nullable(ir: _IR) -> bool:
+    # Whether the tree can match without consuming input. `many` and the folds stop after such an element, and
+    # `re` repeats differ from them there, so repetitions of such elements are left to the combinators.
+    match ir:
+        case _Char():
+            return False
+        case _Lit(text=text):
+            return not text
+        case _Const():
+            return True
+        case _Regex(pattern=pattern):
+            return _re_parser.parse(pattern).getwidth()[0] == 0
+        case _Seq(a=a, b=b):
+            return _nullable(a) and _nullable(b)
+        case _Alt(a=a, b=b):
+            return _nullable(a) or _nullable(b)
+        case _Rep(elem=elem, first=first, count=count):
+            return _nullable(elem) or (not count if count is not None else not first)
+        case _Map(x=x):
+            return _nullable(x)
+    return True
+
+
+class _Translator:
+    def __init__(self) -> None:
+        self.done: dict[int, _IR | None] = {}
+        self.active: set[int] = set()
+
+    def __call__(self, p: _Parser[Any, Any]) -> _IR | None:
+        key = id(p)
+        if key in self.done:
+            return self.done[key]
+        if key in self.active:
+            return None
+        self.active.add(key)
+        try:
+            ir = self._translate(p)
+        finally:
+            self.active.discard(key)
+        self.done[key] = ir
+        return ir
+
+    def _translate(self, p: _Parser[Any, Any]) -> _IR | None:
+        if p is item:
+            return _Char('text', '(?s:.)')
+        node = p.node
+        if node is None:
+            return None
+        kind, args = node.kind, node.args
+        if kind in ('ref', 'label'):
+            return self(args[0])
+        if kind == 'regular':
+            # A compiled parser or a scanner: the grammar it stands for.
+            return self(args[1])
+        if kind == 'where':
+            pattern = _char(args[1]) if args[0] is item else None
+            return None if pattern is None else _Char('text', pattern)
+        if kind == 'tokens':
+            values = args[0]
+            if values and all(isinstance(v, str) and len(v) == 1 for v in values):
+                return _Lit('seq', ''.join(values))
+            return None
+        if kind == 'okay':
+            return _Const('text' if args[0] == '' and isinstance(args[0], str) else None, args[0])
+        if kind == 'regex':
+            compiled: re.Pattern[str] = args[0]
+            flags = compiled.flags & ~re.UNICODE
+            if compiled.groups or flags & ~(re.I | re.M | re.S | re.X) or not isinstance(compiled.pattern, str):
+                return None
+            inline = ''.join(c for f, c in ((re.I, 'i'), (re.M, 'm'), (re.S, 's'), (re.X, 'x')) if flags & f)
+            return _Regex('text', f'(?{inline}:{compiled.pattern})' if inline else f'(?:{compiled.pattern})')
+        if kind == 'map':
+            x = self(args[0])
+            if x is None:
+                return None
+            fn = args[1]
+            if fn == _JOIN and _joinable(x.shape):
+                shape = 'text'
+            elif fn is _flat and isinstance(x, _Seq) and x.how is _pair and x.b.shape == 'text':
+                shape = 'tseq' if x.a.shape in ('text', 'tseq') else None
+            else:
+                shape = None
+            return _Map(shape, x, fn)
+        if kind == 'bind':
+            q, fn = args
+            if not (isinstance(fn, MethodType) and fn.__func__ is _Parser.map and isinstance(fn.__self__, _Parser)):
+                return None
+            b = self(fn.__self__)
+            if b is None:
+                return None
+            how = None
+            if q.node is not None and q.node.kind == 'map' and q.node.args[1] in (_pair, _first, _second):
+                how = q.node.args[1]
+                a = self(q.node.args[0])
+            else:
+                a = self(q)
+            if a is None:
+                return None
+            shape = 'tseq' if how is _pair and a.shape == 'text' and b.shape == 'text' else None
+            return _Seq(shape, a, b, how)
+        if kind == 'alter':
+            a, b = self(args[0]), self(args[1])
+            if a is None or b is None:
+                return None
+            if a.shape == b.shape:
+                shape = a.shape
+            else:
+                shape = 'seq' if _joinable(a.shape) and _joinable(b.shape) else None
+            return _Alt(shape, a, b)
+        if kind == 'fold':
+            p, sep, make, step, first = args
+            elem = self(p)
+            sep_ir = None if sep is None else self(sep)
+            if elem is None or (sep is not None and sep_ir is None) or _nullable(elem):
+                return None
+            shape = 'seq' if isinstance(elem, _Char) and sep is None and make is list and step is None else None
+            return _Rep(shape, elem, sep_ir, first, None, make, step)
+        if kind == 'repeat':
+            elem = self(args[0])
+            if elem is None:
+                return None
+            shape = 'seq' if isinstance(elem, _Char) else None
+            return _Rep(shape, elem, None, True, args[1], list, None)
+        return None
+
+
+class _Unit:
+    """One compiled pattern: emits the regex of an IR tree and the function computing its value from a match."""
+
+    def __init__(self) -> None:
+        self.groups = 0
+
+    def group(self, pattern: str) -> tuple[str, str]:
+        self.groups += 1
+        name = f'g{self.groups}'
+        return f'(?P<{name}>{pattern})', name
+
+    def top(self, ir: _IR) -> tuple[str, _Value]:
+        if ir.shape == 'text':
+            return self.emit(ir, False)[0], re.Match.group
+        pattern, value = self.emit(ir, True)
+        return pattern, value  # type: ignore[return-value]
+
+    def emit(self, ir: _IR, need: bool) -> tuple[str, _Value | None]:
+        if need and ir.shape == 'text' and not isinstance(ir, _Const):
+            pattern, name = self.group(self.emit(ir, False)[0])
+            return pattern, lambda m: m.group(name)
+        match ir:
+            case _Char(pattern=pattern):
+                return pattern, None
+            case _Regex(pattern=pattern):
+                return f'(?>{pattern})', None
+            case _Lit(text=text):
+                return re.escape(text), (lambda m: list(text)) if need else None
+            case _Const(value=value):
+                return '', (lambda m: value) if need else None
+            case _Map(x=x, fn=fn):
+                pattern, vx = self.emit(x, need)
+                if not need:
+                    return pattern, None
+                assert vx is not None
+                return pattern, lambda m: fn(vx(m))
+            case _Seq(a=a, b=b, how=how):
+                pa, va = self.emit(a, need and how is not _second)
+                pb, vb = self.emit(b, need and how is not _first)
+                if not need:
+                    return pa + pb, None
+                if how is _pair:
+                    return pa + pb, lambda m: (va(m), vb(m))  # type: ignore[misc]
+                if how is _first:
+                    return pa + pb, va
+                if how is _second:
+                    return pa + pb, vb
+                return pa + pb, lambda m: va(m)(vb(m))  # type: ignore[misc]
+            case _Alt(a=a, b=b):
+                pa, va = self.emit(a, need)
+                pb, vb = self.emit(b, need)
+                if not need:
+                    return f'(?>{pa}|{pb})', None
+                pa, name = self.group(pa)
+                return f'(?>{pa}|{pb})', lambda m: va(m) if m.group(name) is not None else vb(m)  # type: ignore[misc]
+            case _Rep():
+                return self._repeat(ir, need)
+        raise TypeError(f'unexpected {ir!r}')
+
+    def _repeat(self, ir: _Rep, need: bool) -> tuple[str, _Value | None]:
+        pe = self.emit(ir.elem, False)[0]
+        if ir.count is not None:
+            pattern = f'(?:{pe}){{{ir.count}}}+'
+        elif ir.sep is None:
+            pattern = f'(?:{pe}){"+" if ir.first else "*"}+'
+        else:
+            ps = self.emit(ir.sep, False)[0]
+            pattern = f'{pe}(?:{ps}{pe})*+' if ir.first else f'(?:{pe}(?:{ps}{pe})*+)?+'
+        if not need:
+            return pattern, None
+        pattern, name = self.group(pattern)
+        if ir.shape == 'seq':
+            return pattern, lambda m: list(m.group(name))
+        # Elements are matched again one by one in the span of the repetition, as the combinators iterate.
+        elem_pattern, elem_value = _Unit().top(ir.elem)
+        elem = re.compile(elem_pattern)
+        sep = None if ir.sep is None else re.compile(_Unit().emit(ir.sep, False)[0])
+        make, step, count = ir.make, ir.step, ir.count
+
+        def value(m: re.Match[str]) -> Any:
+            # Patterns match one way from a position, so each element matches as it did in the repetition. Without
+            # a count, elements consume input (see `_nullable`) and the rounds go on to the end of the span.
+            data, (pos, end) = m.string, m.span(name)
+            acc, n = make(), 0
+            while n < count if count is not None else pos < end:
+                if n and sep is not None:
+                    pos = sep.match(data, pos).end()  # type: ignore[union-attr]
+                me = elem.match(data, pos)
+                v = elem_value(me)  # type: ignore[arg-type]
+                acc = acc.append(v) or acc if step is None else step(acc, v)
+                n += 1
+                pos = me.end()  # type: ignore[union-attr]
+            return acc
+
+        return pattern, value
+
+
+def _trivial(ir: _IR) -> bool:
+    # Parsers that already take a single step: compiling them would not save anything.
+    while isinstance(ir, _Map):
+        ir = ir.x
+    return isinstance(ir, (_Char, _Const, _Lit, _Regex))
+
+
+def _compile[R](p: _Parser[str, R], ir: _IR, check: bool) -> _Parser[str, R]:
+    unit = _Unit()
+    source, value = unit.top(ir)
+    pattern = re.compile(source)
+    original = p._fn
+    assert original is not None
+
+    def parse(ctx: _Context[str]) -> _Result[str, R]:
+        stream = ctx.stream
+        match = getattr(stream, 'match', None)
+        m = None if match is None else match(pattern)
+        if m is None:
+            # The combinators produce the error (and any partial consumption) of the failure.
+            return original(ctx)
+        text = m.group()
+        start = stream.tell()
+        ret = _Result[str, R].okay(
+            _Context(stream.seek(m.end()), ctx.state.update(text), ctx.hook), value(m), m.end() - start
+        )
+        if check:
+            _compare(pattern, ret, original(ctx), ctx)
+        return ret
+
+    return _Parser(parse, p.name, _Node('regular', (pattern, p)))
+
+
+def _compare(pattern: re.Pattern[str], compiled: _Result[str, Any], ret: _Result[str, Any], ctx: _Context[str]) -> None:
+    expected = (
+        ret.outcome.value if isinstance(ret.outcome, _Okay) else ret.outcome,
+        ret.consumed,
+        ret.context.state.format(),
+    )
+    got = (compiled.outcome.value, compiled.consumed, compiled.context.state.format())  # type: ignore[union-attr]
+    if expected != got:
+        raise AssertionError(
+            f'regular pattern {pattern.pattern!r} at {ctx.state.format()} gave {got!r}, the combinators {expected!r}'
+        )
+
+
+class _Rebuilder:
+    def __init__(self, check: bool) -> None:
+        self.check = check
+        self.translate = _Translator()
+        self.done: dict[int, _Parser[Any, Any]] = {}
+
+    def __call__(self, p: _Parser[Any, Any]) -> _Parser[Any, Any]:
+        key = id(p)
+        if key not in self.done:
+            self.done[key] = p
+            self.done[key] = self._rebuild(p)
+        return self.done[key]
+
+    def _rebuild(self, p: _Parser[Any, Any]) -> _Parser[Any, Any]:
+        ir = self.translate(p)
+        node = p.node
+        # The left side of a sequence yields a function: compile what it maps instead.
+        if ir is not None and not (isinstance(ir, _Map) and ir.fn in (_pair, _first, _second)):
+            return p if _trivial(ir) or p._fn is None else _compile(p, ir, self.check)
+        if node is None:
+            return p
+        kind, args = node.kind, node.args
+        if kind == 'ref':
+            forward = _Parser[Any, Any](name=p.name)
+            self.done[id(p)] = forward
+            forward.define(self(args[0]), p.name)
+            return forward
+        rb = self
+        if kind == 'bind':
+            q, fn = args
+            if isinstance(fn, MethodType) and fn.__func__ is _Parser.map and isinstance(fn.__self__, _Parser):
+                b = rb(fn.__self__)
+                if b is not fn.__self__:
+                    fn = b.map
+            new = rb(q).bind(fn)
+            changed = new.node.args[0] is not q or fn is not args[1]  # type: ignore[union-attr]
+        elif kind in ('map', 'where'):
+            q = rb(args[0])
+            new = q.map(args[1]) if kind == 'map' else q.where(args[1])
+            changed = q is not args[0]
+        elif kind in ('alter', 'fast_alter'):
+            a, b = rb(args[0]), rb(args[1])
+            new = a.alter(b) if kind == 'alter' else a.fast_alter(b)
+            changed = a is not args[0] or b is not args[1]
+        elif kind in ('absent', 'commit'):
+            q = rb(args[0])
+            new = q.absent() if kind == 'absent' else q.commit()
+            changed = q is not args[0]
+        elif kind == 'recover':
+            q, sync = rb(args[0]), rb(args[1])
+            new = q.recover(sync, args[2])
+            changed = q is not args[0] or sync is not args[1]
+        elif kind == 'repeat':
+            q = rb(args[0])
+            new = q.repeat(args[1])
+            changed = q is not args[0]
+        elif kind == 'label':
+            q = rb(args[0])
+            return p if q is args[0] else q.label(args[1])
+        elif kind == 'fold':
+            q, sep, make, step, first = args
+            q2, sep2 = rb(q), None if sep is None else rb(sep)
+            new = _fold(q2, sep2, make, step, first)
+            changed = q2 is not q or sep2 is not sep
+        else:
+            # `do`, `operator_table` and unknown kinds are kept as they are.
+            return p
+        if not changed:
+            return p
+        return new if p.name is None else new.named(p.name)
+
+
+def optimize[R](parser: _Parser[str, R], *, check: bool = False) -> _Parser[str, R]:
+    """
+    Compile the regular subtrees of a grammar into regular expressions.
+
+    Args:
+        parser (Parser[str, R]): The grammar; it is not modified.
+        check (bool): Also run the combinators after every successful compiled match and raise `AssertionError`
+            if the value, consumed count or end position differ. For tests: it parses everything twice.
+
+    Returns:
+        Parser[str, R]: An equivalent grammar, or `parser` itself if nothing could be compiled. Compiled parsers
+            need a stream with `match` (`TextStream`); on other streams they run the combinators.
+
+    Example:
+        >>> config = regular.optimize(config_grammar)
+    """
+    return _Rebuilder(check)(parser)
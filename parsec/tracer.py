@@ -0,0 +1,114 @@
+import json
+import os
+import random
+import threading
+from time import perf_counter_ns
+from typing import IO, Any, Callable
+
+from parsec import hook as _hook
+from parsec.context import Context as _Context
+from parsec.core import Okay as _Okay
+from parsec.core import Parser as _Parser
+from parsec.core import Result as _Result
+
+type _Event = tuple[str, int, int, int, int, bool, int]
+
+
+class Tracer[I](_hook.Hook[I]):
+    """Records enter/exit of labelled and named rules as a Chrome trace (loadable in Perfetto).
+
+    Tracing is bounded so it can be left on in production for a while: `sample` is the probability that a
+    top-level rule invocation (and everything below it) is recorded, rules nested deeper than `max_depth` are
+    not recorded, and recording stops after `max_events` events (the rest are counted in `dropped`).
+
+    Example:
+        >>> with Tracer(max_depth=8) as tracer:
+        ...     text.parse(expr, src)
+        >>> tracer.dump('parse.trace.json')
+    """
+
+    def __init__(
+        self,
+        max_depth: int | None = None,
+        sample: float = 1.0,
+        max_events: int | None = 100_000,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.max_depth = max_depth
+        self.sample = sample
+        self.max_events = max_events
+        self.events: list[_Event] = []
+        self.dropped = 0
+        self._random = random.Random(seed)
+        self._local = threading.local()
+        self._origin = perf_counter_ns()
+
+    def run(
+        self, parser: _Parser[I, Any], ctx: _Context[I], call: Callable[[_Context[I]], _Result[I, Any]]
+    ) -> _Result[I, Any]:
+        name = parser.name
+        if name is None:
+            return call(ctx)
+        local = self._local
+        depth: int = getattr(local, 'depth', 0)
+        if depth == 0:
+            local.sampled = self.sample >= 1.0 or self._random.random() < self.sample
+        if not local.sampled or (self.max_depth is not None and depth >= self.max_depth):
+            local.depth = depth + 1
+            try:
+                return call(ctx)
+            finally:
+                local.depth = depth
+        start = ctx.stream.tell()
+        begin = perf_counter_ns()
+        local.depth = depth + 1
+        try:
+            ret = call(ctx)
+        finally:
+            local.depth = depth
+        elapsed = perf_counter_ns() - begin
+        if self.max_events is not None and len(self.events) >= self.max_events:
+            self.dropped += 1
+        else:
+            end = ret.context.stream.tell()
+            self.events.append(
+                (name, begin, elapsed, start, end, isinstance(ret.outcome, _Okay), threading.get_ident())
+            )
+        return ret
+
+    def to_chrome(self) -> dict[str, Any]:
+        """
+        Convert the recorded events to the Chrome trace event format.
+
+        Returns:
+            dict[str, Any]: A trace object with one complete (`X`) event per rule invocation.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': 'parsec',
+                'ph': 'X',
+                'ts': (begin - self._origin) / 1000,
+                'dur': elapsed / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': {'start': start, 'end': end, 'outcome': 'okay' if okay else 'fail'},
+            }
+            for name, begin, elapsed, start, end, okay, tid in self.events
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'dropped': self.dropped}}
+
+    def dump(self, file: str | os.PathLike[str] | IO[str]) -> None:
+        """
+        Write the trace as Chrome trace JSON.
+
+        Args:
+            file (str | PathLike | IO[str]): Path or text file object to write to.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome(), f)
+        else:
+            json.dump(self.to_chrome(), file)
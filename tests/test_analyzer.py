@@ -0,0 +1,51 @@
+import unittest
+
+from parsec import BacktrackAnalyzer, text
+
+
+def _grammar():
+    number = text.number.named('number')
+    return (number.suffix(text.char('x')) | number).named('item').sep_by(text.comma)
+
+
+class BacktrackAnalyzerTest(unittest.TestCase):
+    def test_site(self):
+        with BacktrackAnalyzer() as analyzer:
+            text.parse(_grammar(), '1,2x,3')
+        (site,) = analyzer.sites.values()
+        self.assertEqual((site.site, site.calls, site.first, site.second, site.rescued), ('item', 3, 1, 2, 2))
+        self.assertEqual((site.repeated, site.reconsumed), (0, 0))
+
+    def test_repeated_within_a_parse(self):
+        item = text.char('a') | text.char('b')
+        grammar = item.suffix(text.char('!')) | item
+        with BacktrackAnalyzer() as analyzer:
+            text.parse(grammar, 'b')
+        site = analyzer.sites[id(item)]
+        self.assertEqual((site.calls, site.repeated, site.reconsumed), (2, 1, 1))
+
+    def test_offsets_reset_between_parses(self):
+        # Running a site at the same offset of another input is not backtracking.
+        grammar = _grammar()
+        with BacktrackAnalyzer() as analyzer:
+            text.parse(grammar, '1,2,3')
+            text.parse(grammar, '4,5,6')
+        (site,) = analyzer.sites.values()
+        self.assertEqual((site.calls, site.repeated, site.reconsumed), (6, 0, 0))
+
+    def test_hot_spans_per_parse(self):
+        grammar = _grammar()
+        with BacktrackAnalyzer(hot=2) as analyzer:
+            for source in ('1', '2', '3'):
+                text.parse(grammar, source)
+        self.assertEqual(analyzer.hot_spans(), [])
+        with BacktrackAnalyzer(hot=1) as analyzer:
+            text.parse(grammar, '1,2')
+            text.parse(grammar, '3')
+        spans = [(span.rule, span.offset, span.count, span.parse) for span in analyzer.hot_spans()]
+        self.assertEqual(spans, [('number', 0, 2, 0), ('number', 2, 2, 0), ('number', 0, 2, 1)])
+        self.assertIn('number at 1:0 of parse 2: 2 times', analyzer.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
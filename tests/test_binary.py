@@ -0,0 +1,54 @@
+import importlib.util
+import struct
+import unittest
+
+from parsec import binary
+from parsec.error import ParseErr
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+
+class ArrayOfTest(unittest.TestCase):
+    def test_fixed_count(self):
+        data = struct.pack('<3h', 1, -2, 3)
+        self.assertEqual(list(binary.parse(binary.array_of('<h', 3), data)), [1, -2, 3])
+
+    def test_length_prefix(self):
+        data = struct.pack('<i2d', 2, 1.5, 2.5)
+        self.assertEqual(list(binary.parse(binary.array_of('<d', binary.le_i32), data)), [1.5, 2.5])
+
+    def test_records(self):
+        data = struct.pack('<BIdId', 2, 1, 0.5, 2, 1.5)
+        self.assertEqual(binary.parse(binary.array_of('<Id', binary.u8), data), [(1, 0.5), (2, 1.5)])
+
+    def test_short_input(self):
+        with self.assertRaises(ParseErr):
+            binary.parse(binary.array_of('<h', 3), struct.pack('<2h', 1, 2))
+
+    def test_negative_count(self):
+        with self.assertRaises(ValueError):
+            binary.array_of('<h', -1)
+
+    def test_negative_length_prefix(self):
+        # A corrupt prefix fails instead of moving the stream backwards.
+        data = struct.pack('<i2h', -1, 1, 2)
+        with self.assertRaises(ParseErr):
+            binary.parse(binary.array_of('<h', binary.le_i32), data)
+        then = binary.array_of('<h', binary.le_i32) & binary.le_i16
+        with self.assertRaises(ParseErr):
+            binary.parse(then, data)
+
+    @unittest.skipUnless(HAS_NUMPY, 'numpy is not installed')
+    def test_negative_length_prefix_numpy(self):
+        data = struct.pack('<i2h', -1, 1, 2)
+        with self.assertRaises(ParseErr):
+            binary.parse(binary.array_of('<h', binary.le_i32, numpy=True), data)
+
+    @unittest.skipUnless(HAS_NUMPY, 'numpy is not installed')
+    def test_numpy(self):
+        data = struct.pack('<i2h', 2, 1, 2)
+        self.assertEqual(binary.parse(binary.array_of('<h', binary.le_i32, numpy=True), data).tolist(), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
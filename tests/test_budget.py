@@ -0,0 +1,73 @@
+import unittest
+from typing import Any
+
+from parsec import Budget, Parser, text
+from parsec.core import _lookahead
+from parsec.error import BudgetExceeded
+
+
+def _nested() -> Parser[str, Any]:
+    value = Parser[str, Any]()
+    array = value.sep_by(text.comma).between(text.l_bracket, text.r_bracket).named('array')
+    value.define(array | text.digit.named('digit'), 'value')
+    return value
+
+
+def _outcome(parser: Parser[str, Any], source: str, max_steps: int, stackless: bool) -> Any:
+    budget = Budget[str](max_steps=max_steps)
+    try:
+        with budget:
+            return 'ok', text.parse(parser, source, stackless=stackless), budget.steps
+    except BudgetExceeded as e:
+        return e.offset, e.rule, e.state, budget.steps
+
+
+class BudgetTest(unittest.TestCase):
+    def test_offset_and_rule(self):
+        value = _nested()
+        for stackless in (False, True):
+            with self.subTest(stackless=stackless):
+                with self.assertRaises(BudgetExceeded) as cm:
+                    text.parse(value, '[[1,2],[3,[4]]]', max_steps=17, stackless=stackless)
+                self.assertEqual((cm.exception.offset, cm.exception.rule, cm.exception.state), (1, 'array', '1:1'))
+                with self.assertRaises(BudgetExceeded) as cm:
+                    text.parse(value, '[[1,2],[3,[4]]]', max_steps=1, stackless=stackless)
+                self.assertEqual((cm.exception.offset, cm.exception.rule), (0, 'value'))
+
+    def test_engines_agree(self):
+        # Same steps counted, same offset and innermost rule, for every budget.
+        value, source = _nested(), '[[1,2],[3,[4]],5]'
+        for max_steps in range(1, 200):
+            with self.subTest(max_steps=max_steps):
+                self.assertEqual(_outcome(value, source, max_steps, False), _outcome(value, source, max_steps, True))
+
+    def test_within_budget(self):
+        self.assertEqual(text.parse(_nested(), '[1,[2]]', max_steps=1000, stackless=True), ['1', ['2']])
+
+    def test_deep_input_stays_stackless(self):
+        value = _nested()
+        source = '[' * 5000 + '1' + ']' * 5000
+        with self.assertRaises(RecursionError):
+            text.parse(value, source, max_steps=10**7)
+        self.assertEqual(len(text.parse(value, source, max_steps=10**7, stackless=True)), 1)
+        with self.assertRaises(BudgetExceeded) as cm:
+            text.parse(value, source, max_steps=8000, stackless=True)
+        self.assertEqual(cm.exception.rule, 'array')
+        self.assertGreater(cm.exception.offset, 500)
+
+    def test_deadline_stackless(self):
+        source = '[' * 3000 + '1' + ']' * 3000
+        with self.assertRaises(BudgetExceeded) as cm:
+            text.parse(_nested(), source, deadline=0.0, stackless=True)
+        self.assertIn('deadline', cm.exception.reason)
+
+    def test_frames_unwound(self):
+        # The lookahead depth set by `absent` frames is restored when the budget runs out inside them.
+        parser = (~text.literal('ab')).prefix(text.char('a')).many()
+        with self.assertRaises(BudgetExceeded):
+            text.parse(parser, 'a' * 100, max_steps=50, stackless=True)
+        self.assertEqual(_lookahead.get(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from parsec import Budget, text
+from parsec.error import BudgetExceeded, ParseErr
+from parsec.text import json
+from parsec.text.cached import CachedParser
+
+
+class _Colliding(str):
+    # Every text of the same length lands on the same cache key.
+    def __hash__(self) -> int:
+        return 0
+
+
+class CachedParserTest(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = CachedParser(json.value)
+        self.assertEqual(cache.parse('[1, 2]'), [1, 2])
+        self.assertIs(cache.parse('[1, 2]'), cache.parse('[1, 2]'))
+        self.assertEqual(cache('{"a": 1}'), {'a': 1})
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 2, 2))
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, cache.nbytes, len(cache)), (0, 0, 0, 0))
+
+    def test_errors_cached(self):
+        cache = CachedParser(json.value)
+        with self.assertRaises(ParseErr) as first:
+            cache.parse('[1,')
+        with self.assertRaises(ParseErr) as second:
+            cache.parse('[1,')
+        self.assertIs(first.exception, second.exception)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_budget_exceeded_not_cached(self):
+        cache = CachedParser(json.value)
+        with self.assertRaises(BudgetExceeded):
+            with Budget(max_steps=0):
+                cache.parse('[1, 2]')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.parse('[1, 2]'), [1, 2])
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_lru_eviction(self):
+        cache = CachedParser(json.value, maxsize=2)
+        cache.parse('1')
+        cache.parse('2')
+        cache.parse('1')
+        cache.parse('3')
+        self.assertEqual(len(cache), 2)
+        cache.parse('1')
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.parse('2')
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_max_bytes_counts_values(self):
+        small, large = '[1]', '[' + ', '.join(['"abcdefgh"'] * 200) + ']'
+        cache = CachedParser(json.value, max_bytes=4096)
+        cache.parse(small)
+        self.assertLess(cache.nbytes, 4096)
+        # The text alone fits, its value does not.
+        self.assertLess(len(large), 4096)
+        cache.parse(large)
+        self.assertEqual(len(cache), 1)
+        cache = CachedParser(json.value, max_bytes=1 << 20)
+        cache.parse(large)
+        self.assertGreater(cache.nbytes, len(large) + 200 * 8)
+        self.assertLessEqual(cache.nbytes, 1 << 20)
+
+    def test_copy(self):
+        shared = CachedParser(json.value)
+        shared.parse('{"a": [1]}')['a'].append(2)
+        self.assertEqual(shared.parse('{"a": [1]}'), {'a': [1, 2]})
+        copied = CachedParser(json.value, copy=True)
+        copied.parse('{"a": [1]}')['a'].append(2)
+        self.assertEqual(copied.parse('{"a": [1]}'), {'a': [1]})
+        self.assertIsNot(copied.parse('[1]'), copied.parse('[1]'))
+        shallow = CachedParser(json.value, copy=list)
+        self.assertEqual(shallow.parse('[1, 2]'), [1, 2])
+        self.assertIsNot(shallow.parse('[1, 2]'), shallow.parse('[1, 2]'))
+
+    def test_hash_collision(self):
+        cache = CachedParser(json.value)
+        self.assertEqual(cache.parse(_Colliding('[1]')), [1])
+        self.assertEqual(cache.parse(_Colliding('[2]')), [2])
+        self.assertEqual(cache.parse(_Colliding('[1]')), [1])
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 3, 1))
+        self.assertEqual(cache.parse(_Colliding('[1]')), [1])
+        self.assertEqual(cache.hits, 1)
+
+    def test_with_grammar(self):
+        cache = CachedParser(text.number.sep_by(text.comma), stackless=True)
+        self.assertEqual(cache.parse('1,2.5'), [1, 2.5])
+        self.assertEqual(cache.parse('1,2.5'), [1, 2.5])
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
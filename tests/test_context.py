@@ -0,0 +1,103 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from parsec import engine, text
+from parsec.context import Context
+from parsec.core import Fail, Okay, Parser, item
+from parsec.error import ParseErr
+from parsec.sequence import SequenceState, SequenceStream
+from parsec.text import json
+from parsec.text.context import TextState, TextStream
+
+
+def _context(source: str) -> Context[str]:
+    return Context(TextStream(source), TextState())
+
+
+class StreamTest(unittest.TestCase):
+    def test_peek_does_not_move(self):
+        for stream in (TextStream('abc'), SequenceStream([1, 2, 3])):
+            with self.subTest(stream=type(stream).__name__):
+                first = stream.peek(2)
+                self.assertEqual(stream.tell(), 0)
+                self.assertEqual(stream.peek(2), first)
+
+    def test_read_is_deprecated(self):
+        for stream in (TextStream('abc'), SequenceStream([1, 2, 3])):
+            with self.subTest(stream=type(stream).__name__):
+                with self.assertWarns(DeprecationWarning):
+                    first = stream.read(2)
+                self.assertEqual((first, stream.tell()), (stream.seek(0).peek(2), 2))
+                with self.assertWarns(DeprecationWarning):
+                    self.assertEqual(stream.read(2), stream.seek(2).peek(2))
+                self.assertEqual(stream.tell(), 4)
+
+    def test_move_and_seek_return_new_streams(self):
+        stream = TextStream('abc')
+        self.assertEqual(stream.move(2).peek(), ['c'])
+        self.assertEqual(stream.seek(1).peek(), ['b'])
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(stream.peek(), ['a'])
+
+    def test_update_does_not_modify_context(self):
+        ctx = Context(SequenceStream([1, 2]), SequenceState[int]())
+        after = ctx.update(1)
+        self.assertEqual((ctx.stream.tell(), after.stream.tell()), (0, 1))
+
+
+class SharedContextTest(unittest.TestCase):
+    def test_reuse_after_failed_branch(self):
+        ctx = _context('abc')
+        failed = text.literal('abx').run(ctx)
+        self.assertIsInstance(failed.outcome, Fail)
+        self.assertEqual(ctx.stream.tell(), 0)
+        ret = text.literal('abc').run(ctx)
+        self.assertEqual(ret.outcome, Okay('abc'))
+        self.assertEqual((ctx.stream.tell(), ret.context.stream.tell()), (0, 3))
+
+    def test_run_twice(self):
+        ctx = _context('ab')
+        for run in (item.run, lambda c: engine.run(item, c)):
+            first, second = run(ctx), run(ctx)
+            self.assertEqual((first.outcome, second.outcome), (Okay('a'), Okay('a')))
+            self.assertEqual(ctx.stream.tell(), 0)
+
+    def test_alternatives_start_from_the_same_context(self):
+        parser = text.literal('ab').suffix(text.char('x')) | text.literal('abc')
+        self.assertEqual(text.parse(parser, 'abc'), 'abc')
+        self.assertEqual(text.parse(parser, 'abc', stackless=True), 'abc')
+
+
+class ThreadTest(unittest.TestCase):
+    def test_one_context_in_many_threads(self):
+        grammar = text.number.sep_by(text.comma)
+        ctx = _context('1,2.5,3')
+        expected = grammar.run(ctx).outcome
+        with ThreadPoolExecutor(8) as pool:
+            outcomes = list(pool.map(lambda _: grammar.run(ctx).outcome, range(200)))
+        self.assertTrue(all(outcome == expected for outcome in outcomes))
+        self.assertEqual(ctx.stream.tell(), 0)
+
+    def test_one_grammar_in_many_threads(self):
+        docs = [f'{{"id": {i}, "tags": ["a", "b"], "score": {i / 4}}}' for i in range(200)]
+        docs += ['{"id": ]'] * 10
+        expected = [_outcome(json.value, doc) for doc in docs]
+        with ThreadPoolExecutor(8) as pool:
+            self.assertEqual(list(pool.map(lambda doc: _outcome(json.value, doc), docs)), expected)
+
+    def test_parse_many_threads(self):
+        docs = [f'[{i}, {i + 1}]' for i in range(100)]
+        self.assertEqual(text.parse_many_threads(json.value, docs, workers=4), [[i, i + 1] for i in range(100)])
+        self.assertEqual(text.parse_many_threads(json.value, docs, workers=4, stackless=True)[:2], [[0, 1], [1, 2]])
+
+
+def _outcome(parser: Parser[str, Any], doc: str) -> Any:
+    try:
+        return text.parse(parser, doc)
+    except ParseErr as e:
+        return type(e), str(e)
+
+
+if __name__ == '__main__':
+    unittest.main()
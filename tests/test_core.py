@@ -0,0 +1,228 @@
+import operator
+import unittest
+from functools import reduce
+from typing import Any
+
+from parsec import cut, do, engine, text
+from parsec.context import Context
+from parsec.core import Okay, Parser, item
+from parsec.error import ParseErr
+from parsec.text.context import TextState, TextStream
+
+
+class RepetitionTest(unittest.TestCase):
+    def test_many(self):
+        self.assertEqual(text.parse(text.digit.many(), '12x'), ['1', '2'])
+        self.assertEqual(text.parse(text.digit.many(), 'x'), [])
+
+    def test_some_requires_one(self):
+        self.assertEqual(text.parse(text.digit.some(), '12x'), ['1', '2'])
+        with self.assertRaises(ParseErr):
+            text.parse(text.digit.some(), 'x')
+
+    def test_sep_by_backtracks_a_trailing_separator(self):
+        self.assertEqual(text.parse(text.digit.sep_by(text.comma).suffix(text.comma), '1,2,'), ['1', '2'])
+
+
+class EmptyElementTest(unittest.TestCase):
+    """An element that succeeds without consuming input is kept once and ends the repetition."""
+
+    def test_many(self):
+        self.assertEqual(text.parse(text.char('a').default('x').many(), 'aab'), ['a', 'a', 'x'])
+        self.assertEqual(text.parse(text.blanks.many(), '  x'), ['  ', ''])
+
+    def test_some(self):
+        self.assertEqual(text.parse(text.char('a').default('x').some(), ''), ['x'])
+
+    def test_sep_by(self):
+        separator = text.comma.default('')
+        self.assertEqual(text.parse(text.digit.many().sep_by(separator), '12,3x'), [['1', '2'], ['3'], []])
+
+    def test_folds(self):
+        count = text.char('a').default('').map(len)
+        self.assertEqual(text.parse(count.many_fold(0, operator.add), 'aa'), 2)
+        self.assertEqual(text.parse(count.sep_by_fold(text.comma.default(''), 0, operator.add), 'a,a'), 2)
+
+    def test_for_each(self):
+        seen: list[str] = []
+        self.assertEqual(text.parse(text.char('a').default('x').for_each(seen.append), 'ab'), 2)
+        self.assertEqual(seen, ['a', 'x'])
+
+    def test_nested(self):
+        self.assertEqual(text.parse(text.digit.many().many(), '12x'), [['1', '2'], []])
+
+
+def _parse(parser: Parser[str, Any], source: str) -> Any:
+    # The value and the text left after it, the same on both engines, or the error.
+    with_rest = parser.bind(lambda v: item.many().map(lambda rest: (v, ''.join(rest))))
+    try:
+        value = text.parse(with_rest, source)
+    except ParseErr as e:
+        value = 'error', str(e)
+    try:
+        stackless = text.parse(with_rest, source, stackless=True)
+    except ParseErr as e:
+        stackless = 'error', str(e)
+    assert value == stackless, (value, stackless)
+    return value
+
+
+class FoldTest(unittest.TestCase):
+    def test_many_fold_is_a_reduced_many(self):
+        digit = text.digit.map(int)
+        pair = (text.digit & text.char(';')).map(''.join)
+        for p, source in [(digit, '123x'), (digit, ''), (pair, '1;2;3'), (pair, '1;2x'), (pair, '1;;')]:
+            with self.subTest(source=source):
+                many, rest = _parse(p.many(), source)
+                self.assertEqual(_parse(p.many_fold((), lambda acc, v: (*acc, v)), source), (tuple(many), rest))
+
+    def test_many_fold_starts_from_init(self):
+        total = text.digit.map(int).many_fold(10, operator.add)
+        self.assertEqual(_parse(total, '12'), (13, ''))
+        self.assertEqual(_parse(total, 'x'), (10, 'x'))
+
+    def test_sep_by_fold_is_a_reduced_sep_by(self):
+        digit = text.digit.map(int)
+        for source in ['1,2,3', '1,2,', '7', '1,,2', 'x', '']:
+            with self.subTest(source=source):
+                expected = _parse(digit.sep_by(text.comma), source)
+                if expected[0] != 'error':
+                    expected = reduce(max, expected[0], 0), expected[1]
+                self.assertEqual(_parse(digit.sep_by_fold(text.comma, 0, max), source), expected)
+
+    def test_cut_inside_a_fold(self):
+        ab = +text.char('a') & text.char('b')
+        self.assertEqual(_parse(ab.many_fold(0, lambda n, _: n + 1), 'abab'), (2, ''))
+        self.assertEqual(_parse(ab.many_fold(0, lambda n, _: n + 1), 'abac')[0], 'error')
+        self.assertEqual(_parse(ab.many_fold(0, lambda n, _: n + 1) | Parser.okay(-1), 'abac')[0], 'error')
+
+    def test_for_each(self):
+        seen: list[int] = []
+        numbers = text.number.sep_by(text.comma)
+        self.assertEqual(text.parse(numbers.for_each(seen.append), '1,2;3,4.5'), 1)
+        self.assertEqual(seen, [[1, 2]])
+        seen.clear()
+        self.assertEqual(text.parse(text.number.suffix(text.comma).for_each(seen.append), '1,2,3'), 2)
+        self.assertEqual(seen, [1, 2])
+
+    def test_for_each_is_not_taken_back(self):
+        # Results passed to the sink stay passed when an enclosing alternative backtracks over them.
+        seen: list[str] = []
+        loop = text.digit.for_each(seen.append)
+        self.assertEqual(text.parse(loop.suffix(text.char('!')) | text.digit.many().map(len), '12?'), 2)
+        self.assertEqual(seen, ['1', '2'])
+
+
+class DoTest(unittest.TestCase):
+    def test_steps(self):
+        @do
+        def assignment():
+            name = yield text.identifier
+            yield text.char('=')
+            value = yield text.number
+            return name, value
+
+        self.assertEqual(_parse(assignment, 'x=1.5;'), (('x', 1.5), ';'))
+        self.assertEqual(_parse(assignment.many(), 'x=1y=2'), ([('x', 1), ('y', 2)], ''))
+
+    def test_no_steps(self):
+        @do
+        def nothing():
+            return 'done'
+            yield
+
+        self.assertEqual(_parse(nothing, 'abc'), ('done', 'abc'))
+
+    def test_failure_mid_generator(self):
+        events: list[str] = []
+
+        @do
+        def pair():
+            try:
+                first = yield text.digit
+                events.append(first)
+                second = yield text.digit
+                events.append(second)
+                return first + second
+            finally:
+                events.append('closed')
+
+        self.assertEqual(_parse(pair, '12'), ('12', ''))
+        events.clear()
+        error = _parse(pair, '1x')
+        self.assertEqual(error[0], 'error')
+        self.assertIn('1:2', error[1])
+        # The generator stopped at the failing step and was closed, on each engine.
+        self.assertEqual(events, ['1', 'closed', '1', 'closed'])
+        # The failure consumed input like a bind chain, so `|` still backtracks over it and `/` does not.
+        self.assertEqual(_parse(pair | text.digit, '1x'), ('1', 'x'))
+        self.assertEqual(_parse(pair / text.digit, '1x')[0], 'error')
+
+    def test_new_generator_per_parse(self):
+        @do
+        def counted():
+            digits = yield text.digit.many()
+            return len(digits)
+
+        self.assertEqual(_parse(counted.sep_by(text.comma), '12,345,x'), ([2, 3, 0], 'x'))
+
+
+class _Releasing(TextStream):
+    """A `TextStream` recording the offsets it is released at."""
+
+    def __init__(self, text: str, released: list[int], offset: int = 0):
+        super().__init__(text, offset)
+        self.released = released
+
+    def move(self, offset: int):
+        return _Releasing(self.data, self.released, self.offset + offset)
+
+    def seek(self, offset: int):
+        return _Releasing(self.data, self.released, offset)
+
+    def release(self, offset: int) -> None:
+        self.released.append(offset)
+
+
+def _cut(parser: Parser[str, Any], source: str) -> tuple[Any, ...]:
+    # The outcome and the offsets released, the same on both engines.
+    outcomes = []
+    for run in (Parser.run, engine.run):
+        released: list[int] = []
+        ret = run(parser, Context(_Releasing(source, released), TextState()))
+        value = ret.outcome.value if isinstance(ret.outcome, Okay) else 'fail'
+        outcomes.append((value, ret.context.stream.tell(), released))
+    assert outcomes[0] == outcomes[1], outcomes
+    return outcomes[0]
+
+
+class CutTest(unittest.TestCase):
+    def test_alter(self):
+        a, b, c = text.char('a'), text.char('b'), text.char('c')
+        self.assertEqual(_cut((a & b) | (a & c), 'ac'), (('a', 'c'), 2, []))
+        self.assertEqual(_cut((+a & b) | (a & c), 'ac'), ('fail', 2, [1]))
+        self.assertEqual(_cut((+a & b) | (a & c), 'ab'), (('a', 'b'), 2, [1]))
+
+    def test_fast_alter(self):
+        # `/` backtracks only over a branch that consumed nothing; a cut there stops it too.
+        b, c = text.regex('b'), text.char('c')
+        self.assertEqual(_cut(b / c, 'c'), ('c', 1, []))
+        self.assertEqual(_cut((cut & b) / c, 'c'), ('fail', 0, [0]))
+
+    def test_many(self):
+        a, b = text.char('a'), text.char('b')
+        self.assertEqual(_cut((a & b).many(), 'abac'), ([('a', 'b')], 2, []))
+        self.assertEqual(_cut((+a & b).many(), 'abac'), ('fail', 4, [1, 3]))
+        self.assertEqual(_cut((+a & b).many(), 'abab'), ([('a', 'b'), ('a', 'b')], 4, [1, 3]))
+
+    def test_lookahead(self):
+        # Lookaheads backtrack over a cut and release nothing.
+        a, b = text.char('a'), text.char('b')
+        self.assertEqual(_cut(a.prefix(~(+a & b)), 'ac'), ('a', 1, []))
+        self.assertEqual(_cut(a.prefix(~(+a & b)), 'ab'), ('fail', 0, []))
+        self.assertEqual(_cut(a.prefix(~~(+a)), 'a'), ('a', 1, []))
+        self.assertEqual(_cut((~~(+a) & b) | a, 'a'), ('a', 1, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import csv
+import io
+import random
+import unittest
+
+from parsec import text
+from parsec.error import FieldError, UnExpected
+from parsec.text import delimited
+
+
+class RowsTest(unittest.TestCase):
+    def test_round_trip_with_csv_writer(self):
+        rng = random.Random(50)
+        records = [
+            [''.join(rng.choice('ab ,"\n\r\t') for _ in range(rng.randrange(6))) for _ in range(rng.randrange(1, 5))]
+            for _ in range(500)
+        ]
+        # A record of one empty field is written as an empty line, which `rows` skips.
+        records = [r for r in records if r != ['']]
+        out = io.StringIO(newline='')
+        csv.writer(out, lineterminator='\r\n').writerows(records)
+        self.assertEqual(list(delimited.rows(out.getvalue())), records)
+        self.assertEqual(list(delimited.rows(io.StringIO(out.getvalue(), newline=''))), records)
+
+    def test_quoted_field_over_many_lines(self):
+        body = '\n'.join(f'line {i}, with "" quotes' for i in range(5000))
+        records = list(delimited.rows(f'a,"{body}",b\nc,d\n'))
+        self.assertEqual(records, [['a', body.replace('""', '"'), 'b'], ['c', 'd']])
+
+    def test_several_quoted_fields_over_lines(self):
+        self.assertEqual(list(delimited.rows('a,"x\ny",b,"p\nq\nr"\n')), [['a', 'x\ny', 'b', 'p\nq\nr']])
+        self.assertEqual(list(delimited.rows('"a\\\nb",c\n', escape='\\', doublequote=False)), [['a\nb', 'c']])
+
+    def test_unclosed_quote(self):
+        with self.assertRaises(UnExpected) as cm:
+            list(delimited.rows('a,"x\nyy'))
+        self.assertEqual(cm.exception.state, '2:2')
+
+    def test_text_after_closing_quote(self):
+        with self.assertRaises(UnExpected) as cm:
+            list(delimited.rows('a,"x\ny"z,b'))
+        self.assertEqual(cm.exception.state, '2:2')
+
+    def test_header_like_dict_reader(self):
+        source = 'a,b,c\n1,2\n1,2,3,4\n'
+        expected = list(csv.DictReader(io.StringIO(source)))
+        self.assertEqual(list(delimited.rows(source, header=True)), expected)
+        expected = list(csv.DictReader(io.StringIO(source), restkey='rest', restval='-'))
+        self.assertEqual(list(delimited.rows(source, header=True, restkey='rest', restval='-')), expected)
+
+    def test_converters(self):
+        source = 'id,price\n1,2.5\n2,3\n'
+        records = list(delimited.rows(source, header=True, columns={'id': int, 'price': text.number}))
+        self.assertEqual(records, [{'id': 1, 'price': 2.5}, {'id': 2, 'price': 3}])
+        with self.assertRaises(FieldError) as cm:
+            list(delimited.rows('1,x\n', columns=[int, int]))
+        self.assertEqual((cm.exception.line, cm.exception.column, cm.exception.value), (1, 1, 'x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
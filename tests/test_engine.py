@@ -0,0 +1,163 @@
+import random
+import unittest
+from typing import Any
+
+from parsec import Parser, do, engine, text
+from parsec.context import Context
+from parsec.core import Okay, Result, item
+from parsec.text import json
+from parsec.text.context import TextState, TextStream
+
+
+def _result(ret: Result[str, Any]) -> Any:
+    # Everything a caller can observe of a result, errors compared by type and message.
+    outcome = ret.outcome
+    value = ('ok', outcome.value) if isinstance(outcome, Okay) else ('fail', type(outcome.error), str(outcome.error))
+    errors = [str(e) for e in ret.errors]
+    return value, ret.consumed, ret.committed, ret.context.stream.tell(), ret.context.state.format(), errors
+
+
+_LEAVES: list[Parser[str, Any]] = [
+    text.char('a'),
+    text.char('b'),
+    text.digit,
+    text.literal('ab'),
+    text.regex('a+'),
+    item,
+    text.number,
+    Parser.okay('-'),
+]
+
+
+def _grammar(rng: random.Random, depth: int) -> Parser[str, Any]:
+    """A random grammar using every combinator the engine has a step for."""
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(_LEAVES)
+    a, b = _grammar(rng, depth - 1), _grammar(rng, depth - 1)
+    match rng.randrange(18):
+        case 0:
+            return a & b
+        case 1:
+            return a | b
+        case 2:
+            return a / b
+        case 3:
+            return (~a).prefix(b)
+        case 4:
+            return (~~a) & b
+        case 5:
+            return +a & b
+        case 6:
+            return a.many()
+        case 7:
+            return a.sep_by(b)
+        case 8:
+            return a.many_fold(0, lambda n, _: n + 1)
+        case 9:
+            return a.repeat(rng.randrange(3))
+        case 10:
+            return a.map(repr)
+        case 11:
+            return a.where(lambda v: len(repr(v)) % 2 == 0)
+        case 12:
+            return a.label('thing')
+        case 13:
+            return a.bind(lambda v: b if len(repr(v)) % 2 else Parser.okay(v))
+        case 14:
+            return a.default('x')
+        case 15:
+            return a.recover(text.char(','), 'recovered')
+        case 16:
+            return a.end_by(b)
+        case _:
+
+            @do
+            def steps():
+                x = yield a
+                y = yield b
+                return x, y
+
+            return steps
+
+
+class EquivalenceTest(unittest.TestCase):
+    """`engine.run` returns what `Parser.run` returns."""
+
+    def assertSame(self, parser: Parser[str, Any], sources: list[str]) -> None:
+        for source in sources:
+            with self.subTest(source=source):
+                ctx = Context(TextStream(source), TextState())
+                self.assertEqual(_result(engine.run(parser, ctx)), _result(parser.run(ctx)))
+
+    def test_random_grammars(self):
+        rng = random.Random(30)
+        alphabet = 'ab1 ,x.'
+        for i in range(400):
+            grammar = _grammar(rng, 3)
+            sources = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(8))) for _ in range(10)]
+            with self.subTest(grammar=i):
+                self.assertSame(grammar, sources)
+
+    def test_json_example(self):
+        from examples.json import jsonValue
+
+        sources = [
+            '{"a": [1, 2.5, true, null], "b": {"c": "d"}}', '[]', '{}', '[1, [2, [3, []]]]', '[1, 2', '{"a": }',
+            '[1,,2]', '{"a" 1}', '', 'nul',
+        ]  # fmt: skip
+        self.assertSame(jsonValue, sources)
+
+    def test_calculator_example(self):
+        from examples.calculator import expr
+
+        self.assertSame(expr, ['1 + 2 * 3', '(1 + 2) * 3 - 4 / 2', '((2))', '1 +', '(1', '*', '2 * (3 + (4 - 1)) / 5'])
+
+    def test_lambda_example(self):
+        from examples.utlc import expr
+
+        # Inputs starting with a variable or an abstraction: the grammar's application rule is left-recursive.
+        self.assertSame(expr, ['x', '\\x -> x', '\\f -> \\x -> f', 'x y'])
+
+    def test_json_module(self):
+        sources = ['{"a": [1, -2e3, "\\u00e9"], "b": null}', '[1, 2,]', '{"a" 1}', '"unterminated', '  7  ']
+        self.assertSame(json.value, sources)
+        self.assertSame(json.grammar(comments=True, trailing_commas=True), sources + ['[1, /* c */ 2,]'])
+
+
+class DeepNestingTest(unittest.TestCase):
+    """Inputs nested past the recursion limit of `Parser.run`."""
+
+    def test_json_example(self):
+        from examples.json import jsonValue
+
+        depth = 1500
+        source = '[' * depth + '1' + ']' * depth
+        with self.assertRaises(RecursionError):
+            text.parse(jsonValue, source)
+        value = text.parse(jsonValue, source, stackless=True)
+        for _ in range(depth):
+            (value,) = value.value
+        self.assertEqual(value.value, 1)
+        ctx = Context(TextStream(source[:-1]), TextState())
+        self.assertFalse(isinstance(engine.run(jsonValue, ctx).outcome, Okay))
+
+    def test_calculator_example(self):
+        from examples.calculator import expr
+
+        depth = 1500
+        source = '(' * depth + '1+2' + ')' * depth + '*3'
+        with self.assertRaises(RecursionError):
+            text.parse(expr, source)
+        self.assertEqual(text.parse(expr, source, stackless=True), 9)
+
+    def test_combinators(self):
+        # Every level nests a fold, a lookahead, a cut, a map and a label.
+        grammar = Parser[str, Any]()
+        nested = (+text.l_bracket).prefix(~text.r_bracket) & grammar.many_fold(0, lambda n, v: n + v)
+        grammar.define(nested.suffix(text.r_bracket).map(lambda t: t[1] + 1).label('list') | Parser.okay(0), 'value')
+        depth = 5000
+        self.assertEqual(text.parse(grammar, '[' * depth + ']' * depth, stackless=True), depth)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import math
+import operator
+import unittest
+from collections import Counter
+from typing import Any
+
+from parsec import Parser, text
+from parsec.core import item
+from parsec.error import ParseErr
+from parsec.expr import operator_table
+
+
+def _binary(fn: Any) -> Any:
+    return lambda x: lambda y: fn(x, y)
+
+
+def _op(symbol: str, fn: Any) -> Parser[str, Any]:
+    return text.char(symbol).map(lambda _: fn)
+
+
+def _show(symbol: str) -> Any:
+    # Builds the expression tree as a string, to see how operands were grouped.
+    return lambda x: lambda y: f'({x}{symbol}{y})'
+
+
+_REST = item.many().map(''.join)
+
+
+class OperatorTableTest(unittest.TestCase):
+    def parse(self, table: list[Any], source: str, **kwargs: Any) -> Any:
+        expr = Parser[str, Any]()
+        expr.define(operator_table(expr.between(text.l_round, text.r_round) | text.integer, table, **kwargs))
+        value, rest = text.parse(expr & _REST, source)
+        self.assertEqual(value, text.parse(expr & _REST, source, stackless=True)[0])
+        return value if not rest else (value, rest)
+
+    def test_precedence(self):
+        table = [
+            (_op('*', _binary(operator.mul)) | _op('/', _binary(operator.floordiv)), 'left'),
+            (_op('+', _binary(operator.add)) | _op('-', _binary(operator.sub)), 'left'),
+        ]
+        self.assertEqual(self.parse(table, '1+2*3'), 7)
+        self.assertEqual(self.parse(table, '2*3+4*5'), 26)
+        self.assertEqual(self.parse(table, '(1+2)*3'), 9)
+        self.assertEqual(self.parse(table, '7'), 7)
+
+    def test_associativity(self):
+        table = [(_op('^', _show('^')), 'right'), (_op('-', _show('-')), 'left'), (_op('=', _show('=')), 'none')]
+        self.assertEqual(self.parse(table, '1-2-3'), '((1-2)-3)')
+        self.assertEqual(self.parse(table, '1^2^3'), '(1^(2^3))')
+        self.assertEqual(self.parse(table, '1-2^3^4-5'), '((1-(2^(3^4)))-5)')
+        self.assertEqual(self.parse(table, '1=2'), '(1=2)')
+        # A non-associative level does not chain: the expression ends before the second operator.
+        self.assertEqual(self.parse(table, '1=2-3=4'), ('(1=(2-3))', '=4'))
+
+    def test_prefix_and_postfix(self):
+        table = [
+            (_op('!', math.factorial), 'postfix'),
+            (_op('-', operator.neg), 'prefix'),
+            (_op('*', _binary(operator.mul)), 'left'),
+            (_op('+', _binary(operator.add)), 'left'),
+        ]
+        self.assertEqual(self.parse(table, '3!'), 6)
+        self.assertEqual(self.parse(table, '--3'), 3)
+        self.assertEqual(self.parse(table, '-3!'), -6)
+        self.assertEqual(self.parse(table, '3!!'), 720)
+        self.assertEqual(self.parse(table, '-2*3!+1'), -11)
+        self.assertEqual(self.parse(table, '-(2+1)!'), -6)
+
+    def test_operator_without_operand(self):
+        table = [(_op('*', _binary(operator.mul)), 'left')]
+        self.assertEqual(self.parse(table, '2*3*'), (6, '*'))
+        with self.assertRaises(ParseErr):
+            text.parse(operator_table(text.integer, table), '*2')
+
+    def test_mapping_levels(self):
+        table = [({'*': _binary(operator.mul)}, 'left'), ({'+': _binary(operator.add)}, 'left')]
+        self.assertEqual(self.parse(table, '1+2*3', token=item.range('+*-')), 7)
+        # A token in no level ends the expression.
+        self.assertEqual(self.parse(table, '1+2-3', token=item.range('+*-')), (3, '-3'))
+
+    def test_token_parsed_once_per_position(self):
+        offsets: Counter[int] = Counter()
+
+        @Parser
+        def token(ctx: Any) -> Any:
+            offsets[ctx.stream.tell()] += 1
+            return item.run(ctx)
+
+        table = [
+            ({'!': math.factorial}, 'postfix'),
+            ({'-': operator.neg}, 'prefix'),
+            ({'*': _binary(operator.mul), '/': _binary(operator.floordiv)}, 'left'),
+            ({'+': _binary(operator.add), '-': _binary(operator.sub)}, 'left'),
+            ({'=': _binary(operator.eq)}, 'none'),
+        ]
+        for stackless in (False, True):
+            with self.subTest(stackless=stackless):
+                offsets.clear()
+                source = '-1+2*3!-4=7'
+                self.assertTrue(text.parse(operator_table(text.integer, table, token), source, stackless=stackless))
+                # Before every operand and after it, the end of the input included: once, for all the levels.
+                self.assertEqual(offsets, Counter(range(len(source) + 1)))
+
+    def test_invalid_table(self):
+        with self.assertRaises(ValueError):
+            operator_table(text.integer, [(_op('+', _binary(operator.add)), 'middle')])
+        with self.assertRaises(TypeError):
+            operator_table(text.integer, [({'+': _binary(operator.add)}, 'left')])
+
+
+if __name__ == '__main__':
+    unittest.main()
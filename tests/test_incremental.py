@@ -0,0 +1,99 @@
+import random
+import unittest
+from typing import Any
+
+from parsec import Parser, incremental, text
+from parsec.context import Context
+from parsec.core import Okay
+from parsec.error import ParseErr
+from parsec.text.context import TextState, TextStream
+
+
+def _grammar() -> Parser[str, Any]:
+    value = Parser[str, Any]()
+    number = text.number.named('number')
+    keyword = text.literal('let').suffix(~text.alnum).named('keyword')
+    name = text.identifier.named('name')
+    items = value.sep_by(text.comma.suffix(text.blanks)).default([])
+    array = items.between(text.l_bracket, text.r_bracket).named('array')
+    value.define((number | keyword | name | array).suffix(text.blanks), 'value')
+    return value
+
+
+def _full(parser: Parser[str, Any], source: str) -> Any:
+    # What a parse from scratch returns: value or error, where it stopped and the state there.
+    ret = parser.run(Context(TextStream(source), TextState()))
+    outcome = ret.outcome.value if isinstance(ret.outcome, Okay) else str(ret.outcome.error)
+    return outcome, ret.consumed, ret.context.stream.tell(), ret.context.state.format()
+
+
+def _incremental(doc: Any) -> Any:
+    ret = doc.result
+    outcome = ret.outcome.value if isinstance(ret.outcome, Okay) else str(ret.outcome.error)
+    return outcome, ret.consumed, ret.context.stream.tell(), ret.context.state.format()
+
+
+class DocumentTest(unittest.TestCase):
+    def assertEdits(self, source: str, edits: list[tuple[int, int, str]]) -> None:
+        grammar = _grammar()
+        doc = incremental(grammar, source)
+        self.assertEqual(_incremental(doc), _full(grammar, source))
+        for start, removed, inserted in edits:
+            with self.subTest(text=doc.text, edit=(start, removed, inserted)):
+                try:
+                    doc.edit(start, removed, inserted)
+                except ParseErr:
+                    pass
+                self.assertEqual(_incremental(doc), _full(grammar, doc.text))
+
+    def test_edit_inside_an_element(self):
+        self.assertEdits('[1, 22, [3, abc], 4]', [(4, 2, '5'), (8, 1, '77'), (14, 0, 'd'), (1, 1, 'x1')])
+
+    def test_edit_in_lookahead(self):
+        # Each edit lands right after a rule's match, where the rule looked ahead but consumed nothing.
+        self.assertEdits('[12, let, x]', [(3, 0, '3'), (8, 0, 'x'), (8, 1, ''), (8, 0, ' 1'), (4, 0, 'e')])
+
+    def test_edit_at_the_edges(self):
+        self.assertEdits(
+            '[1, 2]',
+            [(0, 0, ' '), (0, 1, ''), (6, 0, ' '), (6, 1, ''), (5, 0, ', 3'), (0, 0, '['), (9, 0, ']'), (0, 10, '7')],
+        )
+        self.assertEdits('', [(0, 0, '1'), (1, 0, '2'), (0, 2, ''), (0, 0, '[]')])
+
+    def test_failures(self):
+        self.assertEdits('[1, 2]', [(5, 1, ''), (5, 0, ']'), (1, 0, ','), (1, 1, ''), (0, 1, '')])
+
+    def test_reuse(self):
+        source = '[' + ', '.join(str(i) for i in range(100)) + ']'
+        doc = incremental(_grammar(), source)
+        value = doc.edit(source.index('50'), 2, '5000')
+        self.assertEqual(value[50], 5000)
+        self.assertGreater(doc.reused, 90)
+
+    def test_random_edits(self):
+        rng = random.Random(35)
+        alphabet = ['1', '2', ' ', ',', '[', ']', 'let', 'a', '.']
+        for i in range(40):
+            source = '[1, [2, let], a3, 45]'
+            edits = []
+            length = len(source)
+            for _ in range(15):
+                start = rng.randrange(length + 1)
+                removed = rng.randrange(min(3, length - start) + 1)
+                inserted = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(3)))
+                edits.append((start, removed, inserted))
+                length += len(inserted) - removed
+            with self.subTest(run=i):
+                self.assertEdits(source, edits)
+
+    def test_out_of_range(self):
+        doc = incremental(_grammar(), '[1]')
+        with self.assertRaises(IndexError):
+            doc.edit(2, 2, '')
+        with self.assertRaises(IndexError):
+            doc.edit(-1, 0, '')
+        self.assertEqual(doc.text, '[1]')
+
+
+if __name__ == '__main__':
+    unittest.main()
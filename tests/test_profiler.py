@@ -0,0 +1,26 @@
+import unittest
+
+from parsec import profile, text
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_reconsumed(self):
+        number = text.number.named('number')
+        grammar = number.suffix(text.char('x')) | number
+        with profile() as prof:
+            text.parse(grammar, '12')
+        stats = prof.stats()['number']
+        self.assertEqual((stats['calls'], stats['consumed'], stats['reconsumed']), (2, 4, 2))
+
+    def test_spans_reset_between_parses(self):
+        # The same offsets in a second input are not backtracking over the first one.
+        grammar = text.number.named('number').sep_by(text.comma)
+        with profile() as prof:
+            text.parse(grammar, '1,2,3')
+            text.parse(grammar, '4,5,6')
+        stats = prof.stats()['number']
+        self.assertEqual((stats['calls'], stats['consumed'], stats['reconsumed']), (6, 6, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from typing import Any
+
+from parsec import Parser, text
+from parsec.error import ParseErr
+from parsec.text import lex
+
+_STMT = (lex.identifier.suffix(lex.char('=')) & lex.number).suffix(lex.semicolon)
+_BLOCK = _STMT.recover(lex.semicolon | ~~lex.r_curly, 'bad').many().between(lex.l_curly, lex.r_curly)
+
+
+class RecoverTest(unittest.TestCase):
+    def parse_all_errors(self, parser: Parser[str, Any], source: str) -> tuple[Any, list[str]]:
+        # The value and where each error is, the same on both engines.
+        value, errors = text.parse_all_errors(parser, source)
+        self.assertEqual(text.parse_all_errors(parser, source, stackless=True), (value, errors))
+        return value, [str(e).rsplit(' at ', 1)[-1] for e in errors]
+
+    def test_partial_value_and_errors(self):
+        value, errors = self.parse_all_errors(_BLOCK, '{ a = 1; b = ; c 3; d = 4; }')
+        self.assertEqual(value, [('a', 1), 'bad', 'bad', ('d', 4)])
+        self.assertEqual(errors, ['1:14', '1:18'])
+
+    def test_no_errors(self):
+        self.assertEqual(self.parse_all_errors(_BLOCK, '{ a = 1; b = 2; }'), ([('a', 1), ('b', 2)], []))
+
+    def test_sync_skips_to_the_end_of_its_match(self):
+        value, errors = self.parse_all_errors(_BLOCK, '{ c 3 4 5; d = 4; }')
+        self.assertEqual((value, errors), (['bad', ('d', 4)], ['1:5']))
+
+    def test_zero_width_sync(self):
+        # `~~lex.r_curly` stops in front of the brace, which `between` then reads.
+        value, errors = self.parse_all_errors(_BLOCK, '{ a = 1; b = 2 }')
+        self.assertEqual((value, errors), ([('a', 1), 'bad'], ['1:16']))
+
+    def test_unrecoverable(self):
+        # Without a synchronisation point the parse fails anyway: no value, the final failure last.
+        value, errors = self.parse_all_errors(_BLOCK, '{ x x x x')
+        self.assertEqual((value, errors), (None, ['1:5', '1:9']))
+        value, errors = self.parse_all_errors(_BLOCK, '{ a = 1; ')
+        self.assertEqual((value, errors[-1]), (None, '1:9'))
+
+    def test_nothing_to_skip(self):
+        # A failure right at the end of input is not recovered, so `many` ends there as usual.
+        stmts = _STMT.recover(lex.semicolon).many()
+        self.assertEqual(self.parse_all_errors(stmts, 'a = 1;'), ([('a', 1)], []))
+
+    def test_inert_outside_parse_all_errors(self):
+        self.assertEqual(text.parse(_BLOCK, '{ a = 1; }'), [('a', 1)])
+        for stackless in (False, True):
+            with self.subTest(stackless=stackless):
+                with self.assertRaises(ParseErr):
+                    text.parse(_BLOCK, '{ a = 1; b = ; }', stackless=stackless)
+        self.assertEqual(text.parse(_STMT.recover(lex.semicolon, 'bad').default('none'), 'b = ;'), 'none')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import random
+import unittest
+from typing import Any
+
+from parsec import text
+from parsec.core import Parser, item
+from parsec.error import ParseErr
+from parsec.text import regular
+
+
+def _outcome(parser: Parser[str, Any], source: str) -> Any:
+    try:
+        return 'ok', text.parse(parser, source)
+    except ParseErr as e:
+        return 'error', str(e)
+
+
+_LEAVES: list[Parser[str, Any]] = [
+    text.char('a'),
+    text.char('b'),
+    text.digit,
+    text.alpha,
+    text.blank,
+    item.range('ab'),
+    item.neq('a'),
+    text.literal('ab'),
+    text.regex('a+'),
+    text.regex('b?'),
+    text.regex(r'(?=a)'),
+    Parser.okay(''),
+]
+
+
+def _grammar(rng: random.Random, depth: int) -> Parser[str, Any]:
+    """A random grammar from the parsers `optimize` compiles, nullable repetitions included."""
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice(_LEAVES)
+    a = _grammar(rng, depth - 1)
+    match rng.randrange(12):
+        case 0:
+            return a & _grammar(rng, depth - 1)
+        case 1:
+            return a | _grammar(rng, depth - 1)
+        case 2:
+            return a.many()
+        case 3:
+            return a.some()
+        case 4:
+            return a.sep_by(_grammar(rng, depth - 1))
+        case 5:
+            return a.default('x')
+        case 6:
+            return a.repeat(rng.randrange(3))
+        case 7:
+            return a.map(str)
+        case 8:
+            return a.prefix(_grammar(rng, depth - 1))
+        case 9:
+            return a.suffix(_grammar(rng, depth - 1))
+        case 10:
+            return a.many_fold(0, lambda n, _: n + 1)
+        case _:
+            return a.sep_by_fold(_grammar(rng, depth - 1), (), lambda acc, v: (*acc, v))
+
+
+class OptimizeTest(unittest.TestCase):
+    def assertSame(self, grammar: Parser[str, Any], sources: list[str]) -> None:
+        fast, checked = regular.optimize(grammar), regular.optimize(grammar, check=True)
+        for source in sources:
+            with self.subTest(source=source):
+                expected = _outcome(grammar, source)
+                self.assertEqual(_outcome(fast, source), expected)
+                self.assertEqual(_outcome(checked, source), expected)
+
+    def test_compiles(self):
+        grammar = text.digit.many()
+        self.assertEqual(regular.optimize(grammar).node.kind, 'regular')  # type: ignore[union-attr]
+
+    def test_repetition_of_empty_elements(self):
+        self.assertSame(text.digit.many().many(), ['12x', '', 'x'])
+        self.assertSame(text.char('a').default('x').repeat(2), ['', 'a', 'aa', 'aaa'])
+        self.assertSame(text.char('a').default('x').many(), ['', 'aab'])
+        self.assertSame(text.char('a').many().sep_by(text.comma), ['a,,a', ',', ''])
+        self.assertSame(text.regex('b?').some(), ['bbx', ''])
+
+    def test_repeat_zero(self):
+        self.assertSame(text.char('a').repeat(0), ['', 'a'])
+        self.assertSame(text.char('a').default('x').repeat(0), [''])
+
+    def test_unicode_classes(self):
+        grammar = (text.alpha | text.digit | text.lower | text.upper).many().map(''.join)
+        self.assertSame(grammar, ['aé٣Ⅻ²一x_', 'ǅ ', 'ª0'])
+
+    def test_random_grammars(self):
+        rng = random.Random(46)
+        alphabet = 'ab1 ,x'
+        for i in range(300):
+            grammar = _grammar(rng, 3)
+            sources = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(7))) for _ in range(12)]
+            with self.subTest(grammar=i):
+                self.assertSame(grammar, sources)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import random
+import unittest
+from array import array
+from typing import Any
+from unittest import mock
+
+from parsec import sequence
+from parsec.core import item
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _positive(a: Any) -> Any:
+    # Scalar or vectorized: a mask for an array, a bool for an item.
+    return a > 0
+
+
+def _run(length: int, rng: random.Random) -> list[float]:
+    # `length` positive values, then a negative one and more values.
+    return [rng.uniform(0.1, 1) for _ in range(length)] + [-1.0] + [rng.uniform(-1, 1) for _ in range(5)]
+
+
+_LENGTHS = [0, 1, 5, 255, 256, 257, 1024, 1025, 5000]
+
+
+class TakeWhileTest(unittest.TestCase):
+    def test_sequences(self):
+        for data in (['a', 'b', '1', 'c'], ('a', 'b', '1'), 'ab1c'):
+            with self.subTest(data=data):
+                self.assertEqual(sequence.parse(sequence.take_while(str.isalpha), data), data[:2])
+                self.assertEqual(sequence.parse(sequence.skip_while(str.isalpha), data), 2)
+
+    def test_empty_run(self):
+        letters = sequence.take_while(str.isalpha)
+        self.assertEqual(sequence.parse(letters, []), [])
+        self.assertEqual(sequence.parse(letters, ['1']), [])
+        self.assertEqual(sequence.parse(sequence.skip_while(str.isalpha), ['1']), 0)
+
+    def test_continues_after_the_run(self):
+        grammar = item.suffix(sequence.skip_while(str.isspace)) & sequence.take_while(str.isdigit)
+        self.assertEqual(sequence.parse(grammar, ['x', ' ', ' ', '1', '2', 'y']), ('x', ['1', '2']))
+        self.assertEqual(sequence.parse(grammar, ['x', ' ', ' ', '1', '2', 'y'], stackless=True), ('x', ['1', '2']))
+
+    def test_array(self):
+        rng = random.Random(39)
+        for length in _LENGTHS:
+            data = array('d', _run(length, rng))
+            for vectorized in (False, True):
+                with self.subTest(length=length, vectorized=vectorized):
+                    run = sequence.parse(sequence.take_while(_positive, vectorized=vectorized), data)
+                    self.assertEqual(run, data[:length])
+                    self.assertIsInstance(run, array)
+                    skipped = sequence.parse(sequence.skip_while(_positive, vectorized=vectorized), data)
+                    self.assertEqual(skipped, length)
+
+    def test_state_after_the_run(self):
+        data = array('i', [1, 2, 3, 0, 4])
+        grammar = sequence.take_while(_positive, vectorized=True) & item.eq(1)
+        with self.assertRaisesRegex(Exception, '#4'):
+            sequence.parse(grammar, data)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_ndarray(self):
+        rng = random.Random(39)
+        for length in _LENGTHS:
+            data = np.array(_run(length, rng))
+            for vectorized in (False, True):
+                with self.subTest(length=length, vectorized=vectorized):
+                    run = sequence.parse(sequence.take_while(_positive, vectorized=vectorized), data)
+                    self.assertIsInstance(run, np.ndarray)
+                    self.assertEqual(run.tolist(), data[:length].tolist())
+                    skipped = sequence.parse(sequence.skip_while(_positive, vectorized=vectorized), data)
+                    self.assertEqual(skipped, length)
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_vectorized_predicate_gets_slices(self):
+        arguments: list[type] = []
+
+        def positive(a: Any) -> Any:
+            arguments.append(type(a))
+            return a > 0
+
+        data = array('d', [1.0] * 1000 + [-1.0])
+        self.assertEqual(sequence.parse(sequence.skip_while(positive, vectorized=True), data), 1000)
+        self.assertEqual(set(arguments), {np.ndarray})
+        self.assertLess(len(arguments), 10)
+        # Sequences that are not arrays are tested item by item.
+        arguments.clear()
+        self.assertEqual(sequence.parse(sequence.skip_while(positive, vectorized=True), [1.0, 2.0, -1.0]), 2)
+        self.assertEqual(set(arguments), {float})
+
+    def test_without_numpy(self):
+        # With NumPy missing, a vectorized predicate is called per item and the results are the same.
+        rng = random.Random(39)
+        with mock.patch.object(sequence, '_np', None):
+            for length in _LENGTHS:
+                data = array('d', _run(length, rng))
+                with self.subTest(length=length):
+                    taken = sequence.parse(sequence.take_while(_positive, vectorized=True), data)
+                    self.assertEqual(taken, data[:length])
+                    self.assertEqual(sequence.parse(sequence.skip_while(_positive, vectorized=True), data), length)
+            arguments: list[type] = []
+            data = array('d', [1.0, 2.0, -1.0])
+            sequence.parse(sequence.skip_while(lambda a: arguments.append(type(a)) or a > 0, vectorized=True), data)
+            self.assertEqual(set(arguments), {float})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import random
+import unittest
+from typing import Any
+
+from parsec import text
+from parsec.core import Parser, item
+from parsec.error import ParseErr
+from parsec.text import basic
+
+_REST = item.many().map(''.join)
+
+
+def _outcome(parser: Parser[str, Any], source: str) -> Any:
+    # The value with its type (1 and 1.0 are equal), the text left after it, or the error.
+    try:
+        value, rest = text.parse(parser & _REST, source)
+        return 'ok', type(value), value, rest
+    except ParseErr as e:
+        return 'error', str(e)
+    except ValueError as e:
+        return 'invalid', str(e)
+
+
+class ScannerTest(unittest.TestCase):
+    """The one-step scanners accept, convert and reject exactly like the grammars they stand for."""
+
+    def assertSame(self, scanner: Parser[str, Any], reference: Parser[str, Any], sources: list[str]) -> None:
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertEqual(_outcome(scanner, source), _outcome(reference, source))
+
+    def test_numbers(self):
+        sources = [
+            '0', '12', '-7', '+0x1F', '0o17', '0b101', '0x', '0b2', '1.5', '.5', '1.', '-.5e3', '1e', '1e+',
+            '2E-3x', '1.5e3.', '٣', '1٣', '1.٣', '0x1٣', '1e٣', '12abc', '', '+', '-.', '0X0o1', '1_000',
+        ]  # fmt: skip
+        rng = random.Random(47)
+        alphabet = '0123456789+-.eExXoObBaF_ ٣'
+        sources += [''.join(rng.choice(alphabet) for _ in range(rng.randrange(9))) for _ in range(500)]
+        self.assertSame(text.integer, basic._integer, sources)
+        self.assertSame(text.floatnumber, basic._floatnumber, sources)
+        self.assertSame(text.number, basic._number, sources)
+
+    def test_dates_and_times(self):
+        sources = [
+            '2024-05-01', '2024-5-01', '2024-13-01', '2024-05-01 12:00:00', '2024-05-01T12:00:00', '23:59:60',
+            '12:00:00.25', '12:00:00,5Z', '12:00:00+05:30', '12:00:00-0530', '12:00:00+5', '12:00:00.', '12:00:00Z٣',
+            '2024-05-01T12:00:00.123456+01:00x', '2024-05-01 12:00:00.1٣', '٢٠٢٤-05-01', '',
+        ]  # fmt: skip
+        rng = random.Random(49)
+        alphabet = '0123456789-:T .,Z+x٣'
+        templates = ['2024-05-01T12:34:56.789+05:30', '2024-05-01 12:34:56', '12:34:56,5Z']
+        for _ in range(500):
+            chars = list(rng.choice(templates))
+            for _ in range(rng.randrange(3)):
+                i = rng.randrange(len(chars) + 1)
+                match rng.randrange(3):
+                    case 0:
+                        chars[i : i + 1] = [rng.choice(alphabet)]
+                    case 1:
+                        del chars[i : i + 1]
+                    case _:
+                        chars.insert(i, rng.choice(alphabet))
+            sources.append(''.join(chars[: rng.randrange(len(chars) + 1)] if rng.random() < 0.3 else chars))
+        self.assertSame(text.date, basic._date, sources)
+        self.assertSame(text.time, basic._time, sources)
+        self.assertSame(text.datetime, basic._datetime, sources)
+        self.assertSame(text.isotime, basic._isotime, sources)
+        self.assertSame(text.isodatetime, basic._isodatetime, sources)
+
+    def test_consecutive_datetimes(self):
+        # The date is reused while the prefix stays the same; the time and offset never are.
+        sources = [
+            '2024-05-01T12:00:00Z', '2024-05-01T12:00:00Z', '2024-05-01 12:00:01.25', '2024-05-01T12:00:01+01:00',
+            '2024-05-01T12:00:01', '2024-05-01T25:00:00', '2024-05-01T12:00:02-0530', '2024-05-02T00:00:00',
+            '2024-05-32T00:00:00', '2024-05-02T00:00:00Z',
+        ]  # fmt: skip
+        self.assertSame(text.isodatetime, basic._isodatetime, sources)
+        values = [text.parse(text.isodatetime, source) for source in sources[:5]]
+        self.assertEqual([v.tzinfo is None for v in values], [False, False, True, False, True])
+        self.assertIs(values[0], values[1])
+
+
+class TimestampsTest(unittest.TestCase):
+    def test_matches_isodatetime(self):
+        column = ['2024-05-01T12:00:00Z', '2024-05-01T12:00:00Z', '2024-05-01 12:00:01.25', '2024-05-01T12:00:00+01:00']
+        self.assertEqual(text.timestamps(column), [text.parse(text.isodatetime, v) for v in column])
+
+    def test_invalid(self):
+        with self.assertRaisesRegex(ValueError, '#1'):
+            text.timestamps(['2024-05-01T12:00:00', 'noon'])
+
+
+class StringLiteralTest(unittest.TestCase):
+    def test_escapes(self):
+        literal = text.string_literal()
+        sources = [
+            r'"plain"', r'""', r'"a\nb\tc"', r'"\\\/\b\f\n\r\t\""', r'"é€"', r'"\\n"', r'"a\\"',
+            r'"\ud83d\ude00"', r'"x\ud83d\ude00y\ud83d\ude01"',
+        ]  # fmt: skip
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertEqual(text.parse(literal, source), json.loads(source))
+        self.assertEqual(_outcome(literal, r'"a\"b" rest'), ('ok', str, 'a"b', ' rest'))
+        # Another quote is escaped too, the double quote stays an escape of its own.
+        backtick = text.string_literal('`')
+        self.assertEqual(text.parse(backtick, r'`a\`b\'c\"`'), 'a`b\'c"')
+        self.assertEqual(text.parse(text.string_literal("'"), r"'it\'s'"), "it's")
+
+    def test_surrogates(self):
+        literal = text.string_literal()
+        self.assertEqual(text.parse(literal, r'"\ud83d\ude00"'), '\U0001f600')
+        # Surrogates that are not a high one followed by a low one are kept as they are, like `json.loads` does.
+        for source in [r'"\ud83d"', r'"\ude00"', r'"\ude00\ud83d"', r'"\ud83dx"', r'"\ud83d\ud83d"', r'"\ud83d\n"']:
+            with self.subTest(source=source):
+                self.assertEqual(text.parse(literal, source), json.loads(source))
+        self.assertEqual(basic._unescape(r'\ud83d\ud83d\ude00'), '\ud83d\U0001f600')
+
+    def test_unescape(self):
+        body = 'no escapes'
+        self.assertIs(basic._unescape(body), body)
+        self.assertEqual(basic._unescape(r'\'\"\/'), '\'"/')
+        self.assertEqual(basic._unescape(r'A\\u0041'), 'A\\u0041')
+
+    def test_raw(self):
+        raw = text.string_literal("'", raw=True)
+        self.assertEqual(text.parse(raw, r"'a\nb\d'"), r'a\nb\d')
+        self.assertEqual(_outcome(raw, r"'a\'b'"), ('ok', str, 'a\\', "b'"))
+        self.assertEqual(_outcome(raw, "''"), ('ok', str, '', ''))
+
+    def test_errors(self):
+        literal = text.string_literal()
+        cases = [
+            ('"abc', '1:4'),  # unterminated
+            (r'"a\"', '1:4'),  # the closing quote escaped
+            ('', '1:0'),
+            ('x"a"', '1:0'),
+            (r'"a\q"', '1:3'),  # the character of a bad escape
+            (r'"ab\u12"', '1:4'),
+        ]
+        for source, state in cases:
+            with self.subTest(source=source):
+                with self.assertRaises(ParseErr) as cm:
+                    text.parse(literal, source)
+                self.assertEqual(cm.exception.state, state)
+        with self.assertRaises(ParseErr) as cm:
+            text.parse(text.string_literal("'", raw=True), r"'a\n")
+        self.assertEqual(cm.exception.state, '1:4')
+        # A failure consumes nothing, so an alternative still runs.
+        self.assertEqual(text.parse(literal | text.literal('"a'), '"a'), '"a')
+        with self.assertRaises(ValueError):
+            text.string_literal('\\')
+        with self.assertRaises(ValueError):
+            text.string_literal('""')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from typing import Any
+
+from parsec import Budget, Parser, text
+from parsec.error import BudgetExceeded, ParseErr, UnExpected
+from parsec.text.context import TextState
+
+
+def _nested() -> Parser[str, Any]:
+    value = Parser[str, Any]()
+    array = value.sep_by(text.comma).between(text.l_bracket, text.r_bracket).named('array')
+    value.define(array | text.digit.named('digit'), 'value')
+    return value
+
+
+def _steps(parser: Parser[str, Any], source: str) -> int:
+    budget = Budget[str]()
+    with budget:
+        text.parse(parser, source)
+    return budget.steps
+
+
+class TextStateTest(unittest.TestCase):
+    def test_update_on_one_line(self):
+        state = TextState(line=3, column=4).update('abc')
+        self.assertEqual((state.line, state.column), (3, 7))
+
+    def test_update_across_lines(self):
+        # The column is the length of the text after the last line break, wherever the value started.
+        state = TextState(line=1, column=5).update('ab\ncd')
+        self.assertEqual((state.line, state.column), (2, 2))
+        state = TextState(line=1, column=0).update('ab\n')
+        self.assertEqual((state.line, state.column), (2, 0))
+        state = TextState(line=2, column=1).update('a\nbc\ndef')
+        self.assertEqual((state.line, state.column), (4, 3))
+
+    def test_update_many_matches_update(self):
+        values = ['a', 'b', '\n', 'c', 'd', '\n', 'e']
+        many = TextState().update_many(values)
+        one = TextState().update(''.join(values))
+        self.assertEqual((many.line, many.column), (one.line, one.column))
+
+    def test_error_position_after_multiline_value(self):
+        # An unexpected character on the second line is reported at the same column as on the first line.
+        first = text.literal('abcd').suffix(text.char('x'))
+        second = text.literal('ab\ncd').suffix(text.char('x'))
+        with self.assertRaises(UnExpected) as cm:
+            text.parse(first, 'abcdy')
+        self.assertEqual(cm.exception.state, '1:5')
+        with self.assertRaises(UnExpected) as cm:
+            text.parse(second, 'ab\ncdy')
+        self.assertEqual(cm.exception.state, '2:3')
+
+    def test_error_position_after_blanks(self):
+        parser = text.blanks.prefix(text.char('a')).suffix(text.char('x'))
+        with self.assertRaises(UnExpected) as cm:
+            text.parse(parser, 'a  \n   y')
+        self.assertEqual(cm.exception.state, '2:4')
+
+
+class ParseSessionTest(unittest.TestCase):
+    _SOURCES = ['[[1,2],[3,[4]]]', '7', '[5]', '[1,[2,[3]]]']
+
+    def test_matches_parse(self):
+        value = _nested()
+        for stackless in (False, True):
+            with self.subTest(stackless=stackless):
+                session = text.ParseSession(value, stackless=stackless)
+                expected = [text.parse(value, source, stackless=stackless) for source in self._SOURCES]
+                self.assertEqual([session.parse(source) for source in self._SOURCES], expected)
+                self.assertEqual(session.parse_batch(self._SOURCES), expected)
+                self.assertEqual(session.parse_batch(iter(self._SOURCES)), expected)
+                self.assertEqual(session.parse_batch([]), [])
+
+    def test_errors_match_parse(self):
+        value = _nested()
+        for stackless in (False, True):
+            session = text.ParseSession(value, stackless=stackless)
+            for source in ['[1,', 'x', '[1,2', '']:
+                with self.subTest(stackless=stackless, source=source):
+                    with self.assertRaises(ParseErr) as expected:
+                        text.parse(value, source, stackless=stackless)
+                    with self.assertRaises(ParseErr) as cm:
+                        session.parse(source)
+                    self.assertEqual(str(cm.exception), str(expected.exception))
+                    # A batch raises the error of the first input that fails.
+                    with self.assertRaises(ParseErr) as cm:
+                        session.parse_batch(['7', source, 'x'])
+                    self.assertEqual(str(cm.exception), str(expected.exception))
+
+    def test_budget_resets_between_inputs(self):
+        value, source = _nested(), '[[1,2],[3,[4]]]'
+        steps = _steps(value, source)
+        for stackless in (False, True):
+            with self.subTest(stackless=stackless):
+                # Enough for one input at a time, far from enough for all of them together.
+                session = text.ParseSession(value, stackless=stackless, max_steps=steps)
+                self.assertEqual(session.parse_batch([source] * 5), [text.parse(value, source)] * 5)
+                for _ in range(5):
+                    self.assertEqual(session.parse(source), text.parse(value, source))
+                tight = text.ParseSession(value, stackless=stackless, max_steps=steps - 1)
+                with self.assertRaises(BudgetExceeded):
+                    tight.parse(source)
+                # Running out on one input leaves nothing behind for the next.
+                self.assertEqual(tight.parse('7'), '7')
+                self.assertEqual(tight.parse_batch(['7', '[1]', '7']), ['7', ['1'], '7'])
+                with self.assertRaises(BudgetExceeded):
+                    tight.parse_batch(['7', source])
+
+
+if __name__ == '__main__':
+    unittest.main()